@@ -1,5 +1,9 @@
 from django.contrib import admin
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.forms.models import BaseInlineFormSet
 from django.utils.html import format_html
+from . import inbox, snapshot
 from .models import (
     Profile, TechStack, SkillCategory, Skill,
     Experience, ExperienceSection, ExperienceTask, ExperienceTech,
@@ -7,6 +11,77 @@ from .models import (
     Certification, Education, Highlight, ContactMessage
 )
 
+# ===================================
+# SHARED
+# ===================================
+
+class ParentCachingFormSet(BaseInlineFormSet):
+    """
+    Inline formset that hands every existing row the parent object, so
+    row labels built from it (``__str__``) don't fetch it once per row
+    """
+
+    def _construct_form(self, i, **kwargs):
+        form = super()._construct_form(i, **kwargs)
+        if i < self.initial_form_count():
+            setattr(form.instance, self.fk.name, self.instance)
+        return form
+
+
+class CachedChoicesFilter(admin.SimpleListFilter):
+    """
+    List filter over the values of one field. The choices are read once and
+    kept until portfolio content next changes, instead of a DISTINCT scan
+    (or a load of every related row) on each changelist view.
+    """
+    field_name = None
+    _cache = {}  # (model label, field name) -> (snapshot generation, choices)
+
+    def lookups(self, request, model_admin):
+        key = (model_admin.model._meta.label, self.field_name)
+        generation = snapshot.generation()
+        cached = self._cache.get(key)
+        if cached is None or cached[0] != generation:
+            cached = self._cache[key] = (generation, self.load_choices(model_admin.model))
+        return cached[1]
+
+    def load_choices(self, model):
+        field = model._meta.get_field(self.field_name)
+        if field.is_relation:
+            return [(str(obj.pk), str(obj)) for obj in field.related_model.objects.all()]
+        values = model.objects.order_by(self.field_name).values_list(self.field_name, flat=True).distinct()
+        return [(value, value) for value in values]
+
+    def queryset(self, request, queryset):
+        if self.value() is None:
+            return queryset
+        return queryset.filter(**{self.parameter_name: self.value()})
+
+
+def child_count(queryset, parent_field):
+    """
+    Rows of ``queryset`` per changelist row, as a correlated subquery.
+
+    Unlike an aggregate annotation it adds no GROUP BY to the changelist
+    query, so the list and its COUNT(*) still read the model's ordering
+    index instead of sorting the grouped rows.
+    """
+    counts = (
+        queryset.filter(**{parent_field: OuterRef('pk')}).order_by()
+        .values(parent_field).annotate(count=Count('pk')).values('count')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def cached_choices_filter(field_name, title):
+    """CachedChoicesFilter for ``field_name``, as ``?<field_name>__exact=<value>``"""
+    return type(f'{field_name.title()}Filter', (CachedChoicesFilter,), {
+        'title': title,
+        'field_name': field_name,
+        'parameter_name': f'{field_name}__exact',
+    })
+
+
 # ===================================
 # PROFILE ADMIN
 # ===================================
@@ -53,7 +128,7 @@ class TechStackAdmin(admin.ModelAdmin):
     list_display = ('name', 'order', 'is_active')
     list_editable = ('order', 'is_active')
     list_filter = ('is_active',)
-    ordering = ('order',)
+    ordering = ('order', 'id')
 
 
 # ===================================
@@ -62,6 +137,7 @@ class TechStackAdmin(admin.ModelAdmin):
 
 class SkillInline(admin.TabularInline):
     model = Skill
+    formset = ParentCachingFormSet
     extra = 3
     fields = ('name', 'order', 'is_active')
 
@@ -71,20 +147,29 @@ class SkillCategoryAdmin(admin.ModelAdmin):
     list_display = ('name', 'skill_count', 'order', 'is_active')
     list_editable = ('order', 'is_active')
     list_filter = ('is_active',)
-    ordering = ('order',)
+    ordering = ('order', 'id')
+    search_fields = ('name',)
     inlines = [SkillInline]
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            active_skill_count=child_count(Skill.objects.filter(is_active=True), 'category')
+        )
+    
     def skill_count(self, obj):
-        return obj.skills.filter(is_active=True).count()
+        return obj.active_skill_count
     skill_count.short_description = 'Active Skills'
+    skill_count.admin_order_field = 'active_skill_count'
 
 
 @admin.register(Skill)
 class SkillAdmin(admin.ModelAdmin):
     list_display = ('name', 'category', 'order', 'is_active')
-    list_filter = ('category', 'is_active')
+    list_filter = (cached_choices_filter('category', 'category'), 'is_active')
     list_editable = ('order', 'is_active')
-    ordering = ('category', 'order')
+    list_select_related = ('category',)
+    autocomplete_fields = ('category',)
+    ordering = ('category_id', 'order', 'id')
 
 
 # ===================================
@@ -93,18 +178,21 @@ class SkillAdmin(admin.ModelAdmin):
 
 class ExperienceSectionInline(admin.StackedInline):
     model = ExperienceSection
+    formset = ParentCachingFormSet
     extra = 1
     fields = ('title', 'order')
 
 
 class ExperienceTechInline(admin.TabularInline):
     model = ExperienceTech
+    formset = ParentCachingFormSet
     extra = 3
     fields = ('name', 'order')
 
 
 class ExperienceTaskInline(admin.TabularInline):
     model = ExperienceTask
+    formset = ParentCachingFormSet
     extra = 3
     fields = ('description', 'order')
 
@@ -112,9 +200,10 @@ class ExperienceTaskInline(admin.TabularInline):
 @admin.register(Experience)
 class ExperienceAdmin(admin.ModelAdmin):
     list_display = ('title', 'company', 'period_display', 'is_current', 'is_active')
-    list_filter = ('is_current', 'is_active', 'company')
+    list_filter = ('is_current', 'is_active', cached_choices_filter('company', 'company'))
     list_editable = ('is_active',)
-    ordering = ('-start_date',)
+    ordering = ('-start_date', 'id')
+    search_fields = ('title', 'company')
     
     fieldsets = (
         ('Basic Information', {
@@ -141,13 +230,19 @@ class ExperienceAdmin(admin.ModelAdmin):
 @admin.register(ExperienceSection)
 class ExperienceSectionAdmin(admin.ModelAdmin):
     list_display = ('title', 'experience', 'task_count', 'order')
-    list_filter = ('experience',)
-    ordering = ('experience', 'order')
+    list_filter = (cached_choices_filter('experience', 'experience'),)
+    list_select_related = ('experience',)
+    autocomplete_fields = ('experience',)
+    ordering = ('experience_id', 'order', 'id')
     inlines = [ExperienceTaskInline]
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(task_total=child_count(ExperienceTask.objects, 'section'))
+    
     def task_count(self, obj):
-        return obj.tasks.count()
+        return obj.task_total
     task_count.short_description = 'Tasks'
+    task_count.admin_order_field = 'task_total'
 
 
 # ===================================
@@ -156,18 +251,21 @@ class ExperienceSectionAdmin(admin.ModelAdmin):
 
 class ProjectMetricInline(admin.TabularInline):
     model = ProjectMetric
+    formset = ParentCachingFormSet
     extra = 2
     fields = ('value', 'label', 'order')
 
 
 class ProjectHighlightInline(admin.StackedInline):
     model = ProjectHighlight
+    formset = ParentCachingFormSet
     extra = 2
     fields = ('description', 'order')
 
 
 class ProjectTechInline(admin.TabularInline):
     model = ProjectTech
+    formset = ParentCachingFormSet
     extra = 5
     fields = ('name', 'order')
 
@@ -177,7 +275,7 @@ class ProjectAdmin(admin.ModelAdmin):
     list_display = ('number', 'title', 'is_featured', 'is_active', 'updated_at')
     list_filter = ('is_featured', 'is_active')
     list_editable = ('is_featured', 'is_active')
-    ordering = ('order',)
+    ordering = ('order', 'id')
     
     fieldsets = (
         ('Basic Information', {
@@ -207,9 +305,13 @@ class ProjectAdmin(admin.ModelAdmin):
 @admin.register(Certification)
 class CertificationAdmin(admin.ModelAdmin):
     list_display = ('title', 'issuer', 'category', 'issue_date', 'is_active')
-    list_filter = ('category', 'issuer', 'is_active')
+    list_filter = (
+        cached_choices_filter('category', 'category'),
+        cached_choices_filter('issuer', 'issuer'),
+        'is_active',
+    )
     list_editable = ('is_active',)
-    ordering = ('order',)
+    ordering = ('order', 'id')
     
     fieldsets = (
         ('Basic Information', {
@@ -235,9 +337,9 @@ class CertificationAdmin(admin.ModelAdmin):
 @admin.register(Education)
 class EducationAdmin(admin.ModelAdmin):
     list_display = ('degree', 'institution', 'year_range', 'cgpa_display', 'is_active')
-    list_filter = ('is_active', 'institution')
+    list_filter = ('is_active', cached_choices_filter('institution', 'institution'))
     list_editable = ('is_active',)
-    ordering = ('-end_year',)
+    ordering = ('-end_year', 'id')
     
     fieldsets = (
         ('Degree Information', {
@@ -277,7 +379,7 @@ class HighlightAdmin(admin.ModelAdmin):
     list_display = ('title', 'icon_name', 'order', 'is_active')
     list_editable = ('order', 'is_active')
     list_filter = ('is_active',)
-    ordering = ('order',)
+    ordering = ('order', 'id')
     
     fieldsets = (
         ('Content', {
@@ -298,7 +400,14 @@ class ContactMessageAdmin(admin.ModelAdmin):
     list_display = ('name', 'email', 'subject', 'status_badges', 'created_at')
     list_filter = ('is_read', 'is_replied', 'created_at')
     readonly_fields = ('name', 'email', 'subject', 'message', 'created_at')
-    ordering = ('-created_at',)
+    search_fields = ('name', 'email', 'subject', 'message')
+    ordering = ('-created_at', '-id')
+    
+    # Counts cached for a minute, keyset pages and FTS5 search (see app/inbox.py)
+    paginator = inbox.CachedCountPaginator
+    show_full_result_count = False
+    # With index-only queries, rendering the rows is what a page costs
+    list_per_page = 50
     
     fieldsets = (
         ('Message Information', {
@@ -323,6 +432,27 @@ class ContactMessageAdmin(admin.ModelAdmin):
         )
     status_badges.short_description = 'Status'
     
+    def get_changelist(self, request, **kwargs):
+        return inbox.KeysetChangeList
+    
+    def get_search_results(self, request, queryset, search_term):
+        results = inbox.search(queryset, search_term)
+        if results is None:
+            return super().get_search_results(request, queryset, search_term)
+        return results, False
+    
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        inbox.clear_counts()
+    
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        inbox.clear_counts()
+    
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        inbox.clear_counts()
+    
     def has_add_permission(self, request):
         return False
     
@@ -330,11 +460,13 @@ class ContactMessageAdmin(admin.ModelAdmin):
     
     def mark_as_read(self, request, queryset):
         updated = queryset.update(is_read=True)
+        inbox.clear_counts()
         self.message_user(request, f'{updated} message(s) marked as read.')
     mark_as_read.short_description = 'Mark selected as read'
     
     def mark_as_replied(self, request, queryset):
         updated = queryset.update(is_replied=True)
+        inbox.clear_counts()
         self.message_user(request, f'{updated} message(s) marked as replied.')
     mark_as_replied.short_description = 'Mark selected as replied'
 
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class AppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app'
+
+    def ready(self):
+        from . import metrics, payloads, snapshot
+        snapshot.connect_signals()
+        payloads.connect_signals()
+        metrics.connect_signals()
@@ -0,0 +1,123 @@
+"""
+Async versions of the public page views and API endpoints.
+
+Used instead of the sync views in app/views.py when the site is served by
+an ASGI server (see PORTFOLIO_ASYNC_VIEWS in settings), so one worker can
+hold many slow clients without tying up a thread each. A snapshot
+rebuild runs in one sync_to_async hop, and the session user is resolved
+with ``request.auser()``. Everything else (page cache, serializers,
+pagination) is shared with the sync views. Static files are served ahead
+of Django by app/staticfiles.py, because WhiteNoiseMiddleware is
+sync-only.
+"""
+
+from django.http import JsonResponse
+
+from . import facets
+from .conditional import aconditional, aggregate_validators, content_validators, page_validators
+from .metrics import timed
+from .pagecache import page_response
+from .payloads import aiter_documents
+from .serializers import (
+    CERTIFICATION_FIELDS, EXPERIENCE_CHILDREN, EXPERIENCE_FIELDS,
+    PROJECT_CHILDREN, PROJECT_FIELDS, aiter_json, serialize_skills
+)
+from .snapshot import aiter_experiences, aiter_projects
+from .views import (
+    CERTIFICATION_PARAMS, EXPERIENCE_PARAMS, PROJECT_PARAMS, about_context, certifications_context,
+    certification_key, collection_response, experience_context, experience_key, get_profile_context,
+    home_context, parse_search, portfolio_context, portfolio_response, project_key, search_response,
+    stream_response, tech_response
+)
+
+# ===================================
+# PAGE VIEWS
+# ===================================
+
+@aconditional(page_validators, resolve_user=True)
+async def home(request, snapshot, user):
+    """Home page view with dynamic content"""
+    return page_response(snapshot, user, 'home.html', home_context)
+
+
+@aconditional(page_validators, resolve_user=True)
+async def about(request, snapshot, user):
+    """About page view with skills and education"""
+    return page_response(snapshot, user, 'about.html', about_context)
+
+
+@aconditional(page_validators, resolve_user=True)
+async def experience(request, snapshot, user):
+    """Experience page view with timeline"""
+    return page_response(snapshot, user, 'experience.html', experience_context)
+
+
+@aconditional(page_validators, resolve_user=True)
+async def portfolio(request, snapshot, user):
+    """Portfolio page view with projects"""
+    return page_response(snapshot, user, 'portfolio.html', portfolio_context)
+
+
+@aconditional(page_validators, resolve_user=True)
+async def certifications(request, snapshot, user):
+    """Certifications page view"""
+    return page_response(snapshot, user, 'certifications.html', certifications_context)
+
+
+@aconditional(page_validators, resolve_user=True)
+async def contact(request, snapshot, user):
+    """Contact page view"""
+    return page_response(snapshot, user, 'contact.html', get_profile_context)
+
+
+# ===================================
+# API ENDPOINTS (Public)
+# ===================================
+
+@aconditional(content_validators, params=PROJECT_PARAMS)
+async def get_projects(request, snapshot, user):
+    """API endpoint to fetch all projects data"""
+    if request.GET.get('stream'):
+        return stream_response(request, 'projects', aiter_projects, PROJECT_FIELDS,
+                               PROJECT_CHILDREN, encode=aiter_json, documents=aiter_documents)
+    return collection_response(request, snapshot, 'projects', project_key, PROJECT_FIELDS)
+
+
+@aconditional(content_validators)
+async def get_skills(request, snapshot, user):
+    """API endpoint to fetch all skills data organized by category"""
+    with timed('serialize'):
+        return JsonResponse({'skills': serialize_skills(snapshot.skill_categories)})
+
+
+@aconditional(content_validators, params=CERTIFICATION_PARAMS)
+async def get_certifications_api(request, snapshot, user):
+    """API endpoint to fetch all certifications data"""
+    return collection_response(request, snapshot, 'certifications', certification_key, CERTIFICATION_FIELDS)
+
+
+@aconditional(content_validators, params=EXPERIENCE_PARAMS)
+async def get_experience_api(request, snapshot, user):
+    """API endpoint to fetch all experience data"""
+    if request.GET.get('stream'):
+        return stream_response(request, 'experiences', aiter_experiences, EXPERIENCE_FIELDS,
+                               EXPERIENCE_CHILDREN, encode=aiter_json, documents=aiter_documents)
+    return collection_response(request, snapshot, 'experiences', experience_key, EXPERIENCE_FIELDS)
+
+
+@aconditional(aggregate_validators)
+async def get_portfolio_api(request, snapshot, user):
+    """API endpoint returning every public section from one snapshot"""
+    return portfolio_response(request, snapshot)
+
+
+@aconditional(content_validators, params=facets.parse_tech)
+async def get_tech(request, snapshot, user):
+    """API endpoint with per-technology counts across projects and experience"""
+    return tech_response(request, snapshot)
+
+
+@aconditional(content_validators, params=parse_search)
+async def search_api(request, snapshot, user):
+    """API endpoint searching projects, experience, certifications and skills"""
+    return search_response(request, snapshot)
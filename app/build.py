@@ -0,0 +1,78 @@
+"""
+Identity of the deployed code, part of every HTTP validator.
+
+Snapshot validators (app/conditional.py) only change when content changes.
+A deploy that changes templates, serializers or views changes the bytes
+served for the same content, so the ETag also carries a build identifier
+and Last-Modified is never older than the deployed code:
+
+- the build id is settings.BUILD_ID when the deployment sets one (e.g. the
+  commit being deployed), otherwise a digest of the Python sources and
+  templates. The digest is the same in every worker and on every host
+  running the same code.
+- the build time is the commit time of the checked-out code (``git log``),
+  the same in every checkout of that commit, unlike file modification
+  times, which are whenever the files were written on that host. Without
+  git or a repository it is None and only the ETag tracks the build.
+
+Both are computed once per process, on first use.
+"""
+
+import hashlib
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import NamedTuple
+
+from django.conf import settings
+
+# File patterns making up a build, relative to BASE_DIR
+SOURCES = ('app/**/*.py', 'portfolio/**/*.py', 'templates/**/*.html')
+
+
+class Build(NamedTuple):
+    id: str
+    time: object  # datetime of the commit, or None outside a git checkout
+
+
+def _source_files(base_dir):
+    files = {path for pattern in SOURCES for path in base_dir.glob(pattern)}
+    return sorted(path for path in files if '__pycache__' not in path.parts)
+
+
+def _commit_time(base_dir):
+    try:
+        result = subprocess.run(
+            ['git', 'log', '-1', '--format=%ct'],
+            cwd=base_dir, capture_output=True, text=True, timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    output = result.stdout.strip()
+    if result.returncode != 0 or not output.isdigit():
+        return None
+    return datetime.fromtimestamp(int(output), timezone.utc)
+
+
+def _load(build_id):
+    base_dir = Path(settings.BASE_DIR)
+    if build_id is None:
+        digest = hashlib.sha1()
+        for path in _source_files(base_dir):
+            digest.update(path.relative_to(base_dir).as_posix().encode() + b'\0')
+            digest.update(path.read_bytes())
+        build_id = digest.hexdigest()[:12]
+    return Build(str(build_id), _commit_time(base_dir))
+
+
+_build = None  # (settings.BUILD_ID it was computed for, Build)
+
+
+def get_build():
+    """The Build of the running code"""
+    global _build
+    configured = getattr(settings, 'BUILD_ID', None)
+    cached = _build
+    if cached is None or cached[0] != configured:
+        cached = _build = (configured, _load(configured))
+    return cached[1]
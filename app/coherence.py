@@ -0,0 +1,147 @@
+"""
+Change counters shared by every worker process on the host.
+
+Each worker keeps its own content snapshot (app/snapshot.py) and the
+caches derived from it. An admin save is handled by one worker, so the
+others need to learn about it without polling the database or running a
+cache server. The counters therefore live in a small memory-mapped file
+next to the SQLite database, mapped by every worker:
+
+    slot 0        total number of changes, used as the snapshot version
+    slot 1        time of the last change, in epoch microseconds
+    slot 2 + i    changes to group ``groups[i]``
+
+To check for changes, a reader compares slot 0 with the version it has
+cached. That is one aligned 8-byte load and no system call. Only when the
+value has moved does the reader look at the group slots and rebuild the
+groups whose counters changed. Writers increment the counters under a
+POSIX record lock, plus a thread lock because record locks belong to the
+whole process.
+
+In three cases the counters live in process memory instead, and each
+process only sees its own changes:
+
+- the database is not a file, as with the in-memory test database;
+- ENABLED is off;
+- fcntl is not available.
+"""
+
+import mmap
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+
+try:
+    import fcntl
+except ImportError:  # not on Windows
+    fcntl = None
+
+DEFAULTS = {
+    'ENABLED': True,
+    'PATH': None,  # default: <database file>.generations
+}
+
+# One page: the header slots plus room for up to 510 groups
+FILE_SIZE = mmap.PAGESIZE
+HEADER_SLOTS = 2
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'CACHE_COHERENCE', {})}
+
+
+def sidecar_path(suffix):
+    """``<database file><suffix>``, or None when the database is not a file"""
+    name = str(connections['default'].settings_dict['NAME'])
+    if name == ':memory:' or name.startswith('file:'):
+        return None
+    return Path(name).with_name(Path(name).name + suffix)
+
+
+def counters_path():
+    """Path of the shared counters file, or None to keep them in process memory"""
+    config = get_config()
+    if not config['ENABLED'] or fcntl is None:
+        return None
+    if config['PATH'] is not None:
+        return Path(config['PATH'])
+    return sidecar_path('.generations')
+
+
+class Counters:
+    """Monotonic change counters for the named groups, opened on first use"""
+
+    def __init__(self, groups):
+        if HEADER_SLOTS + len(groups) > FILE_SIZE // 8:
+            raise ValueError('Too many counter groups for one page.')
+        self.groups = tuple(groups)
+        self._index = {group: HEADER_SLOTS + i for i, group in enumerate(self.groups)}
+        self._lock = threading.Lock()
+        self._slots = None
+        self._fd = None
+        self.path = None
+
+    def _open(self):
+        with self._lock:
+            if self._slots is None:
+                self.path = counters_path()
+                if self.path is None:
+                    buffer = bytearray(FILE_SIZE)
+                else:
+                    self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                    with self._file_lock():
+                        if os.fstat(self._fd).st_size < FILE_SIZE:
+                            os.ftruncate(self._fd, FILE_SIZE)
+                    buffer = mmap.mmap(self._fd, FILE_SIZE)
+                # 8-byte aligned slots: each read or write is a single load/store
+                self._slots = memoryview(buffer).cast('Q')
+        return self._slots
+
+    @contextmanager
+    def _file_lock(self):
+        if self._fd is None:
+            yield
+            return
+        fcntl.lockf(self._fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN)
+
+    @property
+    def slots(self):
+        slots = self._slots
+        return slots if slots is not None else self._open()
+
+    def version(self):
+        """Total number of changes so far; the per-request check"""
+        slots = self._slots
+        if slots is None:
+            slots = self._open()
+        return slots[0]
+
+    def read(self):
+        """``(version, changed_at, {group: counter})`` as of now"""
+        slots = self.slots
+        version, micros = slots[0], slots[1]
+        changed_at = _EPOCH + timedelta(microseconds=micros) if micros else None
+        return version, changed_at, {group: slots[i] for group, i in self._index.items()}
+
+    def bump(self, groups=None):
+        """Count a change to ``groups`` (default: every group)"""
+        indexes = [self._index[group] for group in (self.groups if groups is None else groups)]
+        slots = self.slots
+        micros = (datetime.now(timezone.utc) - _EPOCH) // timedelta(microseconds=1)
+        with self._lock, self._file_lock():
+            for i in indexes:
+                slots[i] += 1
+            slots[1] = max(slots[1], micros)
+            # Bumped last, so a reader that sees the new version sees the groups too
+            slots[0] += 1
@@ -0,0 +1,135 @@
+"""
+Conditional GET support for the public pages and JSON APIs.
+
+Validators come from the content snapshot, so ``If-None-Match`` and
+``If-Modified-Since`` are answered with a 304 before the view runs any query
+or render.
+
+Each ``*_validators(request, snapshot, user)`` function returns an
+``(etag, last_modified)`` pair. ``conditional()`` wraps sync views and
+``aconditional()`` async ones; both resolve the snapshot once per request
+and hand it to the view, and both tie the pair to the running code
+(app/build.py), so a deploy that changes the markup or JSON shape does
+not keep answering 304 for the output of the previous one.
+
+Query parameters are checked before the validators: a request with an
+invalid ``?limit=`` or ``?fields=`` gets its 400 even when its
+``If-None-Match`` matches.
+"""
+
+from datetime import timezone as dt_timezone
+from functools import wraps
+
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .build import get_build
+from .pagination import QueryError, parse_include
+from .serializers import AGGREGATE_SECTIONS
+from .snapshot import aget_snapshot, combined_etag, get_snapshot
+
+
+def content_validators(request, snapshot, user):
+    return snapshot.etag, snapshot.last_modified
+
+
+def page_validators(request, snapshot, user):
+    # Pages embed the signed-in user's nav/footer, so the same content
+    # version must validate differently per user. A date alone cannot tell
+    # an anonymous copy from a signed-in one, so only anonymous pages are
+    # dated.
+    if user.is_authenticated:
+        return f'{snapshot.etag}-u{user.pk}', None
+    return snapshot.etag, snapshot.last_modified
+
+
+def aggregate_validators(request, snapshot, user):
+    # One validator for exactly the sections selected with ?include=
+    try:
+        include = parse_include(request, AGGREGATE_SECTIONS)
+    except QueryError:
+        return None, None  # the view answers with a 400
+    etag = combined_etag(snapshot, [AGGREGATE_SECTIONS[name][0] for name in include])
+    return etag, snapshot.last_modified
+
+
+def with_build(etag, last_modified):
+    """``(etag, last_modified)`` of the content as served by this build"""
+    build = get_build()
+    if etag:
+        etag = f'{etag}-b{build.id}'
+    if last_modified is not None and build.time is not None:
+        last_modified = max(last_modified, build.time)
+    return etag, last_modified
+
+
+def _preconditions(request, snapshot, user, validators, params):
+    """Quoted etag and Last-Modified timestamp to check the request against"""
+    if params is not None:
+        try:
+            params(request)
+        except QueryError:
+            return None, None  # never 304: the view answers with a 400
+    etag, last_modified = with_build(*validators(request, snapshot, user))
+    etag = quote_etag(etag) if etag else None
+    timestamp = None
+    if last_modified is not None:
+        if timezone.is_naive(last_modified):
+            last_modified = timezone.make_aware(last_modified, dt_timezone.utc)
+        timestamp = int(last_modified.timestamp())
+    return etag, timestamp
+
+
+def _set_validators(request, response, etag, timestamp):
+    # Same header handling as django's condition()
+    if request.method in ('GET', 'HEAD'):
+        if timestamp and not response.has_header('Last-Modified'):
+            response.headers['Last-Modified'] = http_date(timestamp)
+        if etag:
+            response.headers.setdefault('ETag', etag)
+    return response
+
+
+def conditional(validators, params=None):
+    """
+    Answers conditional GETs of a sync view from ``validators``.
+
+    The snapshot is resolved once and passed on: the view is called as
+    ``view(request, snapshot)``. ``params(request)``, if given, checks the
+    query parameters first and raises QueryError for invalid ones, which
+    are then never answered with a 304.
+    """
+    def decorator(view):
+        @wraps(view)
+        def inner(request, *args, **kwargs):
+            snapshot = get_snapshot()
+            etag, timestamp = _preconditions(request, snapshot, request.user, validators, params)
+            response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+            if response is None:
+                response = view(request, snapshot, *args, **kwargs)
+            return _set_validators(request, response, etag, timestamp)
+        return inner
+    return decorator
+
+
+def aconditional(validators, resolve_user=False, params=None):
+    """
+    Async counterpart of ``conditional()``.
+
+    Resolves the snapshot (and, with ``resolve_user``, the session user)
+    without blocking the event loop and passes them on: the view is called
+    as ``view(request, snapshot, user)``.
+    """
+    def decorator(view):
+        @wraps(view)
+        async def inner(request, *args, **kwargs):
+            snapshot = await aget_snapshot()
+            user = await request.auser() if resolve_user else None
+            etag, timestamp = _preconditions(request, snapshot, user, validators, params)
+            response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+            if response is None:
+                response = await view(request, snapshot, user, *args, **kwargs)
+            return _set_validators(request, response, etag, timestamp)
+        return inner
+    return decorator
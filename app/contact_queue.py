@@ -0,0 +1,376 @@
+"""
+Write-behind queue for contact form submissions.
+
+``contact_form`` only validates a message and hands it to this queue, which
+appends it to an on-disk journal (fsynced, so an acknowledged message
+survives a crash) and returns immediately. One writer thread per process
+drains the queue with ``bulk_create`` whenever BATCH_SIZE messages are
+waiting or FLUSH_INTERVAL seconds have passed, so a burst of submissions
+costs a handful of SQLite write transactions instead of one each.
+
+Each process journals to append-only segments ``<JOURNAL_DIR>/<pid>-<n>.jsonl``
+and records how far they have been inserted in ``<pid>.offset`` (segment,
+committed line count). A flush only rewrites that small marker, outside
+the lock ``submit()`` takes, so its cost does not grow with the backlog.
+Once the queue is empty the segment is retired and the next message starts
+a new one. On start-up a process adopts the journals of processes that are
+no longer running (or of an earlier process with its pid) and replays what
+they had not committed. Delivery is at-least-once: a crash between the bulk
+insert and the marker update replays that batch.
+
+Messages the database rejects for good (a constraint failure, not a locked
+or unavailable database) are moved to ``dead-letter.jsonl`` with the error
+instead of blocking the queue.
+"""
+
+import atexit
+import json
+import logging
+import os
+import re
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DatabaseError, InterfaceError, OperationalError, close_old_connections, transaction
+
+from .models import ContactMessage
+from .processes import pid_alive
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'ENABLED': True,
+    'BATCH_SIZE': 50,
+    'FLUSH_INTERVAL': 1.0,
+    'MAX_DEPTH': 10000,
+    'JOURNAL_DIR': None,
+}
+
+DEAD_LETTER_NAME = 'dead-letter.jsonl'
+
+# Errors worth retrying: the database is locked, unreachable or out of space
+TRANSIENT_ERRORS = (OperationalError, InterfaceError)
+
+_SEGMENT = re.compile(r'^(\d+)-(\d+)\.jsonl$')
+
+
+class QueueFull(Exception):
+    """The writer has fallen too far behind to accept more messages"""
+
+
+def _segments(journal_dir, pid):
+    """Journal segments of process ``pid`` as sorted ``[(number, path)]``"""
+    segments = []
+    for path in journal_dir.glob(f'{pid}-*.jsonl'):
+        match = _SEGMENT.match(path.name)
+        if match and int(match[1]) == pid:
+            segments.append((int(match[2]), path))
+    return sorted(segments)
+
+
+def _read_lines(path):
+    entries = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                break  # torn final write from a crash; it was never acknowledged
+    return entries
+
+
+def _write_atomic(path, text):
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def read_uncommitted(journal_dir, pid, marker_path=None):
+    """
+    Entries journaled by process ``pid`` that its marker does not record as
+    inserted, with the segment files holding them
+    """
+    journal_dir = Path(journal_dir)
+    marker_path = marker_path or journal_dir / f'{pid}.offset'
+    try:
+        marker = json.loads(marker_path.read_text())
+    except (FileNotFoundError, ValueError):
+        marker = {'segment': -1, 'committed': 0}
+    entries, files = [], []
+    for number, path in _segments(journal_dir, pid):
+        files.append(path)
+        if number < marker['segment']:
+            continue  # retired: every entry was inserted
+        skip = marker['committed'] if number == marker['segment'] else 0
+        entries.extend(_read_lines(path)[skip:])
+    return entries, files
+
+
+class ContactQueue:
+    def __init__(self, journal_dir, batch_size=50, flush_interval=1.0, max_depth=10000):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_depth = max_depth
+        self.journal_dir = Path(journal_dir)
+        self.journal_dir.mkdir(parents=True, exist_ok=True)
+        self.pid = os.getpid()
+        self.marker_path = self.journal_dir / f'{self.pid}.offset'
+        self.dead_letter_path = self.journal_dir / DEAD_LETTER_NAME
+
+        self._cond = threading.Condition()
+        # Held from taking a batch until it is inserted and the marker moved
+        # past it, so the writer and drain() never insert the same batch
+        self._flush_lock = threading.Lock()
+        self._pending = []
+        self._journal = None
+        # Segments of an earlier process with this pid are adopted below;
+        # start after them so their files are never appended to
+        self._segment = max((n for n, _ in _segments(self.journal_dir, self.pid)), default=-1) + 1
+        self._appended = 0  # entries in the current segment
+        self._thread = None
+        self._stopping = False
+
+        # Metrics
+        self.accepted = 0
+        self.flushed = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.dead_lettered = 0
+        self.last_flush_seconds = 0.0
+
+        self._adopt_orphaned_journals()
+
+    # -- journal ------------------------------------------------------------
+
+    @property
+    def journal_path(self):
+        return self.journal_dir / f'{self.pid}-{self._segment}.jsonl'
+
+    def _adopt_orphaned_journals(self):
+        """Replay journals left behind by processes that have exited"""
+        recovered, adopted = [], []
+        for marker in sorted(self.journal_dir.glob('*.offset')):
+            try:
+                pid = int(marker.stem)
+            except ValueError:
+                continue
+            if pid != self.pid and pid_alive(pid):
+                continue
+            claimed = marker.with_name(f'{marker.name}.adopted-{self.pid}')
+            try:
+                os.rename(marker, claimed)
+            except FileNotFoundError:
+                continue  # another process adopted it first
+            entries, files = read_uncommitted(self.journal_dir, pid, claimed)
+            recovered.extend(entries)
+            adopted.extend([*files, claimed])
+
+        self._write_marker(self._segment, 0)
+        if recovered:
+            logger.warning('Replaying %d journaled contact message(s)', len(recovered))
+            self._append_journal(*recovered)
+            self._pending.extend(recovered)
+        # Only once the entries are durable in this process's own journal
+        for path in adopted:
+            path.unlink(missing_ok=True)
+        if recovered:
+            self._ensure_writer()
+
+    def _append_journal(self, *entries):
+        if self._journal is None:
+            self._journal = open(self.journal_path, 'a', encoding='utf-8')
+        self._journal.write(''.join(json.dumps(entry) + '\n' for entry in entries))
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+        self._appended += len(entries)
+
+    def _write_marker(self, segment, committed):
+        _write_atomic(self.marker_path, json.dumps({'segment': segment, 'committed': committed}))
+
+    def _dead_letter(self, rejected):
+        with open(self.dead_letter_path, 'a', encoding='utf-8') as f:
+            f.write(''.join(json.dumps(entry) + '\n' for entry in rejected))
+            f.flush()
+            os.fsync(f.fileno())
+        self.dead_lettered += len(rejected)
+        logger.error('Moved %d rejected contact message(s) to %s', len(rejected), self.dead_letter_path)
+
+    # -- producer -----------------------------------------------------------
+
+    def submit(self, name, email, subject, message):
+        """Durably accept a validated message for a later bulk insert"""
+        entry = {'name': name, 'email': email, 'subject': subject, 'message': message}
+        with self._cond:
+            if len(self._pending) >= self.max_depth:
+                raise QueueFull()
+            self._append_journal(entry)
+            self._pending.append(entry)
+            self.accepted += 1
+            if len(self._pending) >= self.batch_size:
+                self._cond.notify()
+        self._ensure_writer()
+
+    # -- writer -------------------------------------------------------------
+
+    def _ensure_writer(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._cond:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name='contact-queue-writer', daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                deadline = time.monotonic() + self.flush_interval
+                while len(self._pending) < self.batch_size and not self._stopping:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                stopping = self._stopping
+            if not self.flush() and not stopping:
+                # Database unavailable or locked: back off before retrying
+                time.sleep(self.flush_interval)
+            if stopping:
+                return
+
+    def flush(self):
+        """Insert up to one batch; returns False if the insert failed"""
+        with self._flush_lock:
+            # New submissions are only ever appended, so the head of the
+            # queue stays this batch until it is removed below
+            with self._cond:
+                batch = self._pending[:self.batch_size]
+            if not batch:
+                return True
+
+            started = time.perf_counter()
+            close_old_connections()
+            try:
+                rejected = self._insert(batch)
+            except TRANSIENT_ERRORS:
+                self.failed_flushes += 1
+                logger.exception('Failed to flush %d contact message(s)', len(batch))
+                return False
+            finally:
+                close_old_connections()
+            if rejected:
+                self._dead_letter(rejected)
+
+            retired = None
+            with self._cond:
+                del self._pending[:len(batch)]
+                if not self._pending and self._journal is not None:
+                    # Everything journaled is inserted: start a new segment
+                    self._journal.close()
+                    self._journal = None
+                    retired = self.journal_path
+                    self._segment += 1
+                    self._appended = 0
+                marker = (self._segment, self._appended - len(self._pending))
+                self.flushed += len(batch) - len(rejected)
+                self.flushes += 1
+                self.last_flush_seconds = time.perf_counter() - started
+            # The fsync happens without the lock, so submit() is not held up
+            self._write_marker(*marker)
+            if retired is not None:
+                retired.unlink(missing_ok=True)
+        return True
+
+    @staticmethod
+    def _insert(batch):
+        """
+        Insert ``batch``; returns the entries the database rejected, with the
+        error. Transient errors propagate so the whole batch is retried.
+        """
+        try:
+            with transaction.atomic():
+                ContactMessage.objects.bulk_create([ContactMessage(**entry) for entry in batch])
+            return []
+        except TRANSIENT_ERRORS:
+            raise
+        except (DatabaseError, TypeError, ValueError):
+            pass  # some entry is bad: insert one by one to set it aside
+        rejected = []
+        with transaction.atomic():
+            for entry in batch:
+                try:
+                    with transaction.atomic():
+                        ContactMessage.objects.create(**entry)
+                except TRANSIENT_ERRORS:
+                    raise
+                except (DatabaseError, TypeError, ValueError) as e:
+                    rejected.append({**entry, 'error': f'{type(e).__name__}: {e}'})
+        return rejected
+
+    def drain(self):
+        """Stop the writer and flush everything pending; used at shutdown"""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        while self._pending:
+            if not self.flush():
+                break
+
+    def stats(self):
+        with self._cond:
+            depth = len(self._pending)
+        return {
+            'depth': depth,
+            'accepted': self.accepted,
+            'flushed': self.flushed,
+            'flushes': self.flushes,
+            'failed_flushes': self.failed_flushes,
+            'dead_lettered': self.dead_lettered,
+            'last_flush_seconds': self.last_flush_seconds,
+        }
+
+
+def get_config():
+    config = {**DEFAULTS, **getattr(settings, 'CONTACT_QUEUE', {})}
+    if config['JOURNAL_DIR'] is None:
+        config['JOURNAL_DIR'] = Path(settings.BASE_DIR) / 'contact_journal'
+    return config
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_queue():
+    """The process-wide queue, or None when write-behind is disabled"""
+    global _queue
+    config = get_config()
+    if not config['ENABLED']:
+        return None
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = ContactQueue(
+                    config['JOURNAL_DIR'],
+                    batch_size=config['BATCH_SIZE'],
+                    flush_interval=config['FLUSH_INTERVAL'],
+                    max_depth=config['MAX_DEPTH'],
+                )
+                atexit.register(_queue.drain)
+    return _queue
+
+
+def stats():
+    """Queue metrics for this process (zeros when nothing was queued yet)"""
+    if _queue is None:
+        return {'depth': 0, 'accepted': 0, 'flushed': 0, 'flushes': 0,
+                'failed_flushes': 0, 'dead_lettered': 0, 'last_flush_seconds': 0.0}
+    return _queue.stats()
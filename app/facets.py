@@ -0,0 +1,163 @@
+"""
+Technology facets over the content snapshot.
+
+Project and experience technologies, the tech stack and the skills are all
+free text, so "Scikit-learn", "scikit learn" and "sklearn" are the same
+technology spelled three ways. ``tech_key()`` folds each name to one key,
+and ``TechIndex`` maps every key to the projects and experiences using it
+(as positions in the snapshot collections) plus whether it is in the tech
+stack or listed as a skill.
+
+``?tech=django,rag`` filters a collection by intersecting (``match=all``,
+the default) or uniting (``match=any``) those position sets, so a filter
+is a few set operations on the current snapshot; nothing is joined per
+request. The index is rebuilt when one of the sections it reads changes.
+"""
+
+import re
+import unicodedata
+from collections import Counter
+
+from .pagination import QueryError
+
+# Collections that can be filtered with ?tech=
+FILTERABLE = ('projects', 'experiences')
+
+# Sections the index is built from
+INDEXED_SECTIONS = (*FILTERABLE, 'tech_stack', 'skill_categories')
+
+MATCH_MODES = ('all', 'any')
+
+# Most technologies one ?tech= may name
+MAX_TECHS = 20
+
+# Spellings of the same technology, by folded key
+ALIASES = {
+    'js': 'javascript',
+    'ts': 'typescript',
+    'nodejs': 'node.js',
+    'node': 'node.js',
+    'postgres': 'postgresql',
+    'sklearn': 'scikit-learn',
+    'k8s': 'kubernetes',
+    'huggingface': 'hugging-face',
+    'hf': 'hugging-face',
+    'vscode': 'vs-code',
+    'drf': 'django-rest-framework',
+}
+
+_SEPARATORS = re.compile(r'[\s_/-]+')
+
+
+def tech_key(name):
+    """Normalized key of a technology name: folded case and accents, dashed words"""
+    folded = unicodedata.normalize('NFKD', name.strip().lower())
+    folded = ''.join(c for c in folded if not unicodedata.combining(c))
+    key = _SEPARATORS.sub('-', folded).strip('-')
+    return ALIASES.get(key, key)
+
+
+def parse_tech(request):
+    """
+    ``?tech=`` keys and ``?match=`` mode as ``(keys, mode)``, or None when
+    the collection is not filtered
+    """
+    raw = request.GET.get('tech')
+    if raw is None:
+        return None
+    keys = tuple(dict.fromkeys(tech_key(name) for name in raw.split(',') if name.strip()))
+    if not keys:
+        raise QueryError('tech must name at least one technology.')
+    if len(keys) > MAX_TECHS:
+        raise QueryError(f'tech may name at most {MAX_TECHS} technologies.')
+    mode = request.GET.get('match', 'all')
+    if mode not in MATCH_MODES:
+        raise QueryError(f"match must be one of: {', '.join(MATCH_MODES)}.")
+    return keys, mode
+
+
+# ===================================
+# INDEX
+# ===================================
+
+class TechIndex:
+    """Technology key -> positions of the projects and experiences using it"""
+    __slots__ = ('etags', 'names', 'positions', 'tech_stack', 'skills')
+
+    def __init__(self, etags, snapshot):
+        self.etags = etags
+        spellings = {}  # key -> Counter of the names written for it
+        self.positions = {name: {} for name in FILTERABLE}  # collection -> key -> positions
+        for name in FILTERABLE:
+            for position, row in enumerate(getattr(snapshot, name)):
+                for tech in row.technologies:
+                    key = tech_key(tech)
+                    spellings.setdefault(key, Counter())[tech] += 1
+                    self.positions[name].setdefault(key, set()).add(position)
+        self.tech_stack = set()
+        for row in snapshot.tech_stack:
+            key = tech_key(row.name)
+            spellings.setdefault(key, Counter())[row.name] += 1
+            self.tech_stack.add(key)
+        self.skills = set()
+        for category in snapshot.skill_categories:
+            for skill in category.skills:
+                key = tech_key(skill)
+                spellings.setdefault(key, Counter())[skill] += 1
+                self.skills.add(key)
+        # Display the most common spelling; ties go to the first one seen
+        self.names = {key: counter.most_common(1)[0][0] for key, counter in spellings.items()}
+
+    def matching(self, name, keys, mode):
+        """Sorted positions in collection ``name`` matching ``keys`` under ``mode``"""
+        index = self.positions[name]
+        sets = [index.get(key, set()) for key in keys]
+        if mode == 'all':
+            matched = set.intersection(*sorted(sets, key=len))
+        else:
+            matched = set().union(*sets)
+        return sorted(matched)
+
+    def filter(self, snapshot, name, keys, mode):
+        """Rows of snapshot collection ``name`` matching the filter, in order"""
+        rows = getattr(snapshot, name)
+        return tuple(rows[position] for position in self.matching(name, keys, mode))
+
+    def facets(self, within=None):
+        """
+        Facet counts for every technology, most used first. ``within`` is
+        ``{collection: positions}`` to count only inside a filtered result.
+        """
+        facets = []
+        for key, display in self.names.items():
+            counts = {}
+            for name in FILTERABLE:
+                positions = self.positions[name].get(key, ())
+                if within is not None:
+                    positions = within[name].intersection(positions)
+                counts[name] = len(positions)
+            if within is not None and not any(counts.values()):
+                continue
+            facets.append({
+                'tech': key,
+                'name': display,
+                **counts,
+                'total': sum(counts.values()),
+                'tech_stack': key in self.tech_stack,
+                'skill': key in self.skills,
+            })
+        facets.sort(key=lambda facet: (-facet['total'], facet['name'].lower()))
+        return facets
+
+
+_index = None
+
+
+def get_index(snapshot):
+    """The TechIndex for ``snapshot``, rebuilt when an indexed section changed"""
+    global _index
+    etags = tuple(snapshot.section_etags[name] for name in INDEXED_SECTIONS)
+    index = _index
+    if index is None or index.etags != etags:
+        index = _index = TechIndex(etags, snapshot)
+    return index
@@ -0,0 +1,52 @@
+"""
+Per-row HTML fragments for the experience timeline and project cards.
+
+The page cache re-renders a whole page whenever any content changes, and
+the experience and portfolio pages are one card per row. A
+``FragmentStore`` keeps each card's rendered HTML keyed by its snapshot
+row. Rows are immutable named tuples holding their children, so a row
+compares equal only while neither it nor any of its sections, tasks,
+metrics, highlights or technologies have changed. A page render then
+joins the stored fragments and renders only the cards of rows that were
+added or edited since the last render.
+"""
+
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from .metrics import timed
+
+
+class FragmentStore:
+    """Rendered ``template_name`` for each row, passed to it as ``name``"""
+
+    def __init__(self, template_name, name):
+        self.template_name = template_name
+        self.name = name
+        self._fragments = {}  # row -> HTML
+
+    def render(self, rows):
+        """HTML of all ``rows`` in order, rendering only rows not seen last time"""
+        previous = self._fragments
+        fragments = {}
+        with timed('render'):
+            for row in rows:
+                html = previous.get(row)
+                if html is None:
+                    html = render_to_string(self.template_name, {self.name: row})
+                fragments[row] = html
+        # Rows that were edited or removed drop out with the old mapping
+        self._fragments = fragments
+        return mark_safe(''.join(fragments[row] for row in rows))
+
+    def clear(self):
+        self._fragments = {}
+
+
+experience_cards = FragmentStore('partials/experience_card.html', 'experience')
+project_cards = FragmentStore('partials/project_card.html', 'project')
+
+
+def clear():
+    experience_cards.clear()
+    project_cards.clear()
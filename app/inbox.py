@@ -0,0 +1,156 @@
+"""
+Changelist machinery that keeps the ContactMessage admin fast at any size.
+
+- ``CachedCountPaginator`` remembers each filtered COUNT(*) for
+  ``COUNT_TTL`` seconds instead of recounting the table on every view.
+- ``KeysetChangeList`` pages the default ``(-created_at, -id)`` ordering
+  with a ``?cursor=`` (the last row seen) instead of ``OFFSET``, so "older"
+  pages are an index range scan however deep they are. Sorting by another
+  column falls back to numbered pages.
+- ``search()`` answers the admin search box from the ``app_contactmessage_fts``
+  FTS5 table (migration 0003), which triggers keep in step with the
+  messages, instead of four ``LIKE '%term%'`` scans.
+"""
+
+import re
+import time
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ORDER_VAR, ChangeList
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models.expressions import RawSQL
+from django.utils.functional import cached_property
+
+from .pagination import QueryError, decode_cursor, encode_cursor
+
+CURSOR_VAR = 'cursor'
+
+# Seconds a COUNT(*) is reused; new messages show up in the total within this
+COUNT_TTL = 60
+MAX_CACHED_COUNTS = 256
+
+FTS_TABLE = 'app_contactmessage_fts'
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+# ===================================
+# COUNTS
+# ===================================
+
+_counts = {}  # (alias, sql, params) -> (monotonic time, count)
+
+
+def clear_counts():
+    """Forget every cached count, e.g. after messages were changed or deleted"""
+    _counts.clear()
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator whose count is shared by identical querysets for COUNT_TTL seconds"""
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        sql, params = queryset.query.get_compiler(using=queryset.db).as_sql()
+        key = (queryset.db, sql, tuple(params))
+        now = time.monotonic()
+        cached = _counts.get(key)
+        if cached is not None and now - cached[0] < COUNT_TTL:
+            return cached[1]
+        count = super().count
+        if len(_counts) >= MAX_CACHED_COUNTS:
+            _counts.clear()
+        _counts[key] = (now, count)
+        return count
+
+
+# ===================================
+# KEYSET PAGES
+# ===================================
+
+def cursor_for(message):
+    """Cursor of the page that starts after ``message``"""
+    return encode_cursor([(message.created_at - _EPOCH) // _MICROSECOND, message.pk])
+
+
+def _after_cursor(queryset, cursor):
+    """Rows that sort after ``cursor`` in (-created_at, -id) order"""
+    try:
+        micros, pk = decode_cursor(cursor)
+    except (QueryError, ValueError):
+        raise IncorrectLookupParameters
+    created_at = _EPOCH + micros * _MICROSECOND
+    # Written as a range on created_at so SQLite walks the index from there
+    return queryset.filter(created_at__lte=created_at).exclude(created_at=created_at, pk__gte=pk)
+
+
+class KeysetChangeList(ChangeList):
+    """
+    ChangeList paged by ``?cursor=`` in the default ordering; exposes
+    ``keyset``, ``newest_url`` and ``older_url`` to the changelist template
+    """
+
+    def __init__(self, request, *args, **kwargs):
+        self.cursor = None
+        super().__init__(request, *args, **kwargs)
+
+    def get_queryset(self, request, exclude_parameters=None):
+        # The cursor is not a field lookup; keep it away from the filters
+        if CURSOR_VAR in self.params:
+            self.cursor = self.params.pop(CURSOR_VAR)
+            self.filter_params.pop(CURSOR_VAR, None)
+        return super().get_queryset(request, exclude_parameters)
+
+    def get_results(self, request):
+        self.keyset = ORDER_VAR not in self.params and not self.show_all
+        if not self.keyset:
+            return super().get_results(request)
+
+        paginator = self.model_admin.get_paginator(request, self.queryset, self.list_per_page)
+        queryset = self.queryset
+        if self.cursor:
+            queryset = _after_cursor(queryset, self.cursor)
+        rows = list(queryset[:self.list_per_page + 1])
+
+        self.result_count = paginator.count
+        self.full_result_count = None
+        self.show_full_result_count = False
+        self.show_admin_actions = True
+        self.result_list = rows[:self.list_per_page]
+        self.can_show_all = False
+        self.multi_page = self.result_count > self.list_per_page
+        self.paginator = paginator
+        self.newest_url = self.get_query_string() if self.cursor else None
+        self.older_url = None
+        if len(rows) > self.list_per_page:
+            self.older_url = self.get_query_string({CURSOR_VAR: cursor_for(self.result_list[-1])})
+
+
+# ===================================
+# FULL-TEXT SEARCH
+# ===================================
+
+def fts_query(term):
+    """FTS5 MATCH expression: every word in ``term``, each as a prefix"""
+    words = re.findall(r'\w+', term)
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def search(queryset, term):
+    """
+    Messages in ``queryset`` matching ``term`` in name, email, subject or
+    message. Returns None where there is no FTS5 table (other backends),
+    so the caller can fall back to the stock admin search.
+    """
+    if connections[queryset.db].vendor != 'sqlite':
+        return None
+    query = fts_query(term)
+    if not query:
+        return queryset
+    return queryset.filter(
+        pk__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', (query,))
+    )
@@ -0,0 +1,231 @@
+"""
+Django management command to benchmark every public page and API at scale
+
+Usage:
+    python manage.py bench_portfolio --scale 1000
+    python manage.py bench_portfolio --scale 10000 --output bench.json
+    python manage.py bench_portfolio --scale 10000 --baseline bench.json
+
+Creates a throwaway test database, fills it with app.synthetic data
+(--scale rows per section) and requests each route through the Django test
+client, without any network. For each route it reports cold (snapshot and
+page cache cleared) and warm latency percentiles, queries per request,
+peak memory allocated while handling one request (tracemalloc) and
+response bytes.
+
+--output writes the results as JSON. --baseline compares this run with a
+saved one and exits non-zero if any route's median latency, peak memory or
+response size grew by more than --tolerance, or if it issues more queries.
+Tail percentiles are reported but not compared: with a handful of cold
+samples they are single measurements and too noisy to gate on.
+"""
+
+import json
+import platform
+import time
+import tracemalloc
+from contextlib import ExitStack
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, setup_databases, teardown_databases
+from django.urls import reverse
+
+from app import pagecache, snapshot, synthetic
+
+# (URL name, query string)
+ROUTES = (
+    ('home', ''),
+    ('about', ''),
+    ('experience', ''),
+    ('portfolio', ''),
+    ('certifications', ''),
+    ('contact', ''),
+    ('get_projects', ''),
+    ('get_projects', 'limit=20'),
+    ('get_projects', 'stream=1'),
+    ('get_skills', ''),
+    ('get_certifications', ''),
+    ('get_experience', ''),
+    ('get_experience', 'stream=1'),
+    ('get_portfolio', ''),
+    ('get_tech', ''),
+    ('get_projects', 'tech=python,django'),
+    ('search', 'q=python'),
+)
+
+PHASES = ('cold', 'warm')
+
+# Latency changes smaller than this are noise, whatever the percentage
+MIN_LATENCY_DELTA_MS = 5.0
+# Same for allocation peaks
+MIN_MEMORY_DELTA_KB = 64
+
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks the public pages and APIs against synthetic data of a given scale'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int, default=1000, help='Rows per section (default: 1000)')
+        parser.add_argument('--cold', type=int, default=10, help='Cold requests per route (default: 10)')
+        parser.add_argument('--warm', type=int, default=50, help='Warm requests per route (default: 50)')
+        parser.add_argument('--seed', type=int, default=0, help='Synthetic data seed (default: 0)')
+        parser.add_argument('--output', help='Write the results to this JSON file')
+        parser.add_argument('--baseline', help='Compare with the results in this JSON file')
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=0.3,
+            help='Allowed relative slowdown/growth before a metric counts as a regression (default: 0.3)',
+        )
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline']) as f:
+                baseline = json.load(f)
+            if baseline['scale'] != options['scale']:
+                raise CommandError(
+                    f"Baseline was recorded at --scale {baseline['scale']}, not {options['scale']}"
+                )
+
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            started = time.perf_counter()
+            synthetic.generate(options['scale'], seed=options['seed'])
+            self.stdout.write(
+                f"Generated scale {options['scale']} in {time.perf_counter() - started:.1f}s"
+            )
+            results = {
+                'scale': options['scale'],
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'routes': self.run(options),
+            }
+        finally:
+            teardown_databases(old_config, verbosity=0)
+
+        self.report(results['routes'])
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2, sort_keys=True)
+            self.stdout.write(f"Results written to {options['output']}")
+        if baseline is not None:
+            self.compare(baseline['routes'], results['routes'], options['tolerance'])
+
+    # -- measuring ------------------------------------------------------------
+
+    def run(self, options):
+        client = Client(HTTP_HOST='localhost')
+        routes = {}
+        for url_name, query in ROUTES:
+            path = reverse(url_name) + (f'?{query}' if query else '')
+            routes[path] = self.measure(client, path, options)
+            self.stdout.write(f'✓ {path}')
+        return routes
+
+    def request(self, client, path, cold):
+        if cold:
+            snapshot.invalidate()
+            pagecache.clear()
+        response = client.get(path)
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        if response.status_code != 200:
+            raise CommandError(f'{path} returned {response.status_code}')
+        return body
+
+    def timed_requests(self, client, path, cold, count):
+        samples = []
+        for _ in range(count):
+            start = time.perf_counter()
+            self.request(client, path, cold)
+            samples.append((time.perf_counter() - start) * 1000)
+        return samples
+
+    def measure(self, client, path, options):
+        result = {}
+        for phase in PHASES:
+            cold = phase == 'cold'
+            self.request(client, path, cold)  # prime (warm) / discard first-import costs (cold)
+
+            # Queries and allocations in separate passes, so neither the
+            # query capture nor tracemalloc slows down the timed requests
+            with ExitStack() as stack:
+                captures = [stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in connections]
+                body = self.request(client, path, cold)
+            queries = sum(len(capture) for capture in captures)
+
+            tracemalloc.start()
+            try:
+                if cold:
+                    snapshot.invalidate()
+                    pagecache.clear()
+                baseline, _ = tracemalloc.get_traced_memory()
+                tracemalloc.reset_peak()
+                self.request(client, path, cold=False)
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+            samples = self.timed_requests(client, path, cold, options[phase])
+            result[phase] = {
+                'p50_ms': round(percentile(samples, 0.50), 3),
+                'p95_ms': round(percentile(samples, 0.95), 3),
+                'p99_ms': round(percentile(samples, 0.99), 3),
+                'queries': queries,
+                'peak_kb': round((peak - baseline) / 1024, 1),
+            }
+        result['bytes'] = len(body)
+        return result
+
+    # -- reporting ------------------------------------------------------------
+
+    def report(self, routes):
+        header = (
+            f"{'route':<28} {'cold p50/p95/p99 ms':>24} {'warm p50/p95/p99 ms':>22} "
+            f"{'queries':>8} {'peak KB':>16} {'bytes':>9}"
+        )
+        self.stdout.write(self.style.MIGRATE_HEADING(header))
+        for path, result in routes.items():
+            cold, warm = result['cold'], result['warm']
+            self.stdout.write(
+                f"{path:<28} "
+                f"{cold['p50_ms']:>8.2f}/{cold['p95_ms']:.2f}/{cold['p99_ms']:<7.2f} "
+                f"{warm['p50_ms']:>7.2f}/{warm['p95_ms']:.2f}/{warm['p99_ms']:<6.2f} "
+                f"{cold['queries']:>4}/{warm['queries']:<3} "
+                f"{cold['peak_kb']:>8}/{warm['peak_kb']:<7} "
+                f"{result['bytes']:>9}"
+            )
+
+    def compare(self, baseline, current, tolerance):
+        regressions = []
+        for path, result in current.items():
+            before = baseline.get(path)
+            if before is None:
+                continue
+            for phase in PHASES:
+                now, then = result[phase], before[phase]
+                if (now['p50_ms'] > then['p50_ms'] * (1 + tolerance)
+                        and now['p50_ms'] - then['p50_ms'] > MIN_LATENCY_DELTA_MS):
+                    regressions.append(f"{path} {phase} p50_ms: {then['p50_ms']} -> {now['p50_ms']}")
+                if now['queries'] > then['queries']:
+                    regressions.append(f"{path} {phase} queries: {then['queries']} -> {now['queries']}")
+                if (now['peak_kb'] > then['peak_kb'] * (1 + tolerance)
+                        and now['peak_kb'] - then['peak_kb'] > MIN_MEMORY_DELTA_KB):
+                    regressions.append(f"{path} {phase} peak_kb: {then['peak_kb']} -> {now['peak_kb']}")
+            if result['bytes'] > before['bytes'] * (1 + tolerance):
+                regressions.append(f"{path} bytes: {before['bytes']} -> {result['bytes']}")
+
+        if regressions:
+            for line in regressions:
+                self.stderr.write(self.style.ERROR(f'✗ {line}'))
+            raise CommandError(f'{len(regressions)} regression(s) against the baseline')
+        self.stdout.write(self.style.SUCCESS('No regressions against the baseline'))
@@ -0,0 +1,127 @@
+"""
+Django management command to pre-render the public site to static files
+
+Usage:
+    python manage.py build_static_site
+    python manage.py build_static_site --output /srv/portfolio --incremental
+
+Every public page and API payload is written as an index.html/index.json
+file in a directory tree mirroring the URLs, together with precompressed
+.gz (and .br, when the brotli package is installed) siblings that WhiteNoise,
+nginx (gzip_static/brotli_static) or any static file server can serve as-is.
+
+With --incremental, only routes whose snapshot sections changed since the
+last build are re-rendered. A new build of the code (app.build) re-renders
+everything, since templates and serializers shape every file.
+"""
+
+import gzip
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.urls import reverse
+
+from app.build import get_build
+from app.facets import INDEXED_SECTIONS
+from app.snapshot import get_snapshot
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MANIFEST_NAME = '.build_manifest.json'
+
+# URL name -> (output file name, snapshot sections the response depends on).
+# Every page also depends on the profile through base.html.
+ROUTES = {
+    'home': ('index.html', ('profile', 'tech_stack', 'highlights')),
+    'about': ('index.html', ('profile', 'skill_categories', 'education')),
+    'experience': ('index.html', ('profile', 'experiences')),
+    'portfolio': ('index.html', ('profile', 'projects')),
+    'certifications': ('index.html', ('profile', 'certifications')),
+    'contact': ('index.html', ('profile',)),
+    'get_projects': ('index.json', ('projects',)),
+    'get_skills': ('index.json', ('skill_categories',)),
+    'get_certifications': ('index.json', ('certifications',)),
+    'get_experience': ('index.json', ('experiences',)),
+    'get_tech': ('index.json', INDEXED_SECTIONS),
+    'get_portfolio': ('index.json', (
+        'profile', 'tech_stack', 'skill_categories', 'experiences',
+        'projects', 'certifications', 'education', 'highlights',
+    )),
+}
+
+
+class Command(BaseCommand):
+    help = 'Pre-renders every public page and API payload to static files'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            default=str(Path(settings.BASE_DIR) / 'static_site'),
+            help='Directory to write the site to (default: BASE_DIR/static_site)',
+        )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Only re-render routes whose content changed since the last build',
+        )
+
+    def handle(self, *args, **options):
+        output = Path(options['output'])
+        output.mkdir(parents=True, exist_ok=True)
+        manifest_path = output / MANIFEST_NAME
+
+        build_id = get_build().id
+        previous = {}
+        if options['incremental'] and manifest_path.exists():
+            stored = json.loads(manifest_path.read_text())
+            if stored.get('build') == build_id:
+                previous = stored['routes']
+            else:
+                self.stdout.write('Code changed since the last build, re-rendering every route')
+
+        if brotli is None:
+            self.stdout.write(self.style.WARNING('brotli is not installed, skipping .br files'))
+
+        snapshot = get_snapshot()
+        client = Client(HTTP_HOST='localhost')
+        manifest = {}
+        rendered = skipped = 0
+
+        for url_name, (filename, sections) in ROUTES.items():
+            path = reverse(url_name)
+            digests = {section: snapshot.section_etags[section] for section in sections}
+            target = output / path.lstrip('/') / filename
+            manifest[path] = digests
+
+            if previous.get(path) == digests and target.exists():
+                skipped += 1
+                continue
+
+            response = client.get(path)
+            if response.status_code != 200:
+                self.stderr.write(self.style.ERROR(f'✗ {path} returned {response.status_code}'))
+                manifest.pop(path)
+                continue
+
+            self.write_file(target, response.content)
+            rendered += 1
+            self.stdout.write(f'✓ {path} -> {target.relative_to(output)}')
+
+        manifest_path.write_text(json.dumps({'build': build_id, 'routes': manifest}, indent=2, sort_keys=True))
+        self.stdout.write(self.style.SUCCESS(
+            f'Static site written to {output}: {rendered} rendered, {skipped} unchanged'
+        ))
+
+    def write_file(self, target, body):
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(body)
+        # mtime=0 keeps the .gz byte-identical across rebuilds of the same content
+        Path(f'{target}.gz').write_bytes(gzip.compress(body, compresslevel=9, mtime=0))
+        if brotli is not None:
+            Path(f'{target}.br').write_bytes(brotli.compress(body))
@@ -0,0 +1,169 @@
+"""
+Django management command to audit the SQLite query plans behind every view
+
+Usage:
+    python manage.py explain_views
+    python manage.py explain_views --verbose --strict
+
+Requests every URL in app/urls.py and the admin changelist of every model
+of this app (once unfiltered and once per boolean list_filter) with the
+snapshot and page caches cleared, captures the SQL each one issues and runs
+EXPLAIN QUERY PLAN on it. Plans that scan a whole table without an index
+(SCAN <table>) or sort in a temporary B-tree (USE TEMP B-TREE) are flagged.
+
+Django's own admins (users, groups) are left out: their tables and indexes
+are not this project's to change.
+
+Admin pages are requested as a throwaway superuser created inside a
+transaction that is rolled back, so the database is left untouched.
+"""
+
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, models, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import NoReverseMatch, reverse
+
+from app import pagecache, snapshot
+from app.models import Profile
+from app.urls import urlpatterns
+
+# URL name -> extra query strings worth auditing on their own
+VARIANTS = {
+    'get_projects': ('stream=1',),
+    'get_experience': ('stream=1',),
+    'get_tech': ('tech=python',),
+    'search': ('q=python',),
+}
+
+# Tables that can only ever hold one row (Profile.save() enforces it)
+SINGLETON_TABLES = (Profile._meta.db_table,)
+
+
+def is_flagged(detail):
+    """Full table scan or temporary sort in one EXPLAIN QUERY PLAN row"""
+    full_scan = (
+        detail.startswith('SCAN')
+        and ' USING ' not in detail
+        and detail.split()[1] not in SINGLETON_TABLES
+    )
+    return full_scan or 'USE TEMP B-TREE' in detail
+
+
+class Command(BaseCommand):
+    help = 'Runs EXPLAIN QUERY PLAN on every query issued by the public views and admin changelists'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verbose',
+            action='store_true',
+            help='Print the plan of every query, not only the flagged ones',
+        )
+        parser.add_argument(
+            '--strict',
+            action='store_true',
+            help='Exit with an error if any plan is flagged',
+        )
+
+    def handle(self, *args, **options):
+        self.verbose = options['verbose']
+        self.flagged = 0
+        # Views share most queries (every cold page rebuilds the snapshot);
+        # each distinct statement is explained once, where it first appears
+        self.seen = set()
+        client = Client(HTTP_HOST='localhost')
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Public views'))
+        for path in self.public_paths():
+            self.audit(client, path)
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Admin changelists'))
+        with transaction.atomic():
+            user = User(username='explain-views', is_staff=True, is_superuser=True)
+            user.set_unusable_password()
+            user.save()
+            client.force_login(user)
+            for path in self.admin_paths():
+                self.audit(client, path)
+            transaction.set_rollback(True)
+
+        if self.flagged:
+            message = f'{self.flagged} query plan(s) flagged'
+            if options['strict']:
+                raise CommandError(message)
+            self.stdout.write(self.style.WARNING(message))
+        else:
+            self.stdout.write(self.style.SUCCESS('No full scans or temporary sorts'))
+
+    def public_paths(self):
+        for pattern in urlpatterns:
+            try:
+                path = reverse(pattern.name)
+            except NoReverseMatch:
+                continue  # needs URL arguments
+            yield path
+            for query in VARIANTS.get(pattern.name, ()):
+                yield f'{path}?{query}'
+
+    def admin_paths(self):
+        for model, model_admin in admin.site._registry.items():
+            opts = model._meta
+            if opts.app_label != Profile._meta.app_label:
+                continue
+            path = reverse(f'admin:{opts.app_label}_{opts.model_name}_changelist')
+            yield path
+            for name in model_admin.list_filter:
+                if not isinstance(name, str):
+                    continue
+                field = opts.get_field(name)
+                if isinstance(field, models.BooleanField):
+                    yield f'{path}?{name}__exact=0'
+
+    def audit(self, client, path):
+        # Start cold, so the queries a rebuild issues are captured too
+        snapshot.invalidate()
+        pagecache.clear()
+
+        with CaptureQueriesContext(connections['default']) as writer_queries:
+            if 'replica' in connections:
+                with CaptureQueriesContext(connections['replica']) as reader_queries:
+                    status = self.fetch(client, path)
+                captured = [('replica', q['sql']) for q in reader_queries]
+            else:
+                status = self.fetch(client, path)
+                captured = []
+        captured += [('default', q['sql']) for q in writer_queries]
+
+        results = []
+        for alias, sql in captured:
+            if sql in self.seen or not sql.lstrip().upper().startswith('SELECT'):
+                continue
+            self.seen.add(sql)
+            with connections[alias].cursor() as cursor:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                plan = [row[3] for row in cursor.fetchall()]
+            results.append((sql, plan, [detail for detail in plan if is_flagged(detail)]))
+
+        flagged = sum(1 for _, _, flags in results if flags)
+        self.flagged += flagged
+        summary = f'{path} [{status}] {len(captured)} queries, {len(results)} new'
+        if flagged:
+            self.stdout.write(self.style.WARNING(f'✗ {summary}, {flagged} flagged'))
+        else:
+            self.stdout.write(f'✓ {summary}')
+
+        for sql, plan, flags in results:
+            if not (flags or self.verbose):
+                continue
+            self.stdout.write(f'    {sql}')
+            for detail in plan:
+                line = f'      {"!" if detail in flags else "-"} {detail}'
+                self.stdout.write(self.style.WARNING(line) if detail in flags else line)
+
+    def fetch(self, client, path):
+        response = client.get(path)
+        if response.streaming:
+            b''.join(response.streaming_content)
+        return response.status_code
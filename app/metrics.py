@@ -0,0 +1,326 @@
+"""
+Per-request timings, reported in a ``Server-Timing`` header and as
+Prometheus histograms.
+
+``ServerTimingMiddleware`` measures each request's view time and collects
+what the code inside it reports: SQL count and time (an ``execute_wrapper``
+installed on every database connection), template rendering
+(``timed('render')`` in the page cache) and JSON encoding
+(``timed('serialize')`` in the API views). Streamed bodies are encoded
+after the response has left the middleware and are not included.
+
+The header reveals how much SQL each page runs, so it is only sent to
+active staff users unless ``METRICS['PUBLIC_SERVER_TIMING']`` is set. Only
+requests carrying a session cookie are checked, so anonymous responses
+neither load a session nor gain ``Vary: Cookie``.
+
+Every request is also recorded in this process's histograms, labelled by
+URL name. Each process periodically writes them to
+``<METRICS['DIR']>/<pid>.json``; ``render_prometheus()`` merges the files
+of all running workers with its own live state, so ``/metrics/`` shows the
+whole server whichever worker answers. A restarted worker starts from zero,
+which Prometheus' rate() treats as an ordinary counter reset.
+"""
+
+import atexit
+import json
+import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from time import monotonic, perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db.backends.signals import connection_created
+
+from . import contact_queue
+from .processes import pid_alive
+
+DEFAULTS = {
+    'ENABLED': True,
+    'DIR': None,
+    'FLUSH_INTERVAL': 5.0,
+    'PUBLIC_SERVER_TIMING': False,
+}
+
+# Histogram upper bounds in seconds
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# timing -> (metric name, help text); also the order of the Server-Timing entries
+TIMINGS = {
+    'view': ('portfolio_view_seconds', 'Time spent in the view, including SQL, rendering and serialization'),
+    'sql': ('portfolio_sql_seconds', 'Time spent executing SQL'),
+    'render': ('portfolio_render_seconds', 'Time spent rendering templates'),
+    'serialize': ('portfolio_serialize_seconds', 'Time spent building and encoding JSON'),
+}
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def get_config():
+    config = {**DEFAULTS, **getattr(settings, 'METRICS', {})}
+    if config['DIR'] is None:
+        config['DIR'] = Path(settings.BASE_DIR) / 'metrics'
+    return config
+
+
+# ===================================
+# COLLECTION
+# ===================================
+
+class RequestTimings:
+    """Timings reported while one request is being handled"""
+    __slots__ = ('durations', 'queries')
+
+    def __init__(self):
+        self.durations = dict.fromkeys(TIMINGS, 0.0)
+        self.queries = 0
+
+    def header(self):
+        entries = []
+        for name, seconds in self.durations.items():
+            entry = f'{name};dur={seconds * 1000:.2f}'
+            if name == 'sql':
+                entry += f';desc="{self.queries} queries"'
+            entries.append(entry)
+        return ', '.join(entries)
+
+
+_current = ContextVar('request_timings', default=None)
+
+
+@contextmanager
+def timed(name):
+    """Add the time spent in the block to the current request's ``name`` timing"""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        timings.durations[name] += perf_counter() - start
+
+
+def _record_sql(execute, sql, params, many, context):
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    start = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.durations['sql'] += perf_counter() - start
+        timings.queries += 1
+
+
+def _install_sql_wrapper(sender, connection, **kwargs):
+    # Installed for the connection's lifetime rather than per request, so
+    # queries run by sync_to_async threads (async views) are counted too
+    if _record_sql not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_sql)
+
+
+def connect_signals():
+    connection_created.connect(_install_sql_wrapper, dispatch_uid='metrics_sql_wrapper')
+
+
+# ===================================
+# AGGREGATION
+# ===================================
+
+def _empty_histogram():
+    return {'buckets': [0] * (len(BUCKETS) + 1), 'sum': 0.0, 'count': 0}
+
+
+class Registry:
+    """This process's histograms and counters, keyed by URL name"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms = {}  # (timing, url_name) -> histogram
+        self.queries = {}  # url_name -> SQL queries issued
+        self._flushed_at = monotonic()
+
+    def observe(self, url_name, timings):
+        with self._lock:
+            for name, seconds in timings.durations.items():
+                histogram = self.histograms.setdefault((name, url_name), _empty_histogram())
+                index = next((i for i, bound in enumerate(BUCKETS) if seconds <= bound), len(BUCKETS))
+                histogram['buckets'][index] += 1
+                histogram['sum'] += seconds
+                histogram['count'] += 1
+            self.queries[url_name] = self.queries.get(url_name, 0) + timings.queries
+
+    def state(self):
+        with self._lock:
+            return {
+                'histograms': [
+                    [name, url_name, dict(histogram, buckets=list(histogram['buckets']))]
+                    for (name, url_name), histogram in self.histograms.items()
+                ],
+                'queries': dict(self.queries),
+                'contact_queue': contact_queue.stats(),
+            }
+
+    def maybe_flush(self, interval):
+        if monotonic() - self._flushed_at >= interval:
+            self.flush()
+
+    def flush(self):
+        """Write this process's state for the other workers to merge"""
+        self._flushed_at = monotonic()
+        directory = Path(get_config()['DIR'])
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f'{os.getpid()}.json'
+        tmp = path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(self.state()))
+        os.replace(tmp, path)
+
+
+registry = Registry()
+
+
+def _merge(total, state):
+    for name, url_name, histogram in state['histograms']:
+        merged = total['histograms'].setdefault((name, url_name), _empty_histogram())
+        merged['buckets'] = [a + b for a, b in zip(merged['buckets'], histogram['buckets'])]
+        merged['sum'] += histogram['sum']
+        merged['count'] += histogram['count']
+    for url_name, count in state['queries'].items():
+        total['queries'][url_name] = total['queries'].get(url_name, 0) + count
+    for key, value in state['contact_queue'].items():
+        if key == 'last_flush_seconds':
+            total['contact_queue'][key] = max(total['contact_queue'].get(key, 0.0), value)
+        else:
+            total['contact_queue'][key] = total['contact_queue'].get(key, 0) + value
+
+
+def collect():
+    """Merged state of this process and every other running worker"""
+    total = {'histograms': {}, 'queries': {}, 'contact_queue': {}}
+    directory = Path(get_config()['DIR'])
+    for path in sorted(directory.glob('*.json')):
+        try:
+            pid = int(path.stem)
+        except ValueError:
+            continue
+        if pid == os.getpid():
+            continue  # merged from live state below
+        if not pid_alive(pid):
+            path.unlink(missing_ok=True)
+            continue
+        try:
+            _merge(total, json.loads(path.read_text()))
+        except (OSError, ValueError):
+            continue  # replaced or removed while we read it
+    _merge(total, registry.state())
+    return total
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render_prometheus():
+    """All workers' metrics in the Prometheus text exposition format"""
+    total = collect()
+    lines = []
+    for timing, (metric, help_text) in TIMINGS.items():
+        lines += [f'# HELP {metric} {help_text}', f'# TYPE {metric} histogram']
+        for (name, url_name), histogram in sorted(total['histograms'].items()):
+            if name != timing:
+                continue
+            label = f'url_name="{_label(url_name)}"'
+            cumulative = 0
+            for bound, count in zip(BUCKETS + ('+Inf',), histogram['buckets']):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{{label},le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_sum{{{label}}} {histogram["sum"]}')
+            lines.append(f'{metric}_count{{{label}}} {histogram["count"]}')
+
+    lines += [
+        '# HELP portfolio_sql_queries_total SQL queries issued',
+        '# TYPE portfolio_sql_queries_total counter',
+    ]
+    for url_name, count in sorted(total['queries'].items()):
+        lines.append(f'portfolio_sql_queries_total{{url_name="{_label(url_name)}"}} {count}')
+
+    for key, value in total['contact_queue'].items():
+        metric = f'portfolio_contact_queue_{key}'
+        kind = 'gauge' if key in ('depth', 'last_flush_seconds') else 'counter'
+        if kind == 'counter':
+            metric += '_total'
+        lines += [f'# TYPE {metric} {kind}', f'{metric} {value}']
+    return '\n'.join(lines) + '\n'
+
+
+# ===================================
+# MIDDLEWARE
+# ===================================
+
+def _may_be_staff(request):
+    return settings.SESSION_COOKIE_NAME in request.COOKIES and hasattr(request, 'user')
+
+
+class ServerTimingMiddleware:
+    """
+    Records every request's timings in the histograms and reports them in a
+    Server-Timing header to staff. Listed last in MIDDLEWARE, so the time it
+    measures is the view's.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        config = get_config()
+        if not config['ENABLED']:
+            raise MiddlewareNotUsed()
+        self.flush_interval = config['FLUSH_INTERVAL']
+        self.public = config['PUBLIC_SERVER_TIMING']
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        atexit.register(registry.flush)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timings = RequestTimings()
+        token = _current.set(timings)
+        start = perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        elapsed = perf_counter() - start
+        show = self.public or (_may_be_staff(request) and request.user.is_active and request.user.is_staff)
+        return self.finish(request, response, timings, elapsed, show)
+
+    async def __acall__(self, request):
+        timings = RequestTimings()
+        token = _current.set(timings)
+        start = perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        elapsed = perf_counter() - start
+        show = self.public
+        if not show and _may_be_staff(request):
+            user = await request.auser()
+            show = user.is_active and user.is_staff
+        return self.finish(request, response, timings, elapsed, show)
+
+    def finish(self, request, response, timings, elapsed, show):
+        timings.durations['view'] = elapsed
+        if show:
+            response['Server-Timing'] = timings.header()
+        match = request.resolver_match
+        registry.observe(match.view_name if match else '<unresolved>', timings)
+        registry.maybe_flush(self.flush_interval)
+        return response
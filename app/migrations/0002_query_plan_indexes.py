@@ -0,0 +1,97 @@
+# Generated by Django 5.2.11 on 2026-10-17 04:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='certification',
+            index=models.Index(fields=['order', 'id', 'is_active'], name='cert_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='certification',
+            index=models.Index(fields=['category'], name='cert_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='certification',
+            index=models.Index(fields=['issuer'], name='cert_issuer_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(fields=['-created_at', '-id'], name='contact_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['-created_at', '-id'], name='contact_unread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(condition=models.Q(('is_replied', False)), fields=['-created_at', '-id'], name='contact_unreplied_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='education',
+            index=models.Index(fields=['-end_year', 'id', 'is_active'], name='education_end_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='education',
+            index=models.Index(fields=['institution'], name='education_institution_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='experience',
+            index=models.Index(fields=['-start_date', 'id', 'is_active', 'is_current'], name='experience_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='experience',
+            index=models.Index(fields=['company'], name='experience_company_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='experiencesection',
+            index=models.Index(fields=['experience', 'order'], name='expsection_parent_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='experiencetask',
+            index=models.Index(fields=['section', 'order'], name='exptask_parent_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='experiencetech',
+            index=models.Index(fields=['experience', 'order'], name='exptech_parent_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='highlight',
+            index=models.Index(fields=['order', 'id', 'is_active'], name='highlight_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['order', 'id', 'is_active', 'is_featured'], name='project_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projecthighlight',
+            index=models.Index(fields=['project', 'order'], name='projhighlight_parent_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projectmetric',
+            index=models.Index(fields=['project', 'order'], name='projmetric_parent_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projecttech',
+            index=models.Index(fields=['project', 'order'], name='projtech_parent_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(fields=['category', 'order', 'id', 'is_active'], name='skill_category_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skillcategory',
+            index=models.Index(fields=['order', 'id', 'is_active'], name='skillcat_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='techstack',
+            index=models.Index(fields=['order', 'id', 'is_active'], name='techstack_order_idx'),
+        ),
+    ]
@@ -0,0 +1,71 @@
+"""
+FTS5 index over contact messages for the admin search (app/inbox.py).
+
+An external-content FTS5 table holds only the index; triggers keep it in
+step with app_contactmessage on every insert, delete and text update, bulk
+inserts from the contact queue included. SQLite only: other backends keep
+the stock admin search.
+"""
+
+from django.db import migrations
+
+CREATE = (
+    """
+    CREATE VIRTUAL TABLE app_contactmessage_fts USING fts5(
+        name, email, subject, message,
+        content='app_contactmessage', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER app_contactmessage_fts_insert AFTER INSERT ON app_contactmessage BEGIN
+        INSERT INTO app_contactmessage_fts (rowid, name, email, subject, message)
+        VALUES (new.id, new.name, new.email, new.subject, new.message);
+    END
+    """,
+    """
+    CREATE TRIGGER app_contactmessage_fts_delete AFTER DELETE ON app_contactmessage BEGIN
+        INSERT INTO app_contactmessage_fts (app_contactmessage_fts, rowid, name, email, subject, message)
+        VALUES ('delete', old.id, old.name, old.email, old.subject, old.message);
+    END
+    """,
+    # Marking a message read or replied leaves the index alone
+    """
+    CREATE TRIGGER app_contactmessage_fts_update
+    AFTER UPDATE OF name, email, subject, message ON app_contactmessage BEGIN
+        INSERT INTO app_contactmessage_fts (app_contactmessage_fts, rowid, name, email, subject, message)
+        VALUES ('delete', old.id, old.name, old.email, old.subject, old.message);
+        INSERT INTO app_contactmessage_fts (rowid, name, email, subject, message)
+        VALUES (new.id, new.name, new.email, new.subject, new.message);
+    END
+    """,
+    # Index the messages that already exist
+    "INSERT INTO app_contactmessage_fts (app_contactmessage_fts) VALUES ('rebuild')",
+)
+
+DROP = (
+    'DROP TRIGGER IF EXISTS app_contactmessage_fts_update',
+    'DROP TRIGGER IF EXISTS app_contactmessage_fts_delete',
+    'DROP TRIGGER IF EXISTS app_contactmessage_fts_insert',
+    'DROP TABLE IF EXISTS app_contactmessage_fts',
+)
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0002_query_plan_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(_run(CREATE), _run(DROP)),
+    ]
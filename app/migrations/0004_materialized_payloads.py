@@ -0,0 +1,23 @@
+# Generated by Django 5.2.11 on 2026-10-17 05:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0003_contactmessage_fts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='experience',
+            name='payload',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='payload',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Q
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 
@@ -56,6 +57,9 @@ class TechStack(models.Model):
     
     class Meta:
         ordering = ['order']
+        indexes = [
+            models.Index(fields=['order', 'id', 'is_active'], name='techstack_order_idx'),
+        ]
         verbose_name = "Tech Stack Item"
         verbose_name_plural = "Tech Stack"
     
@@ -75,6 +79,9 @@ class SkillCategory(models.Model):
     
     class Meta:
         ordering = ['order']
+        indexes = [
+            models.Index(fields=['order', 'id', 'is_active'], name='skillcat_order_idx'),
+        ]
         verbose_name = "Skill Category"
         verbose_name_plural = "Skill Categories"
     
@@ -91,6 +98,9 @@ class Skill(models.Model):
     
     class Meta:
         ordering = ['order']
+        indexes = [
+            models.Index(fields=['category', 'order', 'id', 'is_active'], name='skill_category_order_idx'),
+        ]
     
     def __str__(self):
         return f"{self.category.name} - {self.name}"
@@ -114,8 +124,15 @@ class Experience(models.Model):
     order = models.IntegerField(default=0, help_text="Display order (lower = first)")
     is_active = models.BooleanField(default=True)
     
+    # JSON document served by the API, regenerated on commit (app/payloads.py)
+    payload = models.TextField(blank=True, default='', editable=False)
+    
     class Meta:
         ordering = ['-start_date']
+        indexes = [
+            models.Index(fields=['-start_date', 'id', 'is_active', 'is_current'], name='experience_start_idx'),
+            models.Index(fields=['company'], name='experience_company_idx'),
+        ]
         verbose_name = "Experience"
         verbose_name_plural = "Experiences"
     
@@ -137,6 +154,7 @@ class ExperienceSection(models.Model):
     
     class Meta:
         ordering = ['order']
+        indexes = [models.Index(fields=['experience', 'order'], name='expsection_parent_order_idx')]
     
     def __str__(self):
         return f"{self.experience.company} - {self.title}"
@@ -150,6 +168,7 @@ class ExperienceTask(models.Model):
     
     class Meta:
         ordering = ['order']
+        indexes = [models.Index(fields=['section', 'order'], name='exptask_parent_order_idx')]
     
     def __str__(self):
         return f"{self.section.title} - Task {self.order}"
@@ -163,6 +182,7 @@ class ExperienceTech(models.Model):
     
     class Meta:
         ordering = ['order']
+        indexes = [models.Index(fields=['experience', 'order'], name='exptech_parent_order_idx')]
     
     def __str__(self):
         return f"{self.experience.company} - {self.name}"
@@ -191,8 +211,14 @@ class Project(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    # JSON document served by the API, regenerated on commit (app/payloads.py)
+    payload = models.TextField(blank=True, default='', editable=False)
+    
     class Meta:
         ordering = ['order']
+        indexes = [
+            models.Index(fields=['order', 'id', 'is_active', 'is_featured'], name='project_order_idx'),
+        ]
         verbose_name = "Project"
         verbose_name_plural = "Projects"
     
@@ -209,6 +235,7 @@ class ProjectMetric(models.Model):
     
     class Meta:
         ordering = ['order']
+        indexes = [models.Index(fields=['project', 'order'], name='projmetric_parent_order_idx')]
     
     def __str__(self):
         return f"{self.project.title} - {self.value} {self.label}"
@@ -222,6 +249,7 @@ class ProjectHighlight(models.Model):
     
     class Meta:
         ordering = ['order']
+        indexes = [models.Index(fields=['project', 'order'], name='projhighlight_parent_order_idx')]
     
     def __str__(self):
         return f"{self.project.title} - Highlight {self.order}"
@@ -235,6 +263,7 @@ class ProjectTech(models.Model):
     
     class Meta:
         ordering = ['order']
+        indexes = [models.Index(fields=['project', 'order'], name='projtech_parent_order_idx')]
     
     def __str__(self):
         return f"{self.project.title} - {self.name}"
@@ -261,6 +290,11 @@ class Certification(models.Model):
     
     class Meta:
         ordering = ['order']
+        indexes = [
+            models.Index(fields=['order', 'id', 'is_active'], name='cert_order_idx'),
+            models.Index(fields=['category'], name='cert_category_idx'),
+            models.Index(fields=['issuer'], name='cert_issuer_idx'),
+        ]
         verbose_name = "Certification"
         verbose_name_plural = "Certifications"
     
@@ -292,6 +326,10 @@ class Education(models.Model):
     
     class Meta:
         ordering = ['-end_year']
+        indexes = [
+            models.Index(fields=['-end_year', 'id', 'is_active'], name='education_end_idx'),
+            models.Index(fields=['institution'], name='education_institution_idx'),
+        ]
         verbose_name = "Education"
         verbose_name_plural = "Education"
     
@@ -314,6 +352,9 @@ class Highlight(models.Model):
     
     class Meta:
         ordering = ['order']
+        indexes = [
+            models.Index(fields=['order', 'id', 'is_active'], name='highlight_order_idx'),
+        ]
         verbose_name = "Highlight"
         verbose_name_plural = "Highlights"
     
@@ -339,6 +380,12 @@ class ContactMessage(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='contact_created_idx'),
+            # Inbox filters; the admin filters with NOT is_read / NOT is_replied
+            models.Index(fields=['-created_at', '-id'], condition=Q(is_read=False), name='contact_unread_idx'),
+            models.Index(fields=['-created_at', '-id'], condition=Q(is_replied=False), name='contact_unreplied_idx'),
+        ]
         verbose_name = "Contact Message"
         verbose_name_plural = "Contact Messages"
     
@@ -0,0 +1,111 @@
+"""
+Full-page cache for the public page views.
+
+Each page is rendered once per snapshot version with the auth-dependent
+parts of ``base.html`` (admin links, user menu, footer account column) left
+as placeholders by the ``{% hole %}`` tag. Requests then only render those
+small fragments and splice them into the cached body; anonymous visitors get
+a fully assembled body without rendering anything.
+
+While one request re-renders a page for new content, concurrent requests
+for it are answered with the previous render (stale-while-revalidate, as
+for the snapshot) instead of waiting. Such a response carries the new
+content's validators but not its body, so it is sent ``no-store``.
+"""
+
+import re
+from functools import partial
+
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.utils.cache import add_never_cache_headers, patch_vary_headers
+
+from . import singleflight
+from .metrics import timed
+from .singleflight import Flight
+
+HOLES_FLAG = 'page_cache_holes'
+
+_HOLE_RE = re.compile(r'<!--pagecache-hole:([\w./-]+)-->')
+
+
+def hole_marker(template_name):
+    return f'<!--pagecache-hole:{template_name}-->'
+
+
+class CachedPage:
+    """Rendered page body split around its holes"""
+    __slots__ = ('version', 'segments', 'anonymous_body')
+
+    def __init__(self, version, body, profile):
+        self.version = version
+        # Even indexes are literal HTML, odd indexes are hole template names
+        self.segments = tuple(_HOLE_RE.split(body))
+        self.anonymous_body = self.assemble(AnonymousUser(), profile)
+
+    def assemble(self, user, profile):
+        context = {'user': user, 'profile': profile}
+        parts = list(self.segments)
+        with timed('render'):
+            for i in range(1, len(parts), 2):
+                parts[i] = render_to_string(parts[i], context)
+        return ''.join(parts)
+
+
+_pages = {}
+# Concurrent misses on one template wait for a single render
+_renders = Flight('page')
+
+
+def _render(template_name, snapshot, build_context):
+    # Another thread may have rendered this version while we waited
+    page = _pages.get(template_name)
+    if page is not None and page.version == snapshot.version:
+        return page
+    context = build_context(snapshot)
+    context[HOLES_FLAG] = True
+    with timed('render'):
+        body = render_to_string(template_name, context)
+    page = CachedPage(snapshot.version, body, snapshot.profile)
+    # A request still on the previous snapshot must not evict a newer page
+    current = _pages.get(template_name)
+    if current is None or current.version < page.version:
+        _pages[template_name] = page
+    return page
+
+
+def get_page(template_name, snapshot, build_context):
+    """
+    Return the cached page for this snapshot version, rendering on a miss,
+    or the previous version's page while another request renders it
+    """
+    page = _pages.get(template_name)
+    if page is None or page.version != snapshot.version:
+        stale = page if singleflight.get_config()['STALE_WHILE_REVALIDATE'] else None
+        page = _renders.run(template_name, partial(_render, template_name, snapshot, build_context), stale=stale)
+    return page
+
+
+def page_response(snapshot, user, template_name, build_context):
+    """
+    Cached replacement for ``render()`` in the page views: the response for
+    ``template_name`` at this snapshot, with ``user``'s holes filled.
+
+    ``build_context`` receives the snapshot and is only called when the page
+    has to be rendered for a new content version.
+    """
+    page = get_page(template_name, snapshot, build_context)
+    if user.is_authenticated:
+        body = page.assemble(user, snapshot.profile)
+    else:
+        body = page.anonymous_body
+    response = HttpResponse(body)
+    patch_vary_headers(response, ('Cookie',))
+    if page.version != snapshot.version:
+        add_never_cache_headers(response)
+    return response
+
+
+def clear():
+    _pages.clear()
@@ -0,0 +1,123 @@
+"""
+Keyset (cursor) pagination and sparse fieldsets for the public JSON APIs.
+
+Collections come from the content snapshot, already sorted by their
+keyset: ``(order, id)`` for projects and certifications and
+``(-start_date, id)`` for experiences. A page is located by bisecting the
+sort keys, so deep pages cost the same as the first one.
+"""
+
+import base64
+import binascii
+import json
+from bisect import bisect_right
+
+MAX_LIMIT = 100
+
+
+class QueryError(ValueError):
+    """Invalid ?fields=, ?include=, ?limit= or ?cursor= value"""
+
+
+def parse_fields(request, field_map):
+    """Return the requested ``?fields=`` as a tuple, or None for all fields"""
+    raw = request.GET.get('fields')
+    if not raw:
+        return None
+    fields = tuple(dict.fromkeys(name.strip() for name in raw.split(',') if name.strip()))
+    unknown = [name for name in fields if name not in field_map]
+    if unknown:
+        raise QueryError(f"Unknown field(s): {', '.join(unknown)}. "
+                         f"Available: {', '.join(field_map)}.")
+    return fields
+
+
+def parse_include(request, available):
+    """Return the ``?include=`` section names, or every section by default"""
+    raw = request.GET.get('include')
+    if not raw:
+        return tuple(available)
+    include = tuple(dict.fromkeys(name.strip() for name in raw.split(',') if name.strip()))
+    unknown = [name for name in include if name not in available]
+    if unknown or not include:
+        raise QueryError(f"Unknown section(s): {', '.join(unknown)}. "
+                         f"Available: {', '.join(available)}.")
+    return include
+
+
+def encode_cursor(key):
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        key = tuple(json.loads(base64.urlsafe_b64decode(padded)))
+    except (binascii.Error, ValueError, TypeError):
+        raise QueryError('Invalid cursor.')
+    if not key or not all(type(part) is int for part in key):
+        raise QueryError('Invalid cursor.')
+    return key
+
+
+def parse_limit(request):
+    raw = request.GET.get('limit')
+    if raw is None:
+        return None
+    try:
+        limit = int(raw)
+    except ValueError:
+        raise QueryError('limit must be an integer.')
+    if limit < 1:
+        raise QueryError('limit must be at least 1.')
+    return min(limit, MAX_LIMIT)
+
+
+# name -> (snapshot version, sort keys)
+_sort_keys = {}
+
+
+def sort_keys(name, version, rows, key_func):
+    """
+    Sort keys of ``rows``, computed once per snapshot version; ``name`` None
+    (a filtered subset) computes them for this call only
+    """
+    if name is None:
+        return [key_func(row) for row in rows]
+    cached = _sort_keys.get(name)
+    if cached is None or cached[0] != version:
+        cached = (version, [key_func(row) for row in rows])
+        _sort_keys[name] = cached
+    return cached[1]
+
+
+def parse_cursor(request):
+    """The decoded ``?cursor=`` key, or None when there is none"""
+    cursor = request.GET.get('cursor')
+    return decode_cursor(cursor) if cursor else None
+
+
+def paginate(request, name, version, rows, key_func):
+    """
+    Apply ``?cursor=`` and ``?limit=`` to ``rows``.
+
+    Returns the page and the extra response keys: ``{}`` when the client did
+    not ask for pagination, otherwise ``{'next_cursor': ...}`` (None on the
+    last page).
+    """
+    limit = parse_limit(request)
+    cursor = parse_cursor(request)
+    if 'cursor' not in request.GET and limit is None:
+        return rows, {}
+
+    start = 0
+    if cursor:
+        keys = sort_keys(name, version, rows, key_func)
+        start = bisect_right(keys, cursor)
+    end = start + (limit or MAX_LIMIT)
+    page = rows[start:end]
+
+    next_cursor = None
+    if end < len(rows):
+        next_cursor = encode_cursor(list(key_func(page[-1])))
+    return page, {'next_cursor': next_cursor}
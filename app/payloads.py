@@ -0,0 +1,192 @@
+"""
+Pre-encoded JSON documents for the project and experience APIs.
+
+Each project's and experience's document, as served by the list endpoints
+(every field of PROJECT_FIELDS / EXPERIENCE_FIELDS), is kept ready to join:
+
+- in the ``payload`` column of Project and Experience (migration 0004),
+  regenerated in ``transaction.on_commit`` whenever the row or one of its
+  children (metrics, highlights, tech; sections, tasks, tech) is saved or
+  deleted. ``?stream=1`` reads only that column, so streaming the whole
+  collection is a single-column scan joined as text. Rows without a
+  payload yet (bulk writes send no signals) are encoded on the fly.
+- in memory, per snapshot row (``EncodedCollection``), for the regular
+  list endpoints. A row is encoded once and reused until it changes, and
+  responses join the encoded rows as bytes instead of building and
+  encoding the nested dicts on every request.
+"""
+
+import threading
+from functools import partial
+from itertools import islice
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.http import HttpResponse
+
+from . import snapshot
+from .models import (
+    Experience, ExperienceSection, ExperienceTask, ExperienceTech,
+    Project, ProjectMetric, ProjectHighlight, ProjectTech,
+)
+from .routers import use_writer
+from .serializers import EXPERIENCE_FIELDS, PROJECT_FIELDS, serialize
+
+# Collection -> field map of its documents
+FIELD_MAPS = {
+    'projects': PROJECT_FIELDS,
+    'experiences': EXPERIENCE_FIELDS,
+}
+
+# Model -> (collection, attribute holding the primary key of the row to refresh)
+PARENTS = {
+    Project: ('projects', 'pk'),
+    ProjectMetric: ('projects', 'project_id'),
+    ProjectHighlight: ('projects', 'project_id'),
+    ProjectTech: ('projects', 'project_id'),
+    Experience: ('experiences', 'pk'),
+    ExperienceSection: ('experiences', 'experience_id'),
+    ExperienceTech: ('experiences', 'experience_id'),
+    # Resolved to the section's experience when the transaction commits
+    ExperienceTask: ('sections', 'section_id'),
+}
+
+_encode = DjangoJSONEncoder().encode
+
+
+def encode_row(name, row):
+    """JSON document of snapshot ``row`` of collection ``name``"""
+    return _encode(serialize(row, FIELD_MAPS[name]))
+
+
+def _chunks(items, size):
+    items = iter(items)
+    while chunk := list(islice(items, size)):
+        yield chunk
+
+
+# ===================================
+# PAYLOAD COLUMNS
+# ===================================
+
+def refresh(name, pks=None, chunk_size=500):
+    """Regenerate the payload column of ``pks`` (default: every row) of collection ``name``"""
+    with use_writer():
+        model = snapshot.active_queryset(name).model
+        if pks is None:
+            pks = model.objects.values_list('pk', flat=True)
+        for chunk in _chunks(pks, chunk_size):
+            model.objects.bulk_update(
+                [model(pk=row.id, payload=encode_row(name, row)) for row in snapshot.load_rows(name, chunk)],
+                ['payload'],
+            )
+
+
+def refresh_all():
+    """Regenerate every payload, e.g. after bulk writes that sent no signals"""
+    for name in FIELD_MAPS:
+        refresh(name)
+
+
+_pending = threading.local()  # database alias -> {collection: primary keys}
+
+
+def _flush(using):
+    pending = _pending.__dict__.pop(using, None)
+    if not pending:
+        return  # an earlier callback of the same transaction already ran
+    sections = pending.pop('sections', ())
+    if sections:
+        with use_writer():
+            pending.setdefault('experiences', set()).update(
+                ExperienceSection.objects.filter(pk__in=sections).values_list('experience_id', flat=True)
+            )
+    for name, pks in pending.items():
+        refresh(name, pks)
+
+
+def _row_changed(sender, instance, using=None, **kwargs):
+    # Collect the parents per transaction; the first commit callback
+    # refreshes them all once. Keys left over from a rolled back transaction
+    # are refreshed with the next one, which is harmless.
+    name, attribute = PARENTS[sender]
+    pending = _pending.__dict__.setdefault(using, {})
+    pending.setdefault(name, set()).add(getattr(instance, attribute))
+    transaction.on_commit(partial(_flush, using), using=using)
+
+
+def connect_signals():
+    for model in PARENTS:
+        post_save.connect(_row_changed, sender=model, dispatch_uid=f'payload_save_{model.__name__}')
+        post_delete.connect(_row_changed, sender=model, dispatch_uid=f'payload_delete_{model.__name__}')
+
+
+def iter_documents(name, chunk_size=500):
+    """
+    Stream ``{"<name>": [...]}`` for the active rows from the payload
+    column, one chunk of rows per piece
+    """
+    rows = snapshot.active_queryset(name).values_list('pk', 'payload').iterator(chunk_size=chunk_size)
+    separator = ''
+    yield f'{{"{name}": ['
+    for chunk in _chunks(rows, chunk_size):
+        missing = [pk for pk, payload in chunk if not payload]
+        if missing:
+            encoded = {row.id: encode_row(name, row) for row in snapshot.load_rows(name, missing)}
+        yield separator + ', '.join(payload or encoded[pk] for pk, payload in chunk)
+        separator = ', '
+    yield ']}'
+
+
+def aiter_documents(name, chunk_size=500):
+    """Async iter_documents() for streaming responses under ASGI"""
+    return snapshot.aiterate(iter_documents(name, chunk_size), 1)
+
+
+# ===================================
+# SNAPSHOT ROWS
+# ===================================
+
+class EncodedCollection:
+    """Encoded documents of the rows of one snapshot collection"""
+
+    def __init__(self, name):
+        self.name = name
+        # (snapshot version, {row: bytes}, whole unpaginated body or None),
+        # replaced as one tuple so concurrent readers see a consistent state
+        self._state = (None, {}, None)
+
+    def _encoded(self, snapshot):
+        state = self._state
+        if state[0] != snapshot.version:
+            previous = state[1]
+            encoded = {
+                row: previous.get(row) or encode_row(self.name, row).encode()
+                for row in getattr(snapshot, self.name)
+            }
+            state = self._state = (snapshot.version, encoded, None)
+        return state
+
+    def body(self, snapshot, rows, extra):
+        """JSON of ``{"<name>": rows, **extra}``, identical to JsonResponse's"""
+        version, encoded, whole = self._encoded(snapshot)
+        complete = rows is getattr(snapshot, self.name) and not extra
+        if complete and whole is not None:
+            return whole
+        parts = [b'{', _encode(self.name).encode(), b': [', b', '.join(encoded[row] for row in rows), b']']
+        for key, value in extra.items():
+            parts += [b', ', _encode(key).encode(), b': ', _encode(value).encode()]
+        parts.append(b'}')
+        body = b''.join(parts)
+        if complete:
+            self._state = (version, encoded, body)
+        return body
+
+
+ENCODED = {name: EncodedCollection(name) for name in FIELD_MAPS}
+
+
+def collection_json(snapshot, name, rows, extra):
+    """JSON response of ``rows`` of snapshot collection ``name`` with every field"""
+    return HttpResponse(ENCODED[name].body(snapshot, rows, extra), content_type='application/json')
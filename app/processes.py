@@ -0,0 +1,19 @@
+"""
+Helpers for state shared between worker processes through files named
+after the writing process's pid (the contact queue journals, the metrics
+histograms), so a worker can tell a crashed peer's leftovers apart from
+files a running peer still owns.
+"""
+
+import os
+
+
+def pid_alive(pid):
+    """Whether a process with id ``pid`` is running on this host"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # running, owned by another user
+    return True
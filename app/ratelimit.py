@@ -0,0 +1,181 @@
+"""
+Per-client token-bucket rate limiting for the expensive public endpoints.
+
+``contact_form`` writes to the database and ``login_view`` runs a PBKDF2
+hash in ``authenticate()`` on every attempt. ``@rate_limit(scope)`` rejects
+callers that exceed their bucket with a 429 before the view body runs, so a
+scripted flood cannot starve the CPU or the SQLite writer.
+
+Buckets are keyed by scope and client IP and kept in process memory by
+default. Setting ``RATE_LIMIT_STORE`` to a file path shares them between
+worker processes through a small SQLite database (separate from the main
+one, so limiter writes never contend with content writes).
+"""
+
+import itertools
+import sqlite3
+import threading
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.http import JsonResponse
+
+DEFAULT_LIMITS = {
+    # scope: (bucket capacity, tokens refilled per second)
+    'contact': (5, 5 / 60),
+    'login': (10, 10 / 300),
+}
+
+
+def get_limit(scope):
+    limits = {**DEFAULT_LIMITS, **getattr(settings, 'RATE_LIMITS', {})}
+    return limits[scope]
+
+
+def client_ip(request):
+    """
+    Client address used as the bucket key.
+
+    Behind RATE_LIMIT_TRUSTED_PROXIES reverse proxies (Render's load
+    balancer when running on Render), REMOTE_ADDR is the nearest proxy's address, the
+    same for every visitor. Each proxy appends the address it received the
+    request from to RATE_LIMIT_CLIENT_IP_HEADER, so the client is the
+    right-most address the trusted proxies did not add; anything to its
+    left came from the client and may be spoofed. Set
+    RATE_LIMIT_TRUSTED_PROXIES to 0 when serving clients directly.
+    """
+    header = getattr(settings, 'RATE_LIMIT_CLIENT_IP_HEADER', None)
+    trusted = getattr(settings, 'RATE_LIMIT_TRUSTED_PROXIES', 0)
+    if header and trusted and request.META.get(header):
+        hops = [hop.strip() for hop in request.META[header].split(',') if hop.strip()]
+        if hops:
+            # Fewer hops than proxies: the left-most is still a proxy's
+            return hops[-min(trusted, len(hops))]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+class MemoryBuckets:
+    """Token buckets for this process only"""
+    max_keys = 100_000
+    max_idle = 3600  # seconds; every configured bucket has refilled by then
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = {}
+
+    def take(self, key, capacity, rate, now=None):
+        """Take one token; returns 0 if allowed, else seconds until one is available"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                return (1 - tokens) / rate
+            self._buckets[key] = (tokens - 1, now)
+            if len(self._buckets) > self.max_keys:
+                self._prune(now)
+            return 0
+
+    def _prune(self, now):
+        # Idle buckets are full again and carry no state worth keeping
+        self._buckets = {
+            key: value for key, value in self._buckets.items()
+            if now - value[1] < self.max_idle
+        }
+
+
+class SQLiteBuckets:
+    """Token buckets shared by every process using the same file"""
+    max_idle = MemoryBuckets.max_idle
+    prune_every = 1000  # takes per process between deletions of idle buckets
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._local = threading.local()
+        self._takes = itertools.count(1)
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=OFF')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS buckets '
+                '(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS buckets_updated ON buckets (updated)')
+            self._local.conn = conn
+        return conn
+
+    def take(self, key, capacity, rate, now=None):
+        # Wall clock: monotonic clocks are not comparable across processes
+        now = time.time() if now is None else now
+        conn = self._connection()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute('SELECT tokens, updated FROM buckets WHERE key = ?', (key,)).fetchone()
+            tokens, updated = row if row else (capacity, now)
+            tokens = min(capacity, tokens + max(0.0, now - updated) * rate)
+            wait = 0 if tokens >= 1 else (1 - tokens) / rate
+            if not wait:
+                tokens -= 1
+            conn.execute(
+                'INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)',
+                (key, tokens, now),
+            )
+            if next(self._takes) % self.prune_every == 0:
+                # Idle buckets are full again and carry no state worth keeping
+                conn.execute('DELETE FROM buckets WHERE updated < ?', (now - self.max_idle,))
+            conn.execute('COMMIT')
+        except sqlite3.OperationalError:
+            # Limiter store busy or unavailable: fail open rather than
+            # rejecting real visitors
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            return 0
+        return wait
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                path = getattr(settings, 'RATE_LIMIT_STORE', None)
+                _store = SQLiteBuckets(path) if path else MemoryBuckets()
+    return _store
+
+
+def too_many_requests_json(request, retry_after):
+    response = JsonResponse({
+        'status': 'error',
+        'message': 'Too many requests. Please try again later.'
+    }, status=429)
+    response['Retry-After'] = str(int(retry_after) + 1)
+    return response
+
+
+def rate_limit(scope, methods=('POST',), response=too_many_requests_json):
+    """
+    Allow each client ``get_limit(scope)`` requests; excess requests using
+    one of ``methods`` get ``response(request, retry_after)`` instead of
+    running the view.
+    """
+    def decorator(view):
+        @wraps(view)
+        def inner(request, *args, **kwargs):
+            if request.method in methods and getattr(settings, 'RATE_LIMIT_ENABLED', True):
+                capacity, rate = get_limit(scope)
+                retry_after = get_store().take(f'{scope}:{client_ip(request)}', capacity, rate)
+                if retry_after:
+                    return response(request, retry_after)
+            return view(request, *args, **kwargs)
+        return inner
+    return decorator
@@ -0,0 +1,107 @@
+"""
+Read/write connection routing for the production SQLite profile.
+
+Public pages and APIs only read, so their queries go to the read-only
+'replica' connection (the same WAL-mode file opened with ``mode=ro``), which
+never takes the write lock and never waits on the writer. Every write goes
+to 'default'. Requests that write, or read what they have just written —
+the admin, login/logout, the contact form and any non-GET request — are
+pinned to 'default' for reads as well by ``WriterPinningMiddleware``, so
+they see their own uncommitted changes.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import connections
+from django.urls import reverse
+
+READ_ALIAS = 'replica'
+WRITE_ALIAS = 'default'
+
+# URL names whose views write or authenticate
+WRITER_URL_NAMES = ('login', 'logout', 'contact_form')
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_pinned = ContextVar('pinned_to_writer', default=False)
+
+
+@contextmanager
+def use_writer():
+    """Send every read inside the block to the writer connection"""
+    token = _pinned.set(True)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+def _replica_is_writer():
+    # The test runner turns 'replica' into a mirror of the test database
+    # (TEST['MIRROR']). A second connection to it would not see the data of
+    # the test's open transaction, so read through the writer instead.
+    return connections[READ_ALIAS].settings_dict['NAME'] == connections[WRITE_ALIAS].settings_dict['NAME']
+
+
+class ReadWriteRouter:
+    def db_for_read(self, model, **hints):
+        if _pinned.get() or _replica_is_writer():
+            return WRITE_ALIAS
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db == WRITE_ALIAS:
+            # Related objects of a row loaded for writing
+            return WRITE_ALIAS
+        return READ_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return WRITE_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases are the same database file
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == WRITE_ALIAS
+
+
+_writer_paths = None
+
+
+def writer_paths():
+    """URL prefixes served from the writer connection"""
+    global _writer_paths
+    if _writer_paths is None:
+        _writer_paths = (reverse('admin:index'),) + tuple(
+            reverse(name) for name in WRITER_URL_NAMES
+        )
+    return _writer_paths
+
+
+def wants_writer(request):
+    return request.method not in SAFE_METHODS or request.path_info.startswith(writer_paths())
+
+
+class WriterPinningMiddleware:
+    """Pin the admin, auth and contact requests (and all writes) to the writer"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not wants_writer(request):
+            return self.get_response(request)
+        with use_writer():
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        if not wants_writer(request):
+            return await self.get_response(request)
+        with use_writer():
+            return await self.get_response(request)
@@ -0,0 +1,251 @@
+"""
+Site search over the content snapshot, answered from memory.
+
+Each searchable snapshot section (projects, experiences, certifications,
+skills) gets a ``SectionIndex``: an inverted index from normalized terms
+(lowercased, accents folded) to the documents containing them, weighted
+by the field they came from. A query word matches a term
+
+- exactly,
+- as a prefix of it (``pyt`` -> ``python``), or
+- with one typo: insertion, deletion, substitution or swapped neighbours.
+  Every term is also filed under each of its one-character deletions, so
+  finding the candidates is a handful of dict lookups (symmetric deletion),
+  not a scan of the vocabulary.
+
+Documents must match every query word. They are ranked by the sum of
+their best match per word (match quality x field weight).
+
+Indexes follow the snapshot: a new snapshot version only rebuilds the
+sections whose content digest changed, so a typo fixed in one project
+does not re-index the certifications.
+
+Queries are capped at MAX_QUERY_LENGTH characters and MAX_QUERY_WORDS
+words: every word costs a deletion set and a scan of each section's
+postings, so an unbounded ``?q=`` would let one request burn CPU at will.
+``parse_query()`` rejects longer ones; ``search()`` truncates them for
+other callers.
+"""
+
+import re
+import unicodedata
+from bisect import bisect_left
+from typing import NamedTuple
+
+from .pagination import QueryError
+
+# Match quality per kind of match
+EXACT, PREFIX, TYPO = 1.0, 0.7, 0.5
+
+# Shortest query word matched as a prefix / with a typo
+MIN_PREFIX = 2
+MIN_TYPO = 4
+
+# Vocabulary terms a single prefix may expand to
+MAX_PREFIX_TERMS = 64
+
+DEFAULT_LIMIT = 20
+
+# Longest query accepted, in characters and in words
+MAX_QUERY_LENGTH = 100
+MAX_QUERY_WORDS = 8
+
+_WORD = re.compile(r'[a-z0-9]+')
+
+
+def normalize(text):
+    """Lowercase words of ``text`` with accents removed"""
+    folded = unicodedata.normalize('NFKD', text.lower())
+    return _WORD.findall(''.join(c for c in folded if not unicodedata.combining(c)))
+
+
+def parse_query(request):
+    """``?q=``, stripped, or QueryError when it is missing or too long"""
+    query = request.GET.get('q', '').strip()
+    if not query:
+        raise QueryError('q is required.')
+    if len(query) > MAX_QUERY_LENGTH:
+        raise QueryError(f'q may be at most {MAX_QUERY_LENGTH} characters.')
+    if len(normalize(query)) > MAX_QUERY_WORDS:
+        raise QueryError(f'q may have at most {MAX_QUERY_WORDS} words.')
+    return query
+
+
+def _deletions(term):
+    return {term[:i] + term[i + 1:] for i in range(len(term))}
+
+
+def _one_edit_apart(a, b):
+    """True if ``a`` and ``b`` differ by at most one edit or one adjacent swap"""
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    if len(a) < len(b):
+        return a[i:] == b[i + 1:]
+    return a[i + 1:] == b[i + 1:] or (
+        i + 1 < len(a) and a[i] == b[i + 1] and a[i + 1] == b[i] and a[i + 2:] == b[i + 2:]
+    )
+
+
+# ===================================
+# DOCUMENTS
+# ===================================
+
+class Document(NamedTuple):
+    type: str
+    id: object  # row id; None for skills, which the snapshot keeps by name
+    title: str
+    subtitle: str
+    page: str  # URL name of the page showing it
+
+
+# Each function turns one snapshot row into [(Document, {field weight: [texts]})]
+
+def _projects(project):
+    document = Document('project', project.id, project.title, ', '.join(project.technologies), 'portfolio')
+    return [(document, {
+        3: [project.title],
+        2: list(project.technologies),
+        1: [project.description, *project.highlights, *(f'{m.value} {m.label}' for m in project.metrics)],
+    })]
+
+
+def _experiences(experience):
+    document = Document('experience', experience.id, experience.title, experience.company, 'experience')
+    return [(document, {
+        3: [experience.title],
+        2: [experience.company, *experience.technologies],
+        1: [experience.description, experience.location,
+            *(text for section in experience.sections for text in (section.title, *section.tasks))],
+    })]
+
+
+def _certifications(cert):
+    document = Document('certification', cert.id, cert.title, cert.issuer, 'certifications')
+    return [(document, {
+        3: [cert.title],
+        2: [cert.issuer, cert.category],
+        1: [cert.description],
+    })]
+
+
+def _skills(category):
+    return [
+        (Document('skill', None, name, category.name, 'about'), {3: [name], 1: [category.name]})
+        for name in category.skills
+    ]
+
+
+# Searchable snapshot sections, in the order tied results are listed
+SEARCH_SECTIONS = {
+    'projects': _projects,
+    'experiences': _experiences,
+    'certifications': _certifications,
+    'skill_categories': _skills,
+}
+
+
+# ===================================
+# INDEX
+# ===================================
+
+class SectionIndex:
+    """Inverted index over the documents of one snapshot section"""
+    __slots__ = ('etag', 'documents', 'postings', 'terms', 'deletions')
+
+    def __init__(self, etag, rows, documents_for):
+        self.etag = etag
+        self.documents = []
+        self.postings = {}  # term -> {document index: best field weight}
+        for row in rows:
+            for document, fields in documents_for(row):
+                doc = len(self.documents)
+                self.documents.append(document)
+                for weight, texts in fields.items():
+                    for text in texts:
+                        for term in normalize(text or ''):
+                            postings = self.postings.setdefault(term, {})
+                            if weight > postings.get(doc, 0):
+                                postings[doc] = weight
+        self.terms = sorted(self.postings)
+        self.deletions = {}  # term, or term minus one character -> terms
+        for term in self.terms:
+            if len(term) >= MIN_TYPO - 1:
+                for variant in _deletions(term) | {term}:
+                    self.deletions.setdefault(variant, []).append(term)
+
+    def expand(self, word):
+        """Vocabulary terms ``word`` matches, with their match quality"""
+        matches = {}
+        if word in self.postings:
+            matches[word] = EXACT
+        if len(word) >= MIN_PREFIX:
+            start = bisect_left(self.terms, word)
+            for term in self.terms[start:start + MAX_PREFIX_TERMS]:
+                if not term.startswith(word):
+                    break
+                matches.setdefault(term, PREFIX)
+        if len(word) >= MIN_TYPO:
+            for variant in _deletions(word) | {word}:
+                for term in self.deletions.get(variant, ()):
+                    if term not in matches and _one_edit_apart(word, term):
+                        matches[term] = TYPO
+        return matches
+
+    def scores(self, words):
+        """{document index: score} of the documents matching every word"""
+        total = None
+        for word in words:
+            best = {}
+            for term, quality in self.expand(word).items():
+                for doc, weight in self.postings[term].items():
+                    score = quality * weight
+                    if score > best.get(doc, 0):
+                        best[doc] = score
+            if total is None:
+                total = best
+            else:
+                total = {doc: score + best[doc] for doc, score in total.items() if doc in best}
+            if not total:
+                return {}
+        return total or {}
+
+
+# section -> SectionIndex; replaced section by section as content changes
+_indexes = {}
+
+
+def get_indexes(snapshot):
+    """Section indexes for ``snapshot``, rebuilding only the sections that changed"""
+    indexes = {}
+    for name, documents_for in SEARCH_SECTIONS.items():
+        etag = snapshot.section_etags[name]
+        index = _indexes.get(name)
+        if index is None or index.etag != etag:
+            index = SectionIndex(etag, getattr(snapshot, name), documents_for)
+            _indexes[name] = index
+        indexes[name] = index
+    return indexes
+
+
+def search(snapshot, query, limit=DEFAULT_LIMIT):
+    """
+    Best ``limit`` matches for ``query`` across every searchable section,
+    as ``(total matches, [(score, Document), ...])``
+    """
+    words = normalize(query[:MAX_QUERY_LENGTH])[:MAX_QUERY_WORDS]
+    if not words:
+        return 0, []
+    ranked = []
+    for rank, index in enumerate(get_indexes(snapshot).values()):
+        for doc, score in index.scores(words).items():
+            # Ties keep the sections' order and each section's display order
+            ranked.append((-score, rank, doc, index.documents[doc]))
+    ranked.sort(key=lambda match: match[:3])
+    return len(ranked), [(-score, document) for score, _, _, document in ranked[:limit]]
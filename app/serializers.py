@@ -0,0 +1,165 @@
+"""
+JSON shapes of the snapshot rows served by the public APIs.
+
+Each model has an ordered ``{field: getter}`` map so endpoints can serialize
+a sparse subset of fields; nested children (metrics, highlights, sections,
+...) are only walked when their field is requested.
+"""
+
+from operator import attrgetter
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+
+def _isoformat(name):
+    def getter(row):
+        value = getattr(row, name)
+        return value.isoformat() if value else None
+    return getter
+
+
+PROJECT_FIELDS = {
+    'id': attrgetter('id'),
+    'number': attrgetter('number'),
+    'title': attrgetter('title'),
+    'description': attrgetter('description'),
+    'featured': attrgetter('is_featured'),
+    'github_url': attrgetter('github_url'),
+    'live_url': attrgetter('live_url'),
+    'demo_url': attrgetter('demo_url'),
+    'metrics': lambda p: [{'value': m.value, 'label': m.label} for m in p.metrics],
+    'highlights': lambda p: list(p.highlights),
+    'tech_stack': lambda p: list(p.technologies),
+}
+
+CERTIFICATION_FIELDS = {
+    'id': attrgetter('id'),
+    'title': attrgetter('title'),
+    'issuer': attrgetter('issuer'),
+    'category': attrgetter('category'),
+    'description': attrgetter('description'),
+    'issue_date': _isoformat('issue_date'),
+    'credential_id': attrgetter('credential_id'),
+    'credential_url': attrgetter('credential_url'),
+}
+
+EXPERIENCE_FIELDS = {
+    'id': attrgetter('id'),
+    'title': attrgetter('title'),
+    'company': attrgetter('company'),
+    'location': attrgetter('location'),
+    'period': attrgetter('period'),
+    'is_current': attrgetter('is_current'),
+    'description': attrgetter('description'),
+    'sections': lambda e: [
+        {'title': section.title, 'tasks': list(section.tasks)}
+        for section in e.sections
+    ],
+    'technologies': lambda e: list(e.technologies),
+}
+
+
+PROFILE_FIELDS = {
+    name: attrgetter(name)
+    for name in (
+        'name', 'title', 'email', 'phone', 'location',
+        'linkedin_url', 'github_url', 'resume_url',
+        'about_intro', 'about_details', 'about_current',
+        'cgpa', 'projects_count', 'certifications_count',
+        'data_records_processed', 'available_for_work',
+    )
+}
+
+EDUCATION_FIELDS = {
+    name: attrgetter(name)
+    for name in (
+        'id', 'degree', 'field', 'institution', 'location', 'start_year',
+        'end_year', 'cgpa', 'max_cgpa', 'specialization',
+    )
+}
+
+HIGHLIGHT_FIELDS = {
+    name: attrgetter(name)
+    for name in ('id', 'title', 'description', 'icon_name')
+}
+
+
+def serialize(row, field_map, fields=None):
+    """Serialize ``row`` with every field of ``field_map``, or only ``fields``"""
+    if fields is None:
+        return {name: getter(row) for name, getter in field_map.items()}
+    return {name: field_map[name](row) for name in fields}
+
+
+def serialize_project(project, fields=None):
+    return serialize(project, PROJECT_FIELDS, fields)
+
+
+def serialize_certification(cert, fields=None):
+    return serialize(cert, CERTIFICATION_FIELDS, fields)
+
+
+def serialize_experience(exp, fields=None):
+    return serialize(exp, EXPERIENCE_FIELDS, fields)
+
+
+def serialize_skills(categories):
+    """Skill names grouped by category name, as served by /api/skills/"""
+    return {category.name: list(category.skills) for category in categories}
+
+
+# /api/portfolio/ section -> (snapshot section, serializer)
+AGGREGATE_SECTIONS = {
+    'profile': ('profile', lambda p: serialize(p, PROFILE_FIELDS) if p else None),
+    'tech_stack': ('tech_stack', lambda rows: [t.name for t in rows]),
+    'skills': ('skill_categories', serialize_skills),
+    'experiences': ('experiences', lambda rows: [serialize_experience(r) for r in rows]),
+    'projects': ('projects', lambda rows: [serialize_project(r) for r in rows]),
+    'certifications': ('certifications', lambda rows: [serialize_certification(r) for r in rows]),
+    'education': ('education', lambda rows: [serialize(r, EDUCATION_FIELDS) for r in rows]),
+    'highlights': ('highlights', lambda rows: [serialize(r, HIGHLIGHT_FIELDS) for r in rows]),
+}
+
+
+# Nested fields and the snapshot child relation that feeds them
+PROJECT_CHILDREN = {'metrics': 'metrics', 'highlights': 'highlights', 'tech_stack': 'technologies'}
+EXPERIENCE_CHILDREN = {'sections': 'sections', 'technologies': 'technologies'}
+
+
+def iter_json(name, rows, field_map, fields=None, buffer_size=16 * 1024):
+    """
+    Encode ``{"<name>": [row, ...]}`` incrementally, one row at a time.
+
+    Output is flushed in ~``buffer_size`` pieces so a streaming response
+    neither holds the whole document nor writes tiny chunks.
+    """
+    encode = DjangoJSONEncoder().encode
+    buffer = [f'{{"{name}": [']
+    size = 0
+    for i, row in enumerate(rows):
+        piece = encode(serialize(row, field_map, fields))
+        buffer.append(f', {piece}' if i else piece)
+        size += len(piece)
+        if size >= buffer_size:
+            yield ''.join(buffer)
+            buffer, size = [], 0
+    buffer.append(']}')
+    yield ''.join(buffer)
+
+
+async def aiter_json(name, rows, field_map, fields=None, buffer_size=16 * 1024):
+    """iter_json() over an async iterable of rows"""
+    encode = DjangoJSONEncoder().encode
+    buffer = [f'{{"{name}": [']
+    size = 0
+    first = True
+    async for row in rows:
+        piece = encode(serialize(row, field_map, fields))
+        buffer.append(piece if first else f', {piece}')
+        first = False
+        size += len(piece)
+        if size >= buffer_size:
+            yield ''.join(buffer)
+            buffer, size = [], 0
+    buffer.append(']}')
+    yield ''.join(buffer)
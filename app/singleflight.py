@@ -0,0 +1,149 @@
+"""
+Single-flight execution of expensive cache fills.
+
+When content changes, every request that arrives before the new snapshot
+or page is ready misses the cache at the same moment. ``Flight.run(key,
+compute)`` lets one caller compute ``key`` while the others wait for it.
+Each ``compute`` re-checks the cache first, so a caller that waited finds
+the fresh result instead of computing it again. Callers are coalesced
+
+- within a process, by a lock per key, and
+- across worker processes (``cross_process=True``), by a POSIX record lock
+  on one byte of ``db.sqlite3.locks``, picked by hashing the key. Workers
+  refreshing after an admin save then take turns against SQLite instead of
+  all querying at once.
+
+Given ``stale`` (stale-while-revalidate), a caller that finds ``key``
+already being computed, here or in another worker, gets ``stale`` back at
+once instead of waiting.
+"""
+
+import asyncio
+import os
+import threading
+import weakref
+import zlib
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from .coherence import fcntl, sidecar_path
+
+DEFAULTS = {
+    'ENABLED': True,  # coalesce across processes too
+    'STALE_WHILE_REVALIDATE': True,
+}
+
+# Bytes of the lock file keys are hashed onto
+LOCK_SLOTS = 4096
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'SINGLE_FLIGHT', {})}
+
+
+def _unlocked():
+    pass
+
+
+_fd = None
+_fd_lock = threading.Lock()
+
+
+def _lock_file():
+    """Descriptor of the shared lock file, or None where there is none"""
+    global _fd
+    if _fd is None:
+        with _fd_lock:
+            if _fd is None:
+                path = sidecar_path('.locks') if get_config()['ENABLED'] and fcntl else None
+                _fd = -1 if path is None else os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    return _fd if _fd >= 0 else None
+
+
+class Flight:
+    """Coalesces concurrent computations of the same key"""
+
+    def __init__(self, name, cross_process=False):
+        self.name = name
+        self.cross_process = cross_process
+        self._guard = threading.Lock()
+        self._locks = {}  # key -> threading.Lock
+        self._tasks = weakref.WeakKeyDictionary()  # event loop -> {key: task}
+
+    def _thread_lock(self, key):
+        with self._guard:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def _lock_process(self, key, blocking):
+        """
+        Lock ``key`` across workers; returns the function releasing it, or
+        None if another worker holds it (only when not ``blocking``)
+        """
+        fd = _lock_file() if self.cross_process else None
+        if fd is None:
+            return _unlocked
+        offset = zlib.crc32(f'{self.name}:{key}'.encode()) % LOCK_SLOTS
+        try:
+            fcntl.lockf(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB, 1, offset)
+        except OSError:
+            if blocking:
+                raise
+            return None
+        return partial(fcntl.lockf, fd, fcntl.LOCK_UN, 1, offset)
+
+    def run(self, key, compute, stale=None):
+        """``compute()`` once for all concurrent callers, or ``stale`` if given and busy"""
+        blocking = stale is None
+        lock = self._thread_lock(key)
+        if not lock.acquire(blocking=blocking):
+            return stale
+        try:
+            release = self._lock_process(key, blocking)
+            if release is None:
+                return stale
+            try:
+                return compute()
+            finally:
+                release()
+        finally:
+            lock.release()
+
+    async def arun(self, key, compute, stale=None):
+        """run() for a coroutine function: one task per key and event loop"""
+        loop = asyncio.get_running_loop()
+        tasks = self._tasks.setdefault(loop, {})
+        task = tasks.get(key)
+        if task is None:
+            task = tasks[key] = loop.create_task(self._alead(key, compute, stale))
+            task.add_done_callback(lambda done: tasks.pop(key) if tasks.get(key) is done else None)
+        elif stale is not None:
+            return stale
+        # A cancelled waiter must not cancel the computation the others wait on
+        return await asyncio.shield(task)
+
+    async def _alead(self, key, compute, stale):
+        # Blocking waits happen in a worker thread, off the event loop
+        blocking = stale is None
+        lock = self._thread_lock(key)
+        if blocking:
+            await sync_to_async(lock.acquire, thread_sensitive=False)()
+        elif not lock.acquire(blocking=False):
+            return stale
+        try:
+            if blocking:
+                release = await sync_to_async(self._lock_process, thread_sensitive=False)(key, True)
+            else:
+                release = self._lock_process(key, False)
+            if release is None:
+                return stale
+            try:
+                return await compute()
+            finally:
+                release()
+        finally:
+            lock.release()
@@ -0,0 +1,612 @@
+"""
+In-process, read-only snapshot of all public portfolio content.
+
+Public pages and APIs only ever show active rows, and that content only
+changes when someone edits it in the admin. Instead of hitting SQLite on
+every request, each worker builds one immutable ``PortfolioSnapshot`` made
+of tuples/named tuples and swaps it atomically whenever a content model is
+saved or deleted.
+
+Saves and deletes bump per-section counters shared by every worker
+(app/coherence.py). Each worker checks one counter per request, and on a
+change it re-reads only the sections whose counters moved.
+"""
+
+import hashlib
+from datetime import datetime
+from decimal import Decimal
+from functools import partial
+from itertools import islice
+from typing import NamedTuple, Optional
+
+from asgiref.sync import sync_to_async
+from django.db import router, transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from . import coherence, singleflight
+from .models import (
+    Profile, TechStack, SkillCategory, Skill,
+    Experience, ExperienceSection, ExperienceTask, ExperienceTech,
+    Project, ProjectMetric, ProjectHighlight, ProjectTech,
+    Certification, Education, Highlight
+)
+
+# Snapshot section -> models whose rows end up in it
+SECTION_MODELS = {
+    'profile': (Profile,),
+    'tech_stack': (TechStack,),
+    'skill_categories': (SkillCategory, Skill),
+    'experiences': (Experience, ExperienceSection, ExperienceTask, ExperienceTech),
+    'projects': (Project, ProjectMetric, ProjectHighlight, ProjectTech),
+    'certifications': (Certification,),
+    'education': (Education,),
+    'highlights': (Highlight,),
+}
+
+# Every model whose rows end up in the snapshot
+SNAPSHOT_MODELS = tuple(model for models in SECTION_MODELS.values() for model in models)
+
+
+# ===================================
+# ROW TYPES
+# ===================================
+
+class ProfileRow(NamedTuple):
+    name: str
+    title: str
+    email: str
+    phone: str
+    location: str
+    linkedin_url: Optional[str]
+    github_url: Optional[str]
+    resume_url: Optional[str]
+    about_intro: str
+    about_details: str
+    about_current: str
+    cgpa: Decimal
+    projects_count: int
+    certifications_count: int
+    data_records_processed: str
+    available_for_work: bool
+    updated_at: datetime
+
+
+class TechRow(NamedTuple):
+    id: int
+    name: str
+
+
+class SkillCategoryRow(NamedTuple):
+    id: int
+    name: str
+    skills: tuple  # active skill names, in display order
+
+
+class ExperienceSectionRow(NamedTuple):
+    id: int
+    title: str
+    tasks: tuple  # task descriptions
+
+
+class ExperienceRow(NamedTuple):
+    id: int
+    title: str
+    company: str
+    location: str
+    start_date: object
+    end_date: object
+    is_current: bool
+    description: str
+    order: int
+    period: str
+    sections: tuple  # ExperienceSectionRow
+    technologies: tuple  # tech names
+
+
+class MetricRow(NamedTuple):
+    value: str
+    label: str
+
+
+class ProjectRow(NamedTuple):
+    id: int
+    number: str
+    title: str
+    description: str
+    is_featured: bool
+    github_url: Optional[str]
+    live_url: Optional[str]
+    demo_url: Optional[str]
+    order: int
+    updated_at: datetime
+    metrics: tuple  # MetricRow
+    highlights: tuple  # highlight descriptions
+    technologies: tuple  # tech names
+
+
+class CertificationRow(NamedTuple):
+    id: int
+    title: str
+    issuer: str
+    category: str
+    description: str
+    issue_date: object
+    expiry_date: object
+    credential_id: str
+    credential_url: Optional[str]
+    order: int
+
+
+class EducationRow(NamedTuple):
+    id: int
+    degree: str
+    field: str
+    institution: str
+    location: str
+    start_year: int
+    end_year: int
+    cgpa: Optional[Decimal]
+    max_cgpa: Decimal
+    specialization: str
+
+
+class HighlightRow(NamedTuple):
+    id: int
+    title: str
+    description: str
+    icon_name: str
+
+
+class PortfolioSnapshot(NamedTuple):
+    """Immutable view of everything the public site renders"""
+    version: int
+    built_at: datetime
+    etag: str  # digest of the content below, identical across workers
+    section_etags: dict  # section name -> digest of that section alone
+    section_versions: dict  # section name -> its change counter when read
+    last_modified: datetime
+    profile: Optional[ProfileRow]
+    tech_stack: tuple
+    skill_categories: tuple
+    experiences: tuple
+    projects: tuple
+    certifications: tuple
+    education: tuple
+    highlights: tuple
+
+
+# ===================================
+# BUILDERS
+# ===================================
+# Each section is described by a function returning the querysets it needs
+# and a function assembling rows from their evaluated results.
+
+def _group(rows):
+    """Group ``(parent_id, *values)`` rows into {parent_id: [values, ...]}"""
+    grouped = {}
+    for parent_id, *values in rows:
+        grouped.setdefault(parent_id, []).append(values[0] if len(values) == 1 else values)
+    return grouped
+
+
+def _period(start_date, end_date, is_current):
+    # Mirrors Experience.period without instantiating the model
+    start = start_date.strftime("%B %Y")
+    end = "Present" if is_current else end_date.strftime("%B %Y")
+    return f"{start} - {end}"
+
+
+def _prefixed(relation, lookups):
+    return {f'{relation}__{key}': value for key, value in lookups.items()}
+
+
+EXPERIENCE_COLUMNS = (
+    'id', 'title', 'company', 'location', 'start_date', 'end_date',
+    'is_current', 'description', 'order',
+)
+PROJECT_COLUMNS = ProjectRow._fields[:-3]
+
+
+def _active_experiences():
+    # Ties are broken by id so the API keyset (-start_date, id) is stable
+    return Experience.objects.filter(is_active=True).order_by('-start_date', 'id')
+
+
+def _active_projects():
+    return Project.objects.filter(is_active=True).order_by('order', 'id')
+
+
+# Children are read in (parent, order) order, which the (parent, order)
+# indexes return without a sort; _group() only needs the order within a parent
+
+def _experience_children(parent_filter, children=('sections', 'technologies')):
+    """
+    Querysets for the children of the experiences matched by
+    ``parent_filter`` (e.g. ``{'is_active': True}`` or ``{'pk__in': ids}``)
+    """
+    queries = {}
+    if 'sections' in children:
+        queries['sections'] = (
+            ExperienceSection.objects.filter(**_prefixed('experience', parent_filter))
+            .order_by('experience_id', 'order').values_list('experience_id', 'id', 'title')
+        )
+        # section_id IN (subquery) rather than a join, so the tasks are read
+        # through (section, order) instead of sorted after the join
+        sections = ExperienceSection.objects.filter(**_prefixed('experience', parent_filter)).values('id')
+        queries['tasks'] = (
+            ExperienceTask.objects.filter(section_id__in=sections)
+            .order_by('section_id', 'order').values_list('section_id', 'description')
+        )
+    if 'technologies' in children:
+        queries['technologies'] = (
+            ExperienceTech.objects.filter(**_prefixed('experience', parent_filter))
+            .order_by('experience_id', 'order').values_list('experience_id', 'name')
+        )
+    return queries
+
+
+def _assemble_experiences(rows, children):
+    """Build ExperienceRows from ``values_list(*EXPERIENCE_COLUMNS)`` rows"""
+    sections = _group(children.get('sections', ()))
+    tasks = _group(children.get('tasks', ()))
+    techs = _group(children.get('technologies', ()))
+    return tuple(
+        ExperienceRow(
+            pk, title, company, location, start_date, end_date, is_current,
+            description, order,
+            period=_period(start_date, end_date, is_current),
+            sections=tuple(
+                ExperienceSectionRow(section_id, section_title, tuple(tasks.get(section_id, ())))
+                for section_id, section_title in sections.get(pk, ())
+            ),
+            technologies=tuple(techs.get(pk, ())),
+        )
+        for pk, title, company, location, start_date, end_date, is_current, description, order in rows
+    )
+
+
+def _project_children(parent_filter, children=('metrics', 'highlights', 'technologies')):
+    """Querysets for the children of the projects matched by ``parent_filter``"""
+    queries = {}
+    if 'metrics' in children:
+        queries['metrics'] = (
+            ProjectMetric.objects.filter(**_prefixed('project', parent_filter))
+            .order_by('project_id', 'order').values_list('project_id', 'value', 'label')
+        )
+    if 'highlights' in children:
+        queries['highlights'] = (
+            ProjectHighlight.objects.filter(**_prefixed('project', parent_filter))
+            .order_by('project_id', 'order').values_list('project_id', 'description')
+        )
+    if 'technologies' in children:
+        queries['technologies'] = (
+            ProjectTech.objects.filter(**_prefixed('project', parent_filter))
+            .order_by('project_id', 'order').values_list('project_id', 'name')
+        )
+    return queries
+
+
+def _assemble_projects(rows, children):
+    """Build ProjectRows from ``values_list(*PROJECT_COLUMNS)`` rows"""
+    metrics = _group(children.get('metrics', ()))
+    highlights = _group(children.get('highlights', ()))
+    techs = _group(children.get('technologies', ()))
+    return tuple(
+        ProjectRow(
+            *row,
+            metrics=tuple(MetricRow(*m) for m in metrics.get(row[0], ())),
+            highlights=tuple(highlights.get(row[0], ())),
+            technologies=tuple(techs.get(row[0], ())),
+        )
+        for row in rows
+    )
+
+
+def _flat(row_type):
+    return lambda results: tuple(row_type(*row) for row in results['rows'])
+
+
+def _assemble_skill_categories(results):
+    skills = _group(results['skills'])
+    return tuple(
+        SkillCategoryRow(pk, name, tuple(skills.get(pk, ())))
+        for pk, name in results['rows']
+    )
+
+
+# section -> (querysets factory, assembler taking {key: evaluated rows})
+SECTIONS = {
+    'profile': (
+        lambda: {'rows': Profile.objects.order_by('pk').values_list(*ProfileRow._fields)[:1]},
+        lambda results: ProfileRow(*results['rows'][0]) if results['rows'] else None,
+    ),
+    'tech_stack': (
+        lambda: {'rows': TechStack.objects.filter(is_active=True).values_list('id', 'name')},
+        _flat(TechRow),
+    ),
+    'skill_categories': (
+        lambda: {
+            'rows': SkillCategory.objects.filter(is_active=True).values_list('id', 'name'),
+            'skills': Skill.objects.filter(is_active=True, category__is_active=True)
+                      .order_by('category_id', 'order').values_list('category_id', 'name'),
+        },
+        _assemble_skill_categories,
+    ),
+    'experiences': (
+        lambda: {
+            'rows': _active_experiences().values_list(*EXPERIENCE_COLUMNS),
+            **_experience_children({'is_active': True}),
+        },
+        lambda results: _assemble_experiences(results['rows'], results),
+    ),
+    'projects': (
+        lambda: {
+            'rows': _active_projects().values_list(*PROJECT_COLUMNS),
+            **_project_children({'is_active': True}),
+        },
+        lambda results: _assemble_projects(results['rows'], results),
+    ),
+    'certifications': (
+        lambda: {'rows': Certification.objects.filter(is_active=True)
+                 .order_by('order', 'id').values_list(*CertificationRow._fields)},
+        _flat(CertificationRow),
+    ),
+    'education': (
+        lambda: {'rows': Education.objects.filter(is_active=True).values_list(*EducationRow._fields)},
+        _flat(EducationRow),
+    ),
+    'highlights': (
+        lambda: {'rows': Highlight.objects.filter(is_active=True).values_list(*HighlightRow._fields)},
+        _flat(HighlightRow),
+    ),
+}
+
+
+def _last_modified(profile, projects, changed_at):
+    """
+    Newest of Profile.updated_at, Project.updated_at and the time of the
+    last change to a model that has no timestamp of its own
+    """
+    stamps = [project.updated_at for project in projects]
+    if profile is not None:
+        stamps.append(profile.updated_at)
+    if changed_at is not None:
+        stamps.append(changed_at)
+    return max(stamps, default=None)
+
+
+def _digest(value):
+    return hashlib.sha1(repr(value).encode()).hexdigest()
+
+
+def combined_etag(snapshot, sections):
+    """Single validator covering only the given snapshot sections"""
+    return _digest(tuple(snapshot.section_etags[name] for name in sections))
+
+
+def _stale_sections(previous, section_versions):
+    """Sections that must be read again instead of reused from ``previous``"""
+    if previous is None or section_versions is None:
+        return tuple(SECTIONS)
+    return tuple(
+        name for name in SECTIONS
+        if previous.section_versions.get(name) != section_versions[name]
+    )
+
+
+def _make_snapshot(version, changed_at, content, section_versions=None, previous=None):
+    """Snapshot of ``content`` (the re-read sections) plus the rest of ``previous``"""
+    built_at = timezone.now()
+    section_etags = {name: _digest(value) for name, value in content.items()}
+    if previous is not None:
+        for name in SECTIONS:
+            if name not in content:
+                content[name] = getattr(previous, name)
+                section_etags[name] = previous.section_etags[name]
+    section_etags = {name: section_etags[name] for name in SECTIONS}
+    return PortfolioSnapshot(
+        version=version,
+        built_at=built_at,
+        etag=_digest(tuple(section_etags.values())),
+        section_etags=section_etags,
+        section_versions=section_versions or {},
+        last_modified=_last_modified(content['profile'], content['projects'], changed_at) or built_at,
+        **{name: content[name] for name in SECTIONS},
+    )
+
+
+def build_snapshot(version=0, changed_at=None, section_versions=None, previous=None):
+    """
+    Load the public sections from the database in one consistent read.
+
+    Given the ``previous`` snapshot and the current ``section_versions``,
+    only the sections whose counters moved are read again.
+    """
+    content = {}
+    # The transaction must be on the connection the router reads from
+    with transaction.atomic(using=router.db_for_read(Profile)):
+        for name in _stale_sections(previous, section_versions):
+            queries, assemble = SECTIONS[name]
+            content[name] = assemble({key: list(qs) for key, qs in queries().items()})
+    return _make_snapshot(version, changed_at, content, section_versions, previous)
+
+
+async def abuild_snapshot(version=0, changed_at=None, section_versions=None, previous=None):
+    """
+    Async build_snapshot(), run off the event loop in one hop.
+
+    The whole build stays one transaction, so the sections are read
+    consistently. Awaiting each query through the async ORM would not
+    overlap them anyway: thread-sensitive sync_to_async runs them one after
+    another on the same thread.
+    """
+    return await sync_to_async(build_snapshot)(version, changed_at, section_versions, previous)
+
+
+# ===================================
+# PROCESS-WIDE CACHE
+# ===================================
+
+_snapshot = None
+# Per-section change counters, shared with the other workers
+counters = coherence.Counters(SECTIONS)
+# One rebuild at a time per process, and across workers
+_refresh_flight = singleflight.Flight('snapshot', cross_process=True)
+
+# Model -> the sections its rows end up in
+MODEL_SECTIONS = {}
+for _name, _models in SECTION_MODELS.items():
+    for _model in _models:
+        MODEL_SECTIONS.setdefault(_model, []).append(_name)
+
+
+def _stale(snapshot):
+    """What callers may serve while someone else rebuilds"""
+    return snapshot if singleflight.get_config()['STALE_WHILE_REVALIDATE'] else None
+
+
+def _refresh():
+    global _snapshot
+    # Tag with the counters seen *before* reading, so a change that
+    # lands mid-build leaves this snapshot marked stale
+    version, changed_at, section_versions = counters.read()
+    # Another caller may have rebuilt while we waited for the flight
+    if _snapshot is None or _snapshot.version != version:
+        _snapshot = build_snapshot(version, changed_at, section_versions, _snapshot)
+    return _snapshot
+
+
+async def _arefresh():
+    global _snapshot
+    version, changed_at, section_versions = counters.read()
+    if _snapshot is None or _snapshot.version != version:
+        _snapshot = await abuild_snapshot(version, changed_at, section_versions, _snapshot)
+    return _snapshot
+
+
+def get_snapshot():
+    """
+    Return the current snapshot, rebuilding the sections that have changed.
+    While another thread or worker is rebuilding, the previous snapshot is
+    returned instead of waiting (SINGLE_FLIGHT['STALE_WHILE_REVALIDATE']).
+    """
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.version == counters.version():
+        return snapshot
+    return _refresh_flight.run('snapshot', _refresh, stale=_stale(snapshot))
+
+
+async def aget_snapshot():
+    """Async get_snapshot() for views running under ASGI"""
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.version == counters.version():
+        return snapshot
+    return await _refresh_flight.arun('snapshot', _arefresh, stale=_stale(snapshot))
+
+
+def invalidate(sections=None):
+    """
+    Mark ``sections`` (default: all) stale in every worker; the next
+    reader in each one re-reads them
+    """
+    counters.bump(sections)
+
+
+def generation():
+    """Change counter, bumped whenever portfolio content is saved or deleted"""
+    return counters.version()
+
+
+def _content_changed(sender, using=None, **kwargs):
+    # Invalidate right away for the writing thread, and again on commit so
+    # other workers cannot cache rows from before the transaction finished
+    sections = MODEL_SECTIONS[sender]
+    invalidate(sections)
+    transaction.on_commit(partial(invalidate, sections), using=using)
+
+
+def _chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# Collection -> (active rows in display order, columns, children querysets, assembler)
+_COLLECTIONS = {
+    'experiences': (_active_experiences, EXPERIENCE_COLUMNS, _experience_children, _assemble_experiences),
+    'projects': (_active_projects, PROJECT_COLUMNS, _project_children, _assemble_projects),
+}
+
+
+def active_queryset(name):
+    """Queryset of the active rows of ``name`` ('projects', 'experiences') in display order"""
+    return _COLLECTIONS[name][0]()
+
+
+def load_rows(name, pks):
+    """ProjectRows or ExperienceRows of the given rows of ``name``, active or not"""
+    active, columns, children, assemble = _COLLECTIONS[name]
+    rows = active().model.objects.filter(pk__in=pks).order_by().values_list(*columns)
+    queries = children({'pk__in': pks})
+    return assemble(list(rows), {key: list(qs) for key, qs in queries.items()})
+
+
+def iter_experiences(chunk_size=500, children=('sections', 'technologies')):
+    """
+    Stream active ExperienceRows straight from the database.
+
+    Parents are read with a chunked server-side cursor and each chunk's
+    children are loaded in one query per relation, so memory stays flat
+    however many rows there are. Only used for explicit streaming requests;
+    regular traffic reads the snapshot.
+    """
+    rows = _active_experiences().values_list(*EXPERIENCE_COLUMNS).iterator(chunk_size=chunk_size)
+    for chunk in _chunked(rows, chunk_size):
+        queries = _experience_children({'pk__in': [row[0] for row in chunk]}, children)
+        yield from _assemble_experiences(chunk, {key: list(qs) for key, qs in queries.items()})
+
+
+def iter_projects(chunk_size=500, children=('metrics', 'highlights', 'technologies')):
+    """Stream active ProjectRows straight from the database, see iter_experiences()"""
+    rows = _active_projects().values_list(*PROJECT_COLUMNS).iterator(chunk_size=chunk_size)
+    for chunk in _chunked(rows, chunk_size):
+        queries = _project_children({'pk__in': [row[0] for row in chunk]}, children)
+        yield from _assemble_projects(chunk, {key: list(qs) for key, qs in queries.items()})
+
+
+async def aiterate(rows, chunk_size):
+    """Iterate the sync iterable ``rows`` off the event loop, ``chunk_size`` items per hop"""
+    # The row generators keep a chunked server-side cursor open and query
+    # each chunk's children between reads, so every step has to run on the
+    # thread that owns the connection. Thread-sensitive sync_to_async runs
+    # them all on the one sync thread; QuerySet.aiterator() would only
+    # cover the parent cursor.
+    rows = iter(rows)
+    while True:
+        chunk = await sync_to_async(list)(islice(rows, chunk_size))
+        if not chunk:
+            return
+        for row in chunk:
+            yield row
+
+
+def aiter_experiences(chunk_size=500, children=('sections', 'technologies')):
+    """Async iter_experiences() for streaming responses under ASGI"""
+    return aiterate(iter_experiences(chunk_size, children), chunk_size)
+
+
+def aiter_projects(chunk_size=500, children=('metrics', 'highlights', 'technologies')):
+    """Async iter_projects() for streaming responses under ASGI"""
+    return aiterate(iter_projects(chunk_size, children), chunk_size)
+
+
+def connect_signals():
+    for model in SNAPSHOT_MODELS:
+        post_save.connect(_content_changed, sender=model, dispatch_uid=f'snapshot_save_{model.__name__}')
+        post_delete.connect(_content_changed, sender=model, dispatch_uid=f'snapshot_delete_{model.__name__}')
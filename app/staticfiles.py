@@ -0,0 +1,78 @@
+"""
+Static files for ASGI deployments.
+
+WhiteNoiseMiddleware is sync-only. In an ASGI middleware chain, Django
+adapts it and everything behind it through a thread, so every async view
+would run through a thread hop anyway. portfolio/asgi.py therefore wraps
+the Django application in ``ASGIStaticFiles``, which answers static file
+requests itself, before Django. Settings leave WhiteNoiseMiddleware out
+of MIDDLEWARE when PORTFOLIO_ASYNC_VIEWS is on.
+
+Files, headers, compressed variants and conditional and range requests
+are still WhiteNoise's: this only replaces the WSGI/Django response
+plumbing with ASGI messages, reading file chunks off the event loop.
+"""
+
+import asyncio
+
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _request_headers(scope):
+    """ASGI request headers as the WSGI-style dict WhiteNoise reads"""
+    headers = {}
+    for name, value in scope['headers']:
+        key = 'HTTP_' + name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        headers[key] = f'{headers[key]},{value}' if key in headers else value
+    return headers
+
+
+class ASGIStaticFiles:
+    """Serve static files ahead of the ASGI ``application``"""
+
+    def __init__(self, application):
+        self.application = application
+        # Reads STATIC_ROOT, STATIC_URL and the WHITENOISE_* settings
+        self.whitenoise = WhiteNoiseMiddleware()
+
+    def find(self, path):
+        if self.whitenoise.autorefresh:
+            return self.whitenoise.find_file(path)
+        return self.whitenoise.files.get(path)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http':
+            path = scope['path']
+            root_path = scope.get('root_path', '')
+            if root_path and path.startswith(root_path):
+                path = path[len(root_path):]
+            static_file = self.find(path)
+            if static_file is not None:
+                return await self.serve(static_file, scope, send)
+        await self.application(scope, receive, send)
+
+    @staticmethod
+    async def serve(static_file, scope, send):
+        response = static_file.get_response(scope['method'], _request_headers(scope))
+        await send({
+            'type': 'http.response.start',
+            'status': int(response.status),
+            'headers': [
+                (name.lower().encode('latin-1'), value.encode('latin-1'))
+                for name, value in response.headers
+            ],
+        })
+        if response.file is None:
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+        try:
+            while True:
+                chunk = await asyncio.to_thread(response.file.read, CHUNK_SIZE)
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': bool(chunk)})
+                if not chunk:
+                    return
+        finally:
+            response.file.close()
@@ -0,0 +1,201 @@
+"""
+Synthetic portfolio content for benchmarks and query-budget tests.
+
+``generate(scale)`` fills an empty database with ``scale`` rows in every
+public section (projects, experiences, certifications, education,
+highlights, tech stack, skills, contact messages), each with a realistic
+number of child rows, using ``bulk_create`` so that even 100k rows load in
+seconds. The output is deterministic for a given ``scale`` and ``seed``.
+"""
+
+import random
+from datetime import date, timedelta
+
+from django.db import transaction
+
+from . import payloads, snapshot
+from .models import (
+    Profile, TechStack, SkillCategory, Skill,
+    Experience, ExperienceSection, ExperienceTask, ExperienceTech,
+    Project, ProjectMetric, ProjectHighlight, ProjectTech,
+    Certification, Education, Highlight, ContactMessage
+)
+
+BATCH_SIZE = 500
+
+# Children created for every project / experience
+METRICS_PER_PROJECT = 2
+HIGHLIGHTS_PER_PROJECT = 3
+TECHS_PER_ROW = 4
+SECTIONS_PER_EXPERIENCE = 2
+TASKS_PER_SECTION = 3
+SKILLS_PER_CATEGORY = 10
+
+# Every n-th row is inactive, so the is_active filters have work to do
+INACTIVE_EVERY = 10
+
+TECHNOLOGIES = (
+    'Python', 'Django', 'PostgreSQL', 'SQLite', 'Redis', 'Celery', 'Docker',
+    'Kubernetes', 'LangChain', 'LLaMA', 'Mistral', 'PyTorch', 'TensorFlow',
+    'Pandas', 'NumPy', 'FAISS', 'OpenCV', 'RASA', 'React', 'TypeScript',
+    'Plotly', 'Power BI', 'FastAPI', 'Transformers', 'Scikit-learn',
+)
+WORDS = (
+    'pipeline', 'model', 'dashboard', 'chatbot', 'retrieval', 'analytics',
+    'multilingual', 'semantic', 'search', 'vector', 'inference', 'latency',
+    'throughput', 'government', 'citizen', 'services', 'grievance', 'insight',
+    'vision', 'detection', 'tracking', 'ingestion', 'embedding', 'accuracy',
+    'automation', 'workflow', 'report', 'platform', 'scalable', 'realtime',
+)
+
+
+def _sentence(rng, words=12):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def _active(i):
+    return i % INACTIVE_EVERY != INACTIVE_EVERY - 1
+
+
+def _techs(rng, count=TECHS_PER_ROW):
+    return rng.sample(TECHNOLOGIES, count)
+
+
+@transaction.atomic
+def generate(scale, seed=0):
+    """Create ``scale`` rows per section in an empty database"""
+    rng = random.Random(seed)
+    bulk = {'batch_size': BATCH_SIZE}
+    today = date(2025, 1, 1)
+
+    Profile.objects.create(
+        name='Synthetic Profile',
+        about_intro=_sentence(rng, 40),
+        about_details=_sentence(rng, 40),
+        about_current=_sentence(rng, 30),
+        projects_count=scale,
+        certifications_count=scale,
+    )
+
+    TechStack.objects.bulk_create([
+        TechStack(name=f'{TECHNOLOGIES[i % len(TECHNOLOGIES)]} {i}', order=i, is_active=_active(i))
+        for i in range(scale)
+    ], **bulk)
+
+    categories = SkillCategory.objects.bulk_create([
+        SkillCategory(name=f'Category {i}', order=i, is_active=_active(i))
+        for i in range(max(1, scale // SKILLS_PER_CATEGORY))
+    ], **bulk)
+    Skill.objects.bulk_create([
+        Skill(category=category, name=f'{rng.choice(TECHNOLOGIES)} {i}', order=i, is_active=_active(i))
+        for category in categories
+        for i in range(SKILLS_PER_CATEGORY)
+    ], **bulk)
+
+    experiences = Experience.objects.bulk_create([
+        Experience(
+            title=f'Engineer {i}',
+            company=f'Company {i % 50}',
+            location='Remote',
+            start_date=today - timedelta(days=30 * i + 365),
+            end_date=None if i == 0 else today - timedelta(days=30 * i),
+            is_current=i == 0,
+            description=_sentence(rng),
+            order=i,
+            is_active=_active(i),
+        )
+        for i in range(scale)
+    ], **bulk)
+    sections = ExperienceSection.objects.bulk_create([
+        ExperienceSection(experience=experience, title=f'Area {j}', order=j)
+        for experience in experiences
+        for j in range(SECTIONS_PER_EXPERIENCE)
+    ], **bulk)
+    ExperienceTask.objects.bulk_create([
+        ExperienceTask(section=section, description=_sentence(rng), order=k)
+        for section in sections
+        for k in range(TASKS_PER_SECTION)
+    ], **bulk)
+    ExperienceTech.objects.bulk_create([
+        ExperienceTech(experience=experience, name=name, order=k)
+        for experience in experiences
+        for k, name in enumerate(_techs(rng))
+    ], **bulk)
+
+    projects = Project.objects.bulk_create([
+        Project(
+            number=f'{i + 1:02d}',
+            title=f'Project {i} {rng.choice(WORDS)} {rng.choice(WORDS)}',
+            description=_sentence(rng, 30),
+            is_featured=i % 7 == 0,
+            github_url=f'https://github.com/example/project-{i}',
+            order=i,
+            is_active=_active(i),
+        )
+        for i in range(scale)
+    ], **bulk)
+    ProjectMetric.objects.bulk_create([
+        ProjectMetric(project=project, value=f'{rng.randint(1, 99)}%', label=rng.choice(WORDS), order=k)
+        for project in projects
+        for k in range(METRICS_PER_PROJECT)
+    ], **bulk)
+    ProjectHighlight.objects.bulk_create([
+        ProjectHighlight(project=project, description=_sentence(rng), order=k)
+        for project in projects
+        for k in range(HIGHLIGHTS_PER_PROJECT)
+    ], **bulk)
+    ProjectTech.objects.bulk_create([
+        ProjectTech(project=project, name=name, order=k)
+        for project in projects
+        for k, name in enumerate(_techs(rng))
+    ], **bulk)
+
+    Certification.objects.bulk_create([
+        Certification(
+            title=f'Certification {i}',
+            issuer=f'Issuer {i % 20}',
+            category=f'Category {i % 8}',
+            description=_sentence(rng),
+            issue_date=today - timedelta(days=7 * i),
+            credential_id=f'CRED-{i:06d}',
+            order=i,
+            is_active=_active(i),
+        )
+        for i in range(scale)
+    ], **bulk)
+
+    Education.objects.bulk_create([
+        Education(
+            degree=f'Degree {i}',
+            field=rng.choice(WORDS).capitalize(),
+            institution=f'Institute {i % 30}',
+            start_year=2000 + i % 20,
+            end_year=2004 + i % 20,
+            cgpa=8.5,
+            order=i,
+            is_active=_active(i),
+        )
+        for i in range(scale)
+    ], **bulk)
+
+    Highlight.objects.bulk_create([
+        Highlight(title=f'Highlight {i}', description=_sentence(rng), icon_name='star', order=i, is_active=_active(i))
+        for i in range(scale)
+    ], **bulk)
+
+    ContactMessage.objects.bulk_create([
+        ContactMessage(
+            name=f'Visitor {i}',
+            email=f'visitor{i}@example.com',
+            subject=_sentence(rng, 4),
+            message=_sentence(rng, 25),
+            is_read=i % 3 == 0,
+            is_replied=i % 6 == 0,
+        )
+        for i in range(scale)
+    ], **bulk)
+
+    # bulk_create sends no post_save signals
+    payloads.refresh_all()
+    snapshot.invalidate()
+    transaction.on_commit(snapshot.invalidate)
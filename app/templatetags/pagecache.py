@@ -0,0 +1,19 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from ..pagecache import HOLES_FLAG, hole_marker
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def hole(context, template_name):
+    """
+    Render a user-dependent fragment, or leave a placeholder for it.
+
+    While the page cache renders the shared body it sets HOLES_FLAG in the
+    context, and the fragment is spliced in per request instead.
+    """
+    if context.get(HOLES_FLAG):
+        return mark_safe(hole_marker(template_name))
+    return context.template.engine.get_template(template_name).render(context)
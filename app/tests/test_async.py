@@ -0,0 +1,79 @@
+"""
+The ASGI serving path: async snapshot builds and static files served
+ahead of Django.
+"""
+
+import asyncio
+
+from asgiref.sync import async_to_sync
+from django.test import SimpleTestCase, override_settings
+
+from app import snapshot
+from app.staticfiles import ASGIStaticFiles
+
+from .utils import ContentTestCase, make_project
+
+
+class AsyncSnapshotTests(ContentTestCase):
+
+    def test_async_build_matches_the_sync_build(self):
+        make_project('Built', technologies=['Python'])
+        built = snapshot.build_snapshot()
+        abuilt = async_to_sync(snapshot.abuild_snapshot)()
+        self.assertEqual(abuilt.etag, built.etag)
+        self.assertEqual(abuilt.projects, built.projects)
+
+
+async def _request(application, path, headers=()):
+    """(status, headers, body) of one GET through ``application``"""
+    messages = []
+    received = asyncio.Event()
+
+    async def receive():
+        if not received.is_set():
+            received.set()
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await asyncio.Event().wait()  # no disconnect
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        'type': 'http', 'method': 'GET', 'path': path, 'root_path': '', 'query_string': b'',
+        'headers': [(b'host', b'localhost'), *headers],
+    }
+    await application(scope, receive, send)
+    start, *body = messages
+    return start['status'], dict(start['headers']), b''.join(message.get('body', b'') for message in body)
+
+
+@override_settings(WHITENOISE_USE_FINDERS=True, WHITENOISE_AUTOREFRESH=False)
+class ASGIStaticFilesTests(SimpleTestCase):
+
+    def setUp(self):
+        self.calls = []
+
+        async def django(scope, receive, send):
+            self.calls.append(scope['path'])
+            await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+            await send({'type': 'http.response.body', 'body': b'django'})
+
+        self.application = ASGIStaticFiles(django)
+
+    def request(self, path, headers=()):
+        return async_to_sync(_request)(self.application, path, headers)
+
+    def test_static_files_are_served_before_django(self):
+        status, headers, body = self.request('/static/css/style.css')
+        self.assertEqual(status, 200)
+        self.assertEqual(int(headers[b'content-length']), len(body))
+        self.assertTrue(headers[b'content-type'].startswith(b'text/css'))
+        self.assertEqual(self.calls, [])
+
+        status, _, body = self.request('/static/css/style.css', [(b'if-none-match', headers[b'etag'])])
+        self.assertEqual((status, body), (304, b''))
+
+    def test_other_paths_reach_django(self):
+        self.assertEqual(self.request('/api/projects/'), (200, {}, b'django'))
+        self.assertEqual(self.request('/static/missing.css')[2], b'django')
+        self.assertEqual(self.calls, ['/api/projects/', '/static/missing.css'])
@@ -0,0 +1,208 @@
+"""
+Query budgets for every page, API and admin page.
+
+Each route is requested cold (snapshot and page cache cleared) against
+app.synthetic data at every size in SCALES. A route passes if it issues the
+same number of queries at every size and no more than its budget. A query
+per row (N+1) fails the first check as soon as the data grows, whatever the
+budget. Wall-clock time is deliberately not checked: it depends on the
+machine and its load, not on the code.
+"""
+
+import json
+from contextlib import ExitStack
+from typing import NamedTuple
+
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.db import connections, transaction
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from app import inbox, pagecache, snapshot, synthetic
+from app.models import ContactMessage
+
+# Rows per section in each synthetic dataset
+SCALES = (10, 100)
+
+
+class Route(NamedTuple):
+    name: str  # test method suffix
+    url: object  # path, or callable returning one once the data exists
+    budget: int  # maximum queries per request
+    status: int = 200
+    method: str = 'get'
+    data: dict = None
+    staff: bool = False
+
+
+CONTACT_POST = {
+    'name': 'Budget Test',
+    'email': 'budget@example.com',
+    'subject': 'Query budget',
+    'message': 'Checking the query budget of the contact form.',
+}
+
+# A cold request rebuilds the whole snapshot; streamed lists add one scan
+# of their materialized payload column
+SNAPSHOT_QUERIES = 17
+STREAM_QUERIES = 18
+
+PUBLIC_ROUTES = (
+    Route('home', reverse('home'), budget=SNAPSHOT_QUERIES),
+    Route('about', reverse('about'), budget=SNAPSHOT_QUERIES),
+    Route('experience', reverse('experience'), budget=SNAPSHOT_QUERIES),
+    Route('portfolio', reverse('portfolio'), budget=SNAPSHOT_QUERIES),
+    Route('certifications', reverse('certifications'), budget=SNAPSHOT_QUERIES),
+    Route('contact', reverse('contact'), budget=SNAPSHOT_QUERIES),
+    Route('login', reverse('login'), budget=0),
+    Route('logout', reverse('logout'), budget=0, status=302),
+    Route('contact_form', reverse('contact_form'), budget=1, method='post', data=CONTACT_POST),
+    Route('get_projects', reverse('get_projects'), budget=SNAPSHOT_QUERIES),
+    Route('get_projects_page', reverse('get_projects') + '?limit=20', budget=SNAPSHOT_QUERIES),
+    Route('get_projects_stream', reverse('get_projects') + '?stream=1', budget=STREAM_QUERIES),
+    Route('get_projects_tech', reverse('get_projects') + '?tech=python,django&match=any',
+          budget=SNAPSHOT_QUERIES),
+    Route('get_skills', reverse('get_skills'), budget=SNAPSHOT_QUERIES),
+    Route('get_certifications', reverse('get_certifications'), budget=SNAPSHOT_QUERIES),
+    Route('get_experience', reverse('get_experience'), budget=SNAPSHOT_QUERIES),
+    Route('get_experience_stream', reverse('get_experience') + '?stream=1', budget=STREAM_QUERIES),
+    Route('get_portfolio', reverse('get_portfolio'), budget=SNAPSHOT_QUERIES),
+    Route('get_tech', reverse('get_tech'), budget=SNAPSHOT_QUERIES),
+    Route('search', reverse('search') + '?q=engineer', budget=SNAPSHOT_QUERIES),
+    Route('metrics', reverse('metrics'), budget=2, staff=True),
+)
+
+# Admin pages: the same queries for every model (session, user, ...) plus
+# the model's own; budgets are per page kind unless overridden below
+ADMIN_BUDGETS = {'changelist': 7, 'add': 3, 'change': 4}
+ADMIN_BUDGET_OVERRIDES = {
+    'admin_certification_changelist': 8,
+    # Change forms with inlines (one query per formset) or FK widgets
+    'admin_profile_change': 5,
+    'admin_skillcategory_change': 5,
+    'admin_skill_change': 6,
+    'admin_experience_change': 6,
+    'admin_experiencesection_change': 7,
+    'admin_project_change': 7,
+}
+
+
+def _first_change_url(model):
+    def url():
+        obj = model.objects.order_by('pk').first()
+        return reverse(f'admin:{model._meta.app_label}_{model._meta.model_name}_change', args=[obj.pk])
+    return url
+
+
+def _older_messages_url():
+    fifth = ContactMessage.objects.order_by('-created_at', '-id')[4]
+    return reverse('admin:app_contactmessage_changelist') + f'?cursor={inbox.cursor_for(fifth)}'
+
+
+def admin_routes():
+    for model, model_admin in admin.site._registry.items():
+        if model._meta.app_label != 'app':
+            continue
+        prefix = f'admin:app_{model._meta.model_name}'
+        pages = {
+            'changelist': reverse(f'{prefix}_changelist'),
+            'change': _first_change_url(model),
+        }
+        # Profile is a singleton and messages only arrive through the site
+        if model_admin.has_add_permission.__func__ is admin.ModelAdmin.has_add_permission:
+            pages['add'] = reverse(f'{prefix}_add')
+        for page, url in pages.items():
+            name = f'admin_{model._meta.model_name}_{page}'
+            budget = ADMIN_BUDGET_OVERRIDES.get(name, ADMIN_BUDGETS[page])
+            yield Route(name, url, budget=budget, staff=True)
+
+
+INBOX_ROUTES = (
+    Route('admin_contactmessage_search', reverse('admin:app_contactmessage_changelist') + '?q=visitor',
+          budget=ADMIN_BUDGETS['changelist'], staff=True),
+    Route('admin_contactmessage_older', _older_messages_url, budget=ADMIN_BUDGETS['changelist'], staff=True),
+)
+
+ROUTES = PUBLIC_ROUTES + tuple(admin_routes()) + INBOX_ROUTES
+
+
+# ===================================
+# HARNESS
+# ===================================
+
+@override_settings(
+    CONTACT_QUEUE={'ENABLED': False},
+    RATE_LIMIT_ENABLED=False,
+    METRICS={'ENABLED': False},
+)
+class QueryBudgetTests(TestCase):
+    """
+    Requests every route at every scale once, in setUpTestData, and checks
+    one route per test method (generated below from ROUTES)
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        staff = User.objects.create_superuser('budget', 'budget@example.com', 'unused-password')
+        cls.clients = {False: Client(HTTP_HOST='localhost'), True: Client(HTTP_HOST='localhost')}
+        cls.clients[True].force_login(staff)
+
+        cls.results = {route.name: {} for route in ROUTES}
+        for scale in SCALES:
+            with transaction.atomic():
+                synthetic.generate(scale)
+                for route in ROUTES:
+                    cls.request(route)  # warm process-wide caches (content types, templates)
+                    cls.results[route.name][scale] = cls.request(route)
+                transaction.set_rollback(True)
+        snapshot.invalidate()
+        pagecache.clear()
+
+    @classmethod
+    def request(cls, route):
+        """(status, queries) of one cold request"""
+        snapshot.invalidate()
+        pagecache.clear()
+        inbox.clear_counts()
+        client = cls.clients[route.staff]
+        url = route.url() if callable(route.url) else route.url
+        kwargs = {}
+        if route.data is not None:
+            kwargs = {'data': json.dumps(route.data), 'content_type': 'application/json'}
+
+        with ExitStack() as stack:
+            captures = [stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in cls.databases]
+            response = getattr(client, route.method)(url, **kwargs)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        queries = [query['sql'] for capture in captures for query in capture]
+        return response.status_code, queries
+
+    def check_route(self, route):
+        results = self.results[route.name]
+        counts = {scale: len(queries) for scale, (_, queries) in results.items()}
+        for scale, (status, _) in results.items():
+            self.assertEqual(status, route.status, f'{route.name} at scale {scale}')
+        largest = results[SCALES[-1]][1]
+        self.assertEqual(
+            len(set(counts.values())), 1,
+            f'{route.name} issues more queries as the data grows {counts}:\n' + '\n'.join(largest),
+        )
+        self.assertLessEqual(
+            counts[SCALES[-1]], route.budget,
+            f'{route.name} is over its budget of {route.budget} queries:\n' + '\n'.join(largest),
+        )
+
+
+def _route_test(route):
+    def test(self):
+        self.check_route(route)
+    test.__name__ = f'test_{route.name}'
+    test.__doc__ = f'{route.name} stays within {route.budget} queries at every scale'
+    return test
+
+
+for _route in ROUTES:
+    setattr(QueryBudgetTests, f'test_{_route.name}', _route_test(_route))
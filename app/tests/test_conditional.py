@@ -0,0 +1,198 @@
+"""
+Conditional GETs (ETag / Last-Modified) of the pages and APIs.
+"""
+
+import subprocess
+from datetime import datetime, timezone
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.test import RequestFactory, override_settings
+from django.urls import resolve, reverse
+from django.utils.http import parse_http_date
+
+from app import async_views, build, snapshot
+from app.models import Certification
+
+from .utils import ContentTestCase, make_project
+
+
+class ConditionalGetTests(ContentTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.project = make_project('Cached')
+
+    def get(self, name, **headers):
+        return self.client.get(reverse(name), headers=headers)
+
+    def test_matching_etag_is_not_modified(self):
+        for name in ('get_projects', 'get_portfolio', 'home', 'portfolio'):
+            with self.subTest(name=name):
+                response = self.get(name)
+                self.assertEqual(response.status_code, 200)
+                cached = self.get(name, if_none_match=response['ETag'])
+                self.assertEqual(cached.status_code, 304)
+                self.assertEqual(cached.content, b'')
+
+    def test_last_modified_is_not_modified(self):
+        response = self.get('get_projects')
+        cached = self.get('get_projects', if_modified_since=response['Last-Modified'])
+        self.assertEqual(cached.status_code, 304)
+
+    def test_content_change_is_modified(self):
+        response = self.get('get_projects')
+        self.project.title = 'Edited'
+        self.project.save()
+        fresh = self.get('get_projects', if_none_match=response['ETag'])
+        self.assertEqual(fresh.status_code, 200)
+        self.assertNotEqual(fresh['ETag'], response['ETag'])
+        self.assertIn(b'Edited', fresh.content)
+
+    def test_new_build_is_modified(self):
+        response = self.get('get_projects')
+        with override_settings(BUILD_ID='next-deploy'):
+            fresh = self.get('get_projects', if_none_match=response['ETag'])
+            self.assertEqual(fresh.status_code, 200)
+            self.assertIn('next-deploy', fresh['ETag'])
+            self.assertEqual(self.get('get_projects', if_none_match=fresh['ETag']).status_code, 304)
+
+    def test_last_modified_is_not_older_than_the_build(self):
+        last_modified = parse_http_date(self.get('get_projects')['Last-Modified'])
+        self.assertGreaterEqual(datetime.fromtimestamp(last_modified, timezone.utc), build.get_build().time)
+
+    def test_signed_in_pages_validate_per_user(self):
+        anonymous = self.get('home')
+        user = User.objects.create_user('visitor', password='unused-password-123')
+        self.client.force_login(user)
+        response = self.get('home', if_none_match=anonymous['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Last-Modified', response)
+        self.assertEqual(self.get('home', if_none_match=response['ETag']).status_code, 304)
+
+    def test_snapshot_is_resolved_once_per_request(self):
+        user = User.objects.create_user('visitor', password='unused-password-123')
+        for name, signed_in in (('home', True), ('home', False), ('get_projects', False)):
+            with self.subTest(name=name, signed_in=signed_in):
+                self.client.logout()
+                if signed_in:
+                    self.client.force_login(user)
+                with mock.patch('app.conditional.get_snapshot', wraps=snapshot.get_snapshot) as resolved, \
+                        mock.patch('app.views.get_snapshot', side_effect=AssertionError):
+                    self.assertEqual(self.get(name).status_code, 200)
+                self.assertEqual(resolved.call_count, 1)
+
+    def test_invalid_params_are_rejected_before_revalidating(self):
+        etag = self.get('get_projects')['ETag']
+        last_modified = self.get('get_projects')['Last-Modified']
+        for name, params in (
+            ('get_projects', {'limit': 'x'}),
+            ('get_projects', {'fields': 'nope'}),
+            ('get_projects', {'cursor': '!!'}),
+            ('get_projects', {'stream': '1', 'tech': 'django'}),
+            ('get_certifications', {'limit': '0'}),
+            ('get_tech', {'tech': 'python', 'match': 'some'}),
+            ('search', {'q': ''}),
+            ('get_portfolio', {'include': 'nope'}),
+        ):
+            with self.subTest(name=name, params=params):
+                response = self.client.get(reverse(name), params, headers={
+                    'if_none_match': etag, 'if_modified_since': last_modified,
+                })
+                self.assertEqual(response.status_code, 400)
+                request = RequestFactory().get(reverse(name), params, headers={'if_none_match': etag})
+                view = getattr(async_views, resolve(reverse(name)).func.__name__)
+                self.assertEqual(async_to_sync(view)(request).status_code, 400)
+
+    def test_valid_params_still_revalidate(self):
+        etag = self.get('get_projects')['ETag']
+        response = self.client.get(reverse('get_projects'), {'limit': 1}, headers={'if_none_match': etag})
+        self.assertEqual(response.status_code, 304)
+
+    def test_async_views_share_the_validators(self):
+        response = self.get('get_projects')
+        request = RequestFactory().get(reverse('get_projects'), headers={'if_none_match': response['ETag']})
+        cached = async_to_sync(async_views.get_projects)(request)
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached['ETag'], response['ETag'])
+
+
+class IncludeTests(ContentTestCase):
+    """/api/portfolio/?include= validates exactly the sections it returns"""
+
+    def setUp(self):
+        super().setUp()
+        self.project = make_project('Included')
+        self.cert = Certification.objects.create(title='Cloud', issuer='AWS', category='Cloud',
+                                                 description='Fundamentals.')
+
+    def get(self, include, **headers):
+        return self.client.get(reverse('get_portfolio'), {'include': include}, headers=headers)
+
+    def aget(self, include, **headers):
+        request = RequestFactory().get(reverse('get_portfolio'), {'include': include}, headers=headers)
+        return async_to_sync(async_views.get_portfolio_api)(request)
+
+    def test_only_included_sections_are_returned(self):
+        data = self.get('projects,certifications').json()
+        self.assertEqual(set(data), {'projects', 'certifications'})
+
+    def test_unknown_section_is_rejected(self):
+        for include in ('projects,nope', ',', 'skill_categories'):
+            with self.subTest(include=include):
+                for response in (self.get(include), self.aget(include)):
+                    self.assertEqual(response.status_code, 400)
+                    self.assertNotIn('ETag', response)
+                self.assertIn('Available:', self.get(include).json()['message'])
+
+    def test_matching_etag_is_not_modified(self):
+        etag = self.get('projects,certifications')['ETag']
+        for response in (self.get('projects,certifications', if_none_match=etag),
+                         self.aget('projects,certifications', if_none_match=etag)):
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response['ETag'], etag)
+        # Another selection is another representation
+        self.assertEqual(self.get('projects', if_none_match=etag).status_code, 200)
+
+    def test_etag_changes_with_any_included_section(self):
+        etags = [self.get('projects,certifications')['ETag']]
+        self.project.title = 'Edited'
+        self.project.save()
+        etags.append(self.get('projects,certifications')['ETag'])
+        self.cert.issuer = 'Amazon'
+        self.cert.save()
+        etags.append(self.get('projects,certifications')['ETag'])
+        self.assertEqual(len(set(etags)), 3)
+
+    def test_etag_ignores_other_sections(self):
+        etag = self.get('certifications')['ETag']
+        self.project.title = 'Edited'
+        self.project.save()
+        self.assertEqual(self.get('certifications', if_none_match=etag).status_code, 304)
+
+
+class BuildTests(ContentTestCase):
+
+    def test_build_id_defaults_to_a_source_digest(self):
+        with override_settings(BUILD_ID=None):
+            first = build.get_build()
+            self.assertRegex(first.id, r'^[0-9a-f]{12}$')
+        with override_settings(BUILD_ID='abc123'):
+            self.assertEqual(build.get_build().id, 'abc123')
+
+    def test_build_time_is_the_commit_time(self):
+        commit = subprocess.run(['git', 'log', '-1', '--format=%ct'], cwd=settings.BASE_DIR,
+                                capture_output=True, text=True)
+        if commit.returncode != 0:
+            self.skipTest('not a git checkout')
+        with override_settings(BUILD_ID='commit-time'):
+            self.assertEqual(build.get_build().time, datetime.fromtimestamp(int(commit.stdout), timezone.utc))
+
+    def test_build_time_without_git(self):
+        with mock.patch('app.build.subprocess.run', side_effect=FileNotFoundError), \
+                override_settings(BUILD_ID='no-git'):
+            self.assertIsNone(build.get_build().time)
+            response = self.client.get(reverse('get_projects'))
+        self.assertIn('no-git', response['ETag'])
@@ -0,0 +1,153 @@
+"""
+The contact form's journaled write-behind queue.
+
+The writer thread inserts through its own database connection, so these
+tests commit for real (TransactionTestCase) instead of running inside a
+rolled back transaction.
+"""
+
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from django.db import OperationalError
+from django.test import TransactionTestCase
+
+from app.contact_queue import ContactQueue, QueueFull, read_uncommitted
+from app.models import ContactMessage
+
+
+def _dead_pid():
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+class ContactQueueTests(TransactionTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.journal_dir = Path(directory.name)
+
+    def make_queue(self, **options):
+        queue = ContactQueue(self.journal_dir, **options)
+        self.addCleanup(queue.drain)
+        return queue
+
+    def submit(self, queue, count, start=0):
+        for i in range(start, start + count):
+            queue.submit(f'Visitor {i}', f'visitor{i}@example.com', 'Hello', f'Message {i}')
+
+    def count_rows(self):
+        # The test database is a shared-cache in-memory SQLite database, where
+        # a read racing the writer thread's insert fails with "table is locked"
+        # instead of waiting on the busy timeout.
+        while True:
+            try:
+                return ContactMessage.objects.count()
+            except OperationalError:
+                time.sleep(0.01)
+
+    def wait_for_rows(self, count, timeout=5):
+        deadline = time.monotonic() + timeout
+        while self.count_rows() < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return self.count_rows()
+
+    def journaled(self, queue):
+        return read_uncommitted(self.journal_dir, queue.pid)[0]
+
+    def write_journal(self, pid, entries, committed=0, torn=False):
+        with open(self.journal_dir / f'{pid}-0.jsonl', 'w', encoding='utf-8') as f:
+            f.writelines(json.dumps(entry) + '\n' for entry in entries)
+            if torn:
+                f.write('{"name": "torn wr')  # crashed mid-write; never acknowledged
+        (self.journal_dir / f'{pid}.offset').write_text(json.dumps({'segment': 0, 'committed': committed}))
+
+    def test_full_batch_is_flushed_without_waiting_for_the_interval(self):
+        queue = self.make_queue(batch_size=3, flush_interval=60)
+        self.submit(queue, 2)
+        self.assertEqual(len(self.journaled(queue)), 2)
+        self.submit(queue, 1, start=2)
+        self.assertEqual(self.wait_for_rows(3), 3)
+        queue.drain()  # let the writer finish moving the marker
+        self.assertEqual(queue.stats()['flushes'], 1)
+        self.assertEqual(self.journaled(queue), [])
+
+    def test_partial_batch_is_flushed_after_the_interval(self):
+        queue = self.make_queue(batch_size=100, flush_interval=0.3)
+        started = time.monotonic()
+        self.submit(queue, 2)
+        self.assertEqual(self.wait_for_rows(2), 2)
+        self.assertGreaterEqual(time.monotonic() - started, 0.25)
+        queue.drain()
+        self.assertEqual(queue.stats()['flushes'], 1)
+
+    def test_queue_refuses_messages_beyond_max_depth(self):
+        queue = self.make_queue(batch_size=100, flush_interval=60, max_depth=2)
+        self.submit(queue, 2)
+        with self.assertRaises(QueueFull):
+            self.submit(queue, 1, start=2)
+
+    def test_journal_of_a_crashed_process_is_replayed(self):
+        pid = _dead_pid()
+        entries = [
+            {'name': f'Visitor {i}', 'email': f'v{i}@example.com', 'subject': 'Hi', 'message': f'Sent {i}'}
+            for i in range(3)
+        ]
+        # The first entry was inserted before the crash
+        self.write_journal(pid, entries, committed=1, torn=True)
+
+        with self.assertLogs('app.contact_queue', 'WARNING'):
+            queue = self.make_queue(batch_size=50, flush_interval=0.05)
+        self.assertEqual(list(self.journal_dir.glob(f'{pid}[.-]*')), [])
+        self.assertEqual(self.wait_for_rows(2), 2)
+        self.assertEqual(sorted(ContactMessage.objects.values_list('message', flat=True)), ['Sent 1', 'Sent 2'])
+        queue.drain()
+        self.assertEqual(self.journaled(queue), [])
+
+    def test_journal_of_a_running_process_is_left_alone(self):
+        self.write_journal(1, [{'name': 'a', 'email': 'a@b.c', 'subject': 's', 'message': 'm'}])  # init never exits
+        self.make_queue().drain()
+        self.assertTrue((self.journal_dir / '1.offset').exists())
+        self.assertTrue((self.journal_dir / '1-0.jsonl').exists())
+        self.assertEqual(ContactMessage.objects.count(), 0)
+
+    def test_flushed_segments_are_retired(self):
+        queue = self.make_queue(batch_size=2, flush_interval=60)
+        self.submit(queue, 2)
+        self.assertEqual(self.wait_for_rows(2), 2)
+        queue.drain()
+        self.assertEqual(list(self.journal_dir.glob('*.jsonl')), [])
+        marker = json.loads(queue.marker_path.read_text())
+        self.assertEqual(marker, {'segment': 1, 'committed': 0})
+
+    def test_rejected_message_is_dead_lettered(self):
+        queue = self.make_queue(batch_size=3, flush_interval=60)
+        self.submit(queue, 1)
+        queue.submit(None, 'bad@example.com', 'Hello', 'NOT NULL name')
+        self.submit(queue, 1, start=1)
+        with self.assertLogs('app.contact_queue', 'ERROR'):
+            queue.drain()
+        self.assertEqual(sorted(ContactMessage.objects.values_list('message', flat=True)), ['Message 0', 'Message 1'])
+        dead = [json.loads(line) for line in queue.dead_letter_path.read_text().splitlines()]
+        self.assertEqual([entry['message'] for entry in dead], ['NOT NULL name'])
+        self.assertIn('IntegrityError', dead[0]['error'])
+        self.assertEqual(queue.stats()['dead_lettered'], 1)
+        self.assertEqual(self.journaled(queue), [])
+
+    def test_drain_with_the_writer_running_inserts_each_message_once(self):
+        for attempt in range(3):
+            with self.subTest(attempt=attempt):
+                ContactMessage.objects.all().delete()
+                queue = ContactQueue(self.journal_dir, batch_size=10, flush_interval=0.001)
+                self.submit(queue, 30)
+                queue.drain()
+                messages = list(ContactMessage.objects.values_list('message', flat=True))
+                self.assertEqual(sorted(messages), sorted(f'Message {i}' for i in range(30)))
+                self.assertEqual(queue.stats()['depth'], 0)
+                self.assertEqual(self.journaled(queue), [])
@@ -0,0 +1,151 @@
+"""
+Contact message admin: FTS5 search and keyset pages (app/inbox.py).
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+from app import inbox
+from app.admin import ContactMessageAdmin
+from app.models import ContactMessage
+
+from .utils import ContentTestCase
+
+
+def make_message(subject, message='Hello there.', name='Visitor', email='visitor@example.com'):
+    return ContactMessage.objects.create(name=name, email=email, subject=subject, message=message)
+
+
+class InboxTestCase(ContentTestCase):
+
+    def setUp(self):
+        super().setUp()
+        inbox.clear_counts()
+        self.addCleanup(inbox.clear_counts)
+
+
+class FullTextSearchTests(InboxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.chatbot = make_message('Chatbot project', 'Could you build a café ordering bot?')
+        self.hiring = make_message('Hiring', 'We have a data role open.', name='Recruiter',
+                                   email='jobs@acme.example')
+
+    def matches(self, term):
+        return set(inbox.search(ContactMessage.objects.all(), term).values_list('pk', flat=True))
+
+    def test_every_field_is_searched(self):
+        self.assertEqual(self.matches('chatbot'), {self.chatbot.pk})
+        self.assertEqual(self.matches('ordering'), {self.chatbot.pk})
+        self.assertEqual(self.matches('recruiter'), {self.hiring.pk})
+        self.assertEqual(self.matches('acme'), {self.hiring.pk})
+
+    def test_words_are_prefixes_and_all_must_match(self):
+        self.assertEqual(self.matches('chat'), {self.chatbot.pk})
+        self.assertEqual(self.matches('data role'), {self.hiring.pk})
+        self.assertEqual(self.matches('data chatbot'), set())
+
+    def test_accents_are_folded(self):
+        self.assertEqual(self.matches('cafe'), {self.chatbot.pk})
+
+    def test_punctuation_is_not_fts_syntax(self):
+        self.assertEqual(self.matches('"chatbot" OR *'), {self.chatbot.pk})
+        self.assertEqual(self.matches('!!!'), {self.chatbot.pk, self.hiring.pk})
+
+    def test_update_trigger_reindexes_text(self):
+        self.chatbot.subject = 'Voice assistant'
+        self.chatbot.save()
+        self.assertEqual(self.matches('voice'), {self.chatbot.pk})
+        self.assertEqual(self.matches('chatbot'), set())
+        # Still found by the fields that did not change
+        self.assertEqual(self.matches('ordering'), {self.chatbot.pk})
+
+    def test_status_updates_keep_the_index(self):
+        ContactMessage.objects.filter(pk=self.chatbot.pk).update(is_read=True, is_replied=True)
+        self.assertEqual(self.matches('chatbot'), {self.chatbot.pk})
+
+    def test_delete_trigger_removes_rows(self):
+        self.chatbot.delete()
+        self.assertEqual(self.matches('chatbot'), set())
+        ContactMessage.objects.all().delete()
+        self.assertEqual(self.matches('data'), set())
+
+    def test_bulk_inserts_are_indexed(self):
+        ContactMessage.objects.bulk_create([
+            ContactMessage(name='Bulk', email='bulk@example.com', subject=f'Batch {i}', message='Queued.')
+            for i in range(3)
+        ])
+        self.assertEqual(len(self.matches('queued')), 3)
+
+    def test_admin_search_box(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'unused-password-123'))
+        response = self.client.get(reverse('admin:app_contactmessage_changelist'), {'q': 'chat'})
+        self.assertEqual([m.pk for m in response.context['cl'].result_list], [self.chatbot.pk])
+
+
+@mock.patch.object(ContactMessageAdmin, 'list_per_page', 3)
+class KeysetPageTests(InboxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'unused-password-123'))
+        self.url = reverse('admin:app_contactmessage_changelist')
+        # Three timestamps shared by several messages each, so pages split ties
+        base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        for i in range(8):
+            message = make_message(f'Message {i}')
+            ContactMessage.objects.filter(pk=message.pk).update(created_at=base + timedelta(hours=i // 3))
+        self.expected = list(
+            ContactMessage.objects.order_by('-created_at', '-id').values_list('pk', flat=True)
+        )
+
+    def changelist(self, query=''):
+        response = self.client.get(self.url + query)
+        self.assertEqual(response.status_code, 200)
+        return response.context['cl']
+
+    def test_older_pages_walk_every_row_once(self):
+        pages = []
+        cl = self.changelist()
+        self.assertTrue(cl.keyset)
+        self.assertIsNone(cl.newest_url)
+        while True:
+            pages.append([m.pk for m in cl.result_list])
+            if cl.older_url is None:
+                break
+            cl = self.changelist(cl.older_url)
+        self.assertEqual([len(page) for page in pages], [3, 3, 2])
+        self.assertEqual([pk for page in pages for pk in page], self.expected)
+
+    def test_newest_link_returns_to_the_first_page(self):
+        first = self.changelist()
+        second = self.changelist(first.older_url)
+        self.assertIsNotNone(second.newest_url)
+        self.assertNotIn(inbox.CURSOR_VAR, second.newest_url)
+        self.assertEqual(
+            [m.pk for m in self.changelist(second.newest_url).result_list],
+            [m.pk for m in first.result_list],
+        )
+
+    def test_cursor_keeps_filters(self):
+        ContactMessage.objects.filter(pk__in=self.expected[::2]).update(is_read=True)
+        unread = [pk for pk in self.expected if pk not in self.expected[::2]]
+        first = self.changelist('?is_read__exact=0')
+        self.assertIn('is_read__exact=0', first.older_url)
+        second = self.changelist(first.older_url)
+        self.assertEqual([m.pk for m in first.result_list + second.result_list], unread)
+
+    def test_sorting_by_a_column_uses_numbered_pages(self):
+        cl = self.changelist('?o=1')
+        self.assertFalse(cl.keyset)
+        self.assertEqual(cl.result_count, 8)
+
+    def test_bad_cursor_is_rejected(self):
+        response = self.client.get(self.url, {'cursor': 'not-a-cursor'})
+        # The admin answers IncorrectLookupParameters by redirecting to ?e=1
+        self.assertEqual(response.status_code, 302)
+        self.assertIn('e=1', response['Location'])
@@ -0,0 +1,153 @@
+"""
+Server-Timing header and the Prometheus endpoint.
+"""
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.test import AsyncClient, override_settings
+from django.urls import reverse
+
+from app import metrics
+
+from .utils import ContentTestCase, make_project
+
+SERVER_TIMING = re.compile(
+    r'^view;dur=\d+\.\d{2}, sql;dur=\d+\.\d{2};desc="\d+ queries", '
+    r'render;dur=\d+\.\d{2}, serialize;dur=\d+\.\d{2}$'
+)
+SAMPLE = re.compile(r'^([a-z_]+)(?:\{([^}]*)\})? (\S+)$')
+
+
+def _dead_pid():
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+def parse_prometheus(text):
+    """``{(metric, labels): value}`` of every sample; fails on malformed lines"""
+    samples = {}
+    for line in text.splitlines():
+        if not line or line.startswith('#'):
+            continue
+        match = SAMPLE.match(line)
+        if match is None:
+            raise AssertionError(f'Malformed sample line: {line!r}')
+        name, labels, value = match.groups()
+        labels = tuple(re.findall(r'(\w+)="((?:[^"\\]|\\.)*)"', labels or ''))
+        samples[name, labels] = float(value)
+    return samples
+
+
+class MetricsTestCase(ContentTestCase):
+
+    def setUp(self):
+        super().setUp()
+        directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        settings = override_settings(METRICS={'ENABLED': True, 'FLUSH_INTERVAL': 3600, 'DIR': directory})
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.metrics_dir = directory
+
+        registry = metrics.Registry()
+        self.addCleanup(setattr, metrics, 'registry', metrics.registry)
+        metrics.registry = registry
+
+        make_project('Timed', technologies=('Python',))
+        self.staff = User.objects.create_user('staff', password='unused-password-123', is_staff=True)
+
+
+class ServerTimingTests(MetricsTestCase):
+
+    def test_header_format_for_staff(self):
+        self.client.force_login(self.staff)
+        for name in ('get_projects', 'home'):
+            with self.subTest(name=name):
+                header = self.client.get(reverse(name))['Server-Timing']
+                self.assertRegex(header, SERVER_TIMING)
+
+    def test_header_is_hidden_from_other_users(self):
+        response = self.client.get(reverse('get_projects'))
+        self.assertNotIn('Server-Timing', response)
+        # No session was loaded to decide that
+        self.assertNotIn('Cookie', response.get('Vary', ''))
+
+        visitor = User.objects.create_user('visitor', password='unused-password-123')
+        self.client.force_login(visitor)
+        self.assertNotIn('Server-Timing', self.client.get(reverse('get_projects')))
+
+    def test_header_can_be_made_public(self):
+        with override_settings(METRICS={'ENABLED': True, 'DIR': self.metrics_dir, 'PUBLIC_SERVER_TIMING': True}):
+            self.assertRegex(self.client.get(reverse('get_projects'))['Server-Timing'], SERVER_TIMING)
+
+    def test_async_header_for_staff(self):
+        client = AsyncClient(HTTP_HOST='localhost')
+        client.force_login(self.staff)
+        response = async_to_sync(client.get)(reverse('get_projects'))
+        self.assertRegex(response['Server-Timing'], SERVER_TIMING)
+        anonymous = async_to_sync(AsyncClient(HTTP_HOST='localhost').get)(reverse('get_projects'))
+        self.assertNotIn('Server-Timing', anonymous)
+
+
+class PrometheusTests(MetricsTestCase):
+
+    def test_staff_only(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+        self.client.force_login(User.objects.create_user('visitor', password='unused-password-123'))
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], metrics.CONTENT_TYPE)
+
+    def test_histograms_parse_and_are_cumulative(self):
+        for _ in range(3):
+            self.client.get(reverse('get_projects'))
+        samples = parse_prometheus(metrics.render_prometheus())
+
+        label = ('url_name', 'get_projects')
+        for metric, _ in metrics.TIMINGS.values():
+            with self.subTest(metric=metric):
+                buckets = [
+                    samples[f'{metric}_bucket', (label, ('le', str(bound)))]
+                    for bound in metrics.BUCKETS + ('+Inf',)
+                ]
+                self.assertEqual(buckets, sorted(buckets))
+                self.assertEqual(buckets[-1], samples[f'{metric}_count', (label,)])
+                self.assertEqual(buckets[-1], 3)
+        self.assertGreater(samples['portfolio_sql_queries_total', (label,)], 0)
+
+    def test_other_workers_are_merged_and_dead_ones_pruned(self):
+        self.client.get(reverse('get_projects'))
+        state = metrics.registry.state()
+
+        live, dead = os.getppid(), _dead_pid()
+        for pid in (live, dead):
+            (self.metrics_dir / f'{pid}.json').write_text(json.dumps(state))
+
+        samples = parse_prometheus(metrics.render_prometheus())
+        label = (('url_name', 'get_projects'),)
+        # This process plus the running worker; the dead one is left out
+        self.assertEqual(samples['portfolio_view_seconds_count', label], 2)
+        self.assertEqual(
+            samples['portfolio_sql_queries_total', label],
+            2 * state['queries']['get_projects'],
+        )
+        self.assertTrue((self.metrics_dir / f'{live}.json').exists())
+        self.assertFalse((self.metrics_dir / f'{dead}.json').exists())
+
+    def test_flush_writes_this_worker(self):
+        self.client.get(reverse('get_projects'))
+        metrics.registry.flush()
+        written = json.loads((self.metrics_dir / f'{os.getpid()}.json').read_text())
+        self.assertEqual(written['queries'], metrics.registry.state()['queries'])
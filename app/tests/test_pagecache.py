@@ -0,0 +1,96 @@
+"""
+Full-page cache: per-user holes, validators and stale serving.
+"""
+
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+from app import pagecache
+
+from .utils import ContentTestCase, make_project
+
+SIGNED_IN_NAV = ('Logged in as:', '/logout/', 'Admin Panel')
+
+
+class HolePunchingTests(ContentTestCase):
+
+    def setUp(self):
+        super().setUp()
+        make_project('Cached')
+        self.owner = User.objects.create_user('alice-owner', password='unused-password-123')
+        self.visitor = User.objects.create_user('bob-visitor', password='unused-password-123')
+
+    def get(self, user=None, **headers):
+        self.client.logout()
+        if user is not None:
+            self.client.force_login(user)
+        return self.client.get(reverse('portfolio'), headers=headers)
+
+    def test_signed_in_render_does_not_leak(self):
+        warm = self.get(self.owner)
+        self.assertContains(warm, 'Logged in as: alice-owner')
+
+        anonymous = self.get()
+        self.assertNotContains(anonymous, 'alice-owner')
+        for marker in SIGNED_IN_NAV:
+            self.assertNotContains(anonymous, marker)
+        self.assertContains(anonymous, '/login/')
+
+        other = self.get(self.visitor)
+        self.assertNotContains(other, 'alice-owner')
+        self.assertContains(other, 'Logged in as: bob-visitor')
+
+        self.assertNotContains(anonymous, 'pagecache-hole')
+        self.assertNotContains(other, 'pagecache-hole')
+
+    def test_responses_vary_on_cookie(self):
+        for user in (None, self.owner):
+            with self.subTest(user=user):
+                response = self.get(user)
+                self.assertIn('Cookie', [v.strip() for v in response['Vary'].split(',')])
+
+    def test_etags_are_per_user(self):
+        anonymous = self.get()
+        owner = self.get(self.owner)
+        visitor = self.get(self.visitor)
+
+        self.assertNotIn('-u', anonymous['ETag'])
+        self.assertIn(f'-u{self.owner.pk}', owner['ETag'])
+        self.assertIn(f'-u{self.visitor.pk}', visitor['ETag'])
+        self.assertEqual(len({anonymous['ETag'], owner['ETag'], visitor['ETag']}), 3)
+
+        # One user's validator does not match another's page
+        self.assertEqual(self.get(self.visitor, if_none_match=owner['ETag']).status_code, 200)
+        self.assertEqual(self.get(if_none_match=owner['ETag']).status_code, 200)
+        self.assertEqual(self.get(self.owner, if_none_match=owner['ETag']).status_code, 304)
+
+
+class StalePageTests(ContentTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.project = make_project('Original')
+
+    def get(self):
+        return self.client.get(reverse('portfolio'))
+
+    def edit(self):
+        self.project.title = 'Edited'
+        self.project.save()
+
+    def test_busy_render_serves_the_previous_page(self):
+        self.assertContains(self.get(), 'Original')
+        self.edit()
+
+        lock = pagecache._renders._thread_lock('portfolio.html')
+        lock.acquire()  # as if another request were rendering it
+        try:
+            stale = self.get()
+        finally:
+            lock.release()
+        self.assertContains(stale, 'Original')
+        self.assertIn('no-store', stale['Cache-Control'])
+
+        fresh = self.get()
+        self.assertContains(fresh, 'Edited')
+        self.assertNotIn('no-store', fresh.get('Cache-Control', ''))
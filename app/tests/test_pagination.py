@@ -0,0 +1,106 @@
+"""
+Cursor pagination and ?fields= selection on the list APIs.
+"""
+
+from datetime import date
+
+from django.urls import reverse
+
+from app.pagination import MAX_LIMIT, decode_cursor, encode_cursor
+
+from .utils import ContentTestCase, make_experience, make_project
+
+
+class CursorPaginationTests(ContentTestCase):
+
+    def setUp(self):
+        super().setUp()
+        # Equal orders, so pages must break ties on id to stay stable
+        self.projects = [make_project(f'Project {i}', order=i // 3) for i in range(10)]
+
+    def walk(self, url, limit):
+        ids, cursor, pages = [], None, 0
+        while True:
+            params = {'limit': limit}
+            if cursor:
+                params['cursor'] = cursor
+            data = self.client.get(url, params).json()
+            ids += [project['id'] for project in data['projects']]
+            pages += 1
+            cursor = data['next_cursor']
+            if cursor is None:
+                return ids, pages
+
+    def test_pages_cover_the_collection_once_in_order(self):
+        url = reverse('get_projects')
+        everything = [project['id'] for project in self.client.get(url).json()['projects']]
+        ids, pages = self.walk(url, limit=3)
+        self.assertEqual(ids, everything)
+        self.assertEqual(ids, [project.pk for project in self.projects])
+        self.assertEqual(pages, 4)
+
+    def test_unpaginated_response_has_no_cursor(self):
+        data = self.client.get(reverse('get_projects')).json()
+        self.assertNotIn('next_cursor', data)
+
+    def test_cursor_survives_inserting_before_it(self):
+        url = reverse('get_projects')
+        first = self.client.get(url, {'limit': 4}).json()
+        make_project('Inserted first', order=-1)
+        second = self.client.get(url, {'limit': 4, 'cursor': first['next_cursor']}).json()
+        self.assertEqual([p['id'] for p in second['projects']], [p.pk for p in self.projects[4:8]])
+
+    def test_experience_keyset_is_newest_first(self):
+        older = make_experience('Engineer', 'Older', start_date=date(2020, 1, 1))
+        newer = make_experience('Engineer', 'Newer', start_date=date(2023, 1, 1))
+        url = reverse('get_experience')
+        first = self.client.get(url, {'limit': 1}).json()
+        second = self.client.get(url, {'limit': 1, 'cursor': first['next_cursor']}).json()
+        self.assertEqual([e['id'] for e in first['experiences']], [newer.pk])
+        self.assertEqual([e['id'] for e in second['experiences']], [older.pk])
+        self.assertIsNone(second['next_cursor'])
+
+    def test_limit_is_capped(self):
+        for i in range(MAX_LIMIT + 1 - len(self.projects)):
+            make_project(f'Extra {i}', order=100 + i)
+        data = self.client.get(reverse('get_projects'), {'limit': MAX_LIMIT + 50}).json()
+        self.assertEqual(len(data['projects']), MAX_LIMIT)
+        self.assertIsNotNone(data['next_cursor'])
+
+    def test_invalid_parameters_are_rejected(self):
+        url = reverse('get_projects')
+        for params in ({'limit': 0}, {'limit': 'ten'}, {'cursor': 'not-a-cursor'},
+                       {'cursor': encode_cursor(['a', 1])}):
+            with self.subTest(params=params):
+                response = self.client.get(url, params)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json()['status'], 'error')
+
+    def test_cursor_round_trip(self):
+        self.assertEqual(decode_cursor(encode_cursor([3, 42])), (3, 42))
+
+
+class FieldSelectionTests(ContentTestCase):
+
+    def setUp(self):
+        super().setUp()
+        make_project('Selected', technologies=['Python'])
+
+    def test_only_requested_fields_are_returned(self):
+        data = self.client.get(reverse('get_projects'), {'fields': 'id,title,tech_stack'}).json()
+        self.assertEqual(list(data['projects'][0]), ['id', 'title', 'tech_stack'])
+        self.assertEqual(data['projects'][0]['tech_stack'], ['Python'])
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get(reverse('get_projects'), {'fields': 'title,secret'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('secret', response.json()['message'])
+
+    def test_streamed_fields_match_the_snapshot(self):
+        url = reverse('get_projects')
+        params = {'fields': 'title,tech_stack'}
+        streamed = self.client.get(url, {**params, 'stream': 1})
+        self.assertEqual(
+            b''.join(streamed.streaming_content).decode(),
+            self.client.get(url, params).content.decode(),
+        )
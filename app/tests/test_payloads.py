@@ -0,0 +1,74 @@
+"""
+Materialized JSON payloads of projects and experiences.
+"""
+
+import json
+
+from django.urls import reverse
+
+from app import payloads
+from app.models import Experience, ExperienceTask, Project, ProjectMetric
+
+from .utils import ContentTestCase, make_experience, make_project
+
+
+class PayloadRefreshTests(ContentTestCase):
+
+    def setUp(self):
+        super().setUp()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project = make_project('Stored', technologies=['Python'])
+            self.experience = make_experience('Engineer', 'Acme', tasks=['First task'])
+
+    def stored(self, model, pk):
+        return json.loads(model.objects.values_list('payload', flat=True).get(pk=pk))
+
+    def served(self, url, name, pk):
+        return next(row for row in self.client.get(url).json()[name] if row['id'] == pk)
+
+    def test_saved_rows_store_the_served_document(self):
+        self.assertEqual(self.stored(Project, self.project.pk),
+                         self.served(reverse('get_projects'), 'projects', self.project.pk))
+        self.assertEqual(self.stored(Experience, self.experience.pk),
+                         self.served(reverse('get_experience'), 'experiences', self.experience.pk))
+
+    def test_saving_a_child_refreshes_its_parent(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            ProjectMetric.objects.create(project=self.project, value='90%', label='Accuracy')
+        self.assertEqual(self.stored(Project, self.project.pk)['metrics'], [{'value': '90%', 'label': 'Accuracy'}])
+
+    def test_saving_a_task_refreshes_its_experience(self):
+        task = ExperienceTask.objects.get(section__experience=self.experience)
+        with self.captureOnCommitCallbacks(execute=True):
+            task.description = 'Edited task'
+            task.save()
+        sections = self.stored(Experience, self.experience.pk)['sections']
+        self.assertEqual(sections, [{'title': 'Work', 'tasks': ['Edited task']}])
+
+    def test_deleting_a_child_refreshes_its_parent(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.technologies.all().delete()
+        self.assertEqual(self.stored(Project, self.project.pk)['tech_stack'], [])
+
+    def test_refresh_waits_for_the_commit(self):
+        self.project.refresh_from_db()
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self.project.title = 'Renamed'
+            self.project.save()
+        self.assertEqual(self.stored(Project, self.project.pk)['title'], 'Stored')
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.stored(Project, self.project.pk)['title'], 'Renamed')
+
+    def test_stream_serves_stored_and_missing_payloads(self):
+        Project.objects.filter(pk=self.project.pk).update(payload='')  # e.g. a bulk insert
+        other = make_project('Unsaved payload', order=1)
+        Project.objects.filter(pk=other.pk).update(payload='')
+        url = reverse('get_projects')
+        streamed = self.client.get(url, {'stream': 1})
+        self.assertEqual(json.loads(b''.join(streamed.streaming_content)), self.client.get(url).json())
+
+    def test_refresh_all(self):
+        Project.objects.update(payload='')
+        payloads.refresh_all()
+        self.assertEqual(self.stored(Project, self.project.pk)['title'], 'Stored')
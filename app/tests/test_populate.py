@@ -0,0 +1,68 @@
+"""
+The populate_portfolio fixture sync.
+"""
+
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+
+from app import snapshot
+from app.management.commands.populate_portfolio import DEFAULT_FIXTURE, Command
+from app.models import Experience, Project
+
+from .utils import ContentTestCase
+
+
+class PopulatePortfolioTests(ContentTestCase):
+
+    def populate(self, *args):
+        command = Command()
+        call_command(command, *args, stdout=StringIO())
+        return {model.__name__: counts for model, counts in command.changes.items()}
+
+    def test_second_run_changes_nothing(self):
+        first = self.populate()
+        self.assertTrue(any(created for created, _, _ in first.values()))
+        projects = dict(Project.objects.values_list('pk', 'updated_at'))
+        payloads = dict(Project.objects.values_list('pk', 'payload'))
+        version = snapshot.generation()
+
+        second = self.populate()
+        self.assertEqual({name: (0, 0, 0) for name in second}, second)
+        self.assertEqual(dict(Project.objects.values_list('pk', 'updated_at')), projects)
+        self.assertEqual(dict(Project.objects.values_list('pk', 'payload')), payloads)
+        self.assertEqual(snapshot.generation(), version)
+
+    def test_loads_the_fixture_with_payloads(self):
+        fixture = json.loads(DEFAULT_FIXTURE.read_text(encoding='utf-8'))
+        self.populate()
+        self.assertEqual(Project.objects.count(), len(fixture['projects']))
+        self.assertEqual(Experience.objects.count(), len(fixture['experiences']))
+        self.assertFalse(Project.objects.filter(payload='').exists())
+        self.assertFalse(Experience.objects.filter(payload='').exists())
+
+    def test_changed_fixture_updates_only_the_changed_rows(self):
+        fixture = json.loads(DEFAULT_FIXTURE.read_text(encoding='utf-8'))
+        self.populate()
+        fixture['projects'][0]['description'] = 'Rewritten.'
+        path = self.tmp_fixture(fixture)
+        changes = self.populate('--fixture', path)
+        self.assertEqual(changes['Project'], (0, 1, 0))
+        self.assertEqual(sum(map(sum, changes.values())), 1)
+        project = Project.objects.get(title=fixture['projects'][0]['title'])
+        self.assertEqual(json.loads(project.payload)['description'], 'Rewritten.')
+
+    def test_dry_run_writes_nothing(self):
+        version = snapshot.generation()
+        self.populate('--dry-run')
+        self.assertFalse(Project.objects.exists())
+        self.assertEqual(snapshot.generation(), version)
+
+    def tmp_fixture(self, fixture):
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False, encoding='utf-8') as f:
+            json.dump(fixture, f)
+        self.addCleanup(os.unlink, f.name)
+        return f.name
@@ -0,0 +1,20 @@
+"""
+The explain_views audit: every public view and admin changelist reads
+through an index, without full scans or temporary sorts.
+"""
+
+from io import StringIO
+
+from django.core.management import call_command
+
+from .utils import ContentTestCase, make_experience, make_project
+
+
+class QueryPlanTests(ContentTestCase):
+
+    def test_audit_is_clean(self):
+        make_project('Indexed', technologies=['Python'])
+        make_experience('Engineer', 'Company', technologies=['Django'], tasks=['Shipped'])
+        out = StringIO()
+        call_command('explain_views', '--strict', stdout=out)
+        self.assertIn('No full scans or temporary sorts', out.getvalue())
@@ -0,0 +1,110 @@
+"""
+Per-client rate limiting of the contact form and login.
+"""
+
+import json
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.urls import reverse
+
+from app import ratelimit
+
+from .utils import ContentTestCase
+
+
+@override_settings(
+    RATE_LIMIT_ENABLED=True,
+    RATE_LIMITS={'contact': (2, 1 / 60), 'login': (2, 1 / 60)},
+    RATE_LIMIT_STORE=None,
+    RATE_LIMIT_CLIENT_IP_HEADER='HTTP_X_FORWARDED_FOR',
+    RATE_LIMIT_TRUSTED_PROXIES=1,
+)
+class RateLimitTests(ContentTestCase):
+
+    def setUp(self):
+        super().setUp()
+        ratelimit._store = None
+        self.addCleanup(setattr, ratelimit, '_store', None)
+
+    def contact(self, client_ip):
+        payload = {'name': 'Visitor', 'email': 'v@example.com', 'subject': 'Hi', 'message': 'Hello'}
+        return self.client.post(
+            reverse('contact_form'), json.dumps(payload), content_type='application/json',
+            headers={'x_forwarded_for': client_ip}, REMOTE_ADDR='10.0.0.1',
+        )
+
+    def test_contact_form_is_limited_with_retry_after(self):
+        self.assertEqual([self.contact('203.0.113.7').status_code for _ in range(2)], [200, 200])
+        response = self.contact('203.0.113.7')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.json()['status'], 'error')
+        self.assertGreater(int(response['Retry-After']), 50)
+
+    def test_clients_behind_the_proxy_have_their_own_buckets(self):
+        for _ in range(3):
+            self.contact('203.0.113.7')
+        self.assertEqual(self.contact('198.51.100.2').status_code, 200)
+        # A spoofed left-most address does not escape the bucket
+        self.assertEqual(self.contact('198.51.100.9, 203.0.113.7').status_code, 429)
+
+    def test_login_is_limited_before_checking_the_password(self):
+        url = reverse('login')
+        credentials = {'username': 'admin', 'password': 'wrong'}
+        for _ in range(2):
+            self.assertEqual(self.client.post(url, credentials).status_code, 200)
+        response = self.client.post(url, credentials)
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+        self.assertContains(response, 'Too many login attempts', status_code=429)
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+
+class ClientIpTests(ContentTestCase):
+
+    def client_ip(self, forwarded_for=None, **settings):
+        headers = {'x_forwarded_for': forwarded_for} if forwarded_for else {}
+        request = RequestFactory().get('/', headers=headers, REMOTE_ADDR='10.0.0.1')
+        with override_settings(RATE_LIMIT_CLIENT_IP_HEADER='HTTP_X_FORWARDED_FOR', **settings):
+            return ratelimit.client_ip(request)
+
+    def test_right_most_untrusted_hop(self):
+        self.assertEqual(self.client_ip('1.1.1.1, 2.2.2.2', RATE_LIMIT_TRUSTED_PROXIES=1), '2.2.2.2')
+        self.assertEqual(self.client_ip('1.1.1.1, 2.2.2.2, 3.3.3.3', RATE_LIMIT_TRUSTED_PROXIES=2), '2.2.2.2')
+        self.assertEqual(self.client_ip('2.2.2.2', RATE_LIMIT_TRUSTED_PROXIES=2), '2.2.2.2')
+
+    def test_remote_addr_without_proxies_or_header(self):
+        self.assertEqual(self.client_ip('1.1.1.1', RATE_LIMIT_TRUSTED_PROXIES=0), '10.0.0.1')
+        self.assertEqual(self.client_ip(None, RATE_LIMIT_TRUSTED_PROXIES=1), '10.0.0.1')
+
+    def test_forwarded_header_is_ignored_by_default(self):
+        # Outside Render no proxy is trusted, so clients cannot pick their bucket
+        self.assertEqual(settings.RATE_LIMIT_TRUSTED_PROXIES, 0)
+        request = RequestFactory().get('/', headers={'x_forwarded_for': '1.1.1.1'}, REMOTE_ADDR='10.0.0.1')
+        self.assertEqual(ratelimit.client_ip(request), '10.0.0.1')
+
+
+class SQLiteBucketsTests(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.store = ratelimit.SQLiteBuckets(Path(directory.name) / 'buckets.sqlite3')
+
+    def keys(self):
+        return {key for key, in self.store._connection().execute('SELECT key FROM buckets')}
+
+    def test_bucket_is_shared_and_refills(self):
+        self.assertEqual(self.store.take('a', 1, 1, now=100.0), 0)
+        self.assertAlmostEqual(self.store.take('a', 1, 1, now=100.5), 0.5)
+        self.assertEqual(self.store.take('a', 1, 1, now=101.5), 0)
+
+    def test_idle_buckets_are_pruned(self):
+        self.store.prune_every = 3
+        self.store.take('idle', 5, 1, now=0.0)
+        self.store.take('recent', 5, 1, now=self.store.max_idle)
+        self.assertEqual(self.keys(), {'idle', 'recent'})
+        self.store.take('new', 5, 1, now=self.store.max_idle + 1)
+        self.assertEqual(self.keys(), {'recent', 'new'})
@@ -0,0 +1,145 @@
+"""
+Site search (/api/search/) and technology facets (/api/tech/, ?tech=).
+"""
+
+from django.urls import reverse
+
+from app.facets import tech_key
+from app.models import Certification, Project, ProjectTech
+from app.search import MAX_QUERY_LENGTH, MAX_QUERY_WORDS
+
+from .utils import ContentTestCase, make_experience, make_project
+
+
+class SearchTests(ContentTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.chatbot = make_project('Multilingual Chatbot', technologies=['RASA', 'Python'])
+        self.dashboard = make_project('Sales Dashboard', technologies=['Power BI'], order=1)
+        self.engineer = make_experience('Data Engineer', 'Acme', tasks=['Built retrieval pipelines'])
+        Certification.objects.create(title='Cloud Practitioner', issuer='AWS', category='Cloud',
+                                     description='Cloud fundamentals.')
+
+    def search(self, q, **params):
+        response = self.client.get(reverse('search'), {'q': q, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def titles(self, q):
+        return [result['title'] for result in self.search(q)['results']]
+
+    def test_exact_prefix_and_typo_matches(self):
+        self.assertEqual(self.titles('chatbot'), ['Multilingual Chatbot'])
+        self.assertEqual(self.titles('chat'), ['Multilingual Chatbot'])
+        self.assertEqual(self.titles('chatbto'), ['Multilingual Chatbot'])
+        self.assertEqual(self.titles('dashbord'), ['Sales Dashboard'])
+
+    def test_every_word_must_match(self):
+        self.assertEqual(self.titles('chatbot rasa'), ['Multilingual Chatbot'])
+        self.assertEqual(self.titles('chatbot dashboard'), [])
+
+    def test_results_link_to_their_page(self):
+        result = self.search('retrieval')['results'][0]
+        self.assertEqual(result['type'], 'experience')
+        self.assertEqual(result['id'], self.engineer.pk)
+        self.assertEqual(result['url'], reverse('experience'))
+        self.assertEqual(self.search('aws')['results'][0]['type'], 'certification')
+
+    def test_title_outranks_description(self):
+        make_project('Notes', order=2, technologies=['Chatbot'])
+        self.assertEqual(self.titles('chatbot'), ['Multilingual Chatbot', 'Notes'])
+
+    def test_index_follows_content_changes(self):
+        self.assertEqual(self.titles('assistant'), [])
+        self.chatbot.title = 'Voice Assistant'
+        self.chatbot.save()
+        self.assertEqual(self.titles('assistant'), ['Voice Assistant'])
+
+    def test_inactive_rows_are_not_found(self):
+        self.dashboard.is_active = False
+        self.dashboard.save()
+        self.assertEqual(self.titles('dashboard'), [])
+
+    def test_limit_and_count(self):
+        data = self.search('python', limit=1)
+        self.assertEqual(data['count'], 1)
+        self.assertEqual(len(data['results']), 1)
+
+    def test_missing_query_is_rejected(self):
+        for params in ({}, {'q': '  '}, {'q': 'chatbot', 'limit': 'x'}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get(reverse('search'), params).status_code, 400)
+
+    def test_oversized_query_is_rejected(self):
+        self.assertEqual(self.titles('chatbot ' + 'x' * (MAX_QUERY_LENGTH - 8)), [])
+        for q in ('chatbot ' * 13, 'x' * (MAX_QUERY_LENGTH + 1), ' '.join(['chat'] * (MAX_QUERY_WORDS + 1))):
+            with self.subTest(q=q):
+                response = self.client.get(reverse('search'), {'q': q})
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json()['status'], 'error')
+        self.assertEqual(self.titles(' '.join(['chat'] * MAX_QUERY_WORDS)), ['Multilingual Chatbot'])
+
+
+class TechFacetTests(ContentTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.ml = make_project('Classifier', technologies=['Scikit-learn', 'Django'])
+        self.api = make_project('API', technologies=['Django', 'PostgreSQL'], order=1)
+        self.etl = make_project('ETL', technologies=['sklearn', 'Pandas'], order=2)
+        make_experience('ML Engineer', 'Acme', technologies=['scikit learn'])
+
+    def project_ids(self, **params):
+        response = self.client.get(reverse('get_projects'), params)
+        self.assertEqual(response.status_code, 200)
+        return [project['id'] for project in response.json()['projects']]
+
+    def test_spellings_fold_to_one_key(self):
+        self.assertEqual(tech_key('Scikit-learn'), 'scikit-learn')
+        self.assertEqual(tech_key(' scikit learn '), 'scikit-learn')
+        self.assertEqual(tech_key('sklearn'), 'scikit-learn')
+        self.assertEqual(tech_key('Node_JS'), 'node-js')
+
+    def test_filter_matches_all_by_default(self):
+        self.assertEqual(self.project_ids(tech='sklearn'), [self.ml.pk, self.etl.pk])
+        self.assertEqual(self.project_ids(tech='django,scikit-learn'), [self.ml.pk])
+        self.assertEqual(self.project_ids(tech='django,pandas'), [])
+
+    def test_filter_any(self):
+        self.assertEqual(self.project_ids(tech='postgres,pandas', match='any'), [self.api.pk, self.etl.pk])
+
+    def test_filtered_results_paginate(self):
+        response = self.client.get(reverse('get_projects'), {'tech': 'django', 'limit': 1})
+        first = response.json()
+        self.assertEqual([p['id'] for p in first['projects']], [self.ml.pk])
+        second = self.client.get(reverse('get_projects'),
+                                 {'tech': 'django', 'limit': 1, 'cursor': first['next_cursor']}).json()
+        self.assertEqual([p['id'] for p in second['projects']], [self.api.pk])
+        self.assertIsNone(second['next_cursor'])
+
+    def test_facet_counts(self):
+        facets = {f['tech']: f for f in self.client.get(reverse('get_tech')).json()['technologies']}
+        self.assertEqual(facets['scikit-learn']['projects'], 2)
+        self.assertEqual(facets['scikit-learn']['experiences'], 1)
+        self.assertEqual(facets['scikit-learn']['total'], 3)
+        self.assertEqual(facets['django']['total'], 2)
+        # Most used first
+        self.assertEqual(next(iter(facets)), 'scikit-learn')
+
+    def test_facet_drill_down(self):
+        data = self.client.get(reverse('get_tech'), {'tech': 'django'}).json()
+        counts = {f['tech']: f['projects'] for f in data['technologies']}
+        self.assertEqual(counts, {'django': 2, 'scikit-learn': 1, 'postgresql': 1})
+
+    def test_index_follows_content_changes(self):
+        ProjectTech.objects.create(project=self.api, name='Pandas', order=2)
+        self.assertEqual(self.project_ids(tech='pandas'), [self.api.pk, self.etl.pk])
+
+    def test_invalid_filters_are_rejected(self):
+        url = reverse('get_projects')
+        for params in ({'tech': ' , '}, {'tech': 'django', 'match': 'some'},
+                       {'tech': ','.join(f't{i}' for i in range(21))},
+                       {'tech': 'django', 'stream': 1}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get(url, params).status_code, 400)
@@ -0,0 +1,201 @@
+"""
+Change counters shared between workers, per-section snapshot rebuilds and
+single-flight coalescing of cache fills.
+"""
+
+import asyncio
+import multiprocessing
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from app import coherence, snapshot
+from app.singleflight import Flight
+
+from .utils import ContentTestCase, make_project
+
+GROUPS = ('profile', 'projects')
+
+try:
+    fork = multiprocessing.get_context('fork')
+except ValueError:  # not on Windows
+    fork = None
+
+
+def _bump_in_child(groups):
+    coherence.Counters(GROUPS).bump(groups)
+
+
+class CountersTests(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / 'db.sqlite3.generations'
+        settings = override_settings(CACHE_COHERENCE={'PATH': self.path})
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def test_bump_counts_the_groups_and_the_total(self):
+        counters = coherence.Counters(GROUPS)
+        counters.bump(['projects'])
+        counters.bump()
+        version, changed_at, groups = counters.read()
+        self.assertEqual(version, 2)
+        self.assertEqual(groups, {'profile': 1, 'projects': 2})
+        self.assertIsNotNone(changed_at)
+        self.assertEqual(counters.version(), 2)
+
+    def test_counters_are_shared_through_the_file(self):
+        reader, writer = coherence.Counters(GROUPS), coherence.Counters(GROUPS)
+        self.assertEqual(reader.version(), 0)
+        writer.bump(['profile'])
+        self.assertEqual(reader.read()[0::2], (1, {'profile': 1, 'projects': 0}))
+
+    @unittest.skipIf(fork is None or coherence.fcntl is None, 'needs fork() and fcntl')
+    def test_bump_in_another_process_is_seen(self):
+        counters = coherence.Counters(GROUPS)
+        counters.version()  # mapped before the other process writes
+        child = fork.Process(target=_bump_in_child, args=(['projects'],))
+        child.start()
+        child.join(10)
+        self.assertEqual(child.exitcode, 0)
+        self.assertEqual(counters.read()[0::2], (1, {'profile': 0, 'projects': 1}))
+
+    @override_settings(CACHE_COHERENCE={'ENABLED': False})
+    def test_disabled_counters_stay_in_memory(self):
+        counters = coherence.Counters(GROUPS)
+        counters.bump()
+        self.assertIsNone(counters.path)
+        self.assertFalse(self.path.exists())
+
+
+class SectionRebuildTests(ContentTestCase):
+    """A change counted by another worker rebuilds only its sections here"""
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(CACHE_COHERENCE={'PATH': Path(directory.name) / 'generations'})
+        settings.enable()
+        self.addCleanup(settings.disable)
+        for patch in (mock.patch.object(snapshot, 'counters', coherence.Counters(snapshot.SECTIONS)),
+                      mock.patch.object(snapshot, '_snapshot', None)):
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.other_worker = coherence.Counters(snapshot.SECTIONS)
+        self.project = make_project('Original')
+
+    def test_only_changed_sections_are_read_again(self):
+        before = snapshot.get_snapshot()
+        self.assertEqual(before.projects[0].title, 'Original')
+
+        # Written by "another worker": no signal reaches this process
+        type(self.project).objects.filter(pk=self.project.pk).update(title='Renamed')
+        self.assertIs(snapshot.get_snapshot(), before)
+        self.other_worker.bump(['projects'])
+
+        with CaptureQueriesContext(connection) as queries:
+            after = snapshot.get_snapshot()
+        self.assertEqual(after.projects[0].title, 'Renamed')
+        self.assertEqual(after.version, self.other_worker.version())
+        # The project rows and their metrics, highlights and technologies
+        reads = [query['sql'] for query in queries if 'SAVEPOINT' not in query['sql']]
+        self.assertEqual(len(reads), 4, reads)
+        self.assertTrue(all('"app_project' in sql for sql in reads), reads)
+        for name in snapshot.SECTIONS:
+            if name != 'projects':
+                self.assertIs(getattr(after, name), getattr(before, name), name)
+                self.assertEqual(after.section_etags[name], before.section_etags[name])
+        self.assertNotEqual(after.etag, before.etag)
+
+    def test_unchanged_version_costs_no_query(self):
+        snapshot.get_snapshot()
+        with self.assertNumQueries(0):
+            snapshot.get_snapshot()
+
+
+class SingleFlightTests(SimpleTestCase):
+
+    def test_concurrent_callers_compute_once(self):
+        flight = Flight('test')
+        cache, calls, barrier = {}, [], threading.Barrier(8)
+
+        def compute():
+            if 'value' not in cache:  # what the snapshot and page cache re-check
+                calls.append(1)
+                time.sleep(0.05)
+                cache['value'] = 42
+            return cache['value']
+
+        def caller():
+            barrier.wait()
+            results.append(flight.run('key', compute))
+
+        results = []
+        threads = [threading.Thread(target=caller) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [42] * 8)
+        self.assertEqual(len(calls), 1)
+
+    def test_busy_key_returns_stale(self):
+        flight = Flight('test')
+        started, release = threading.Event(), threading.Event()
+
+        def slow():
+            started.set()
+            release.wait(5)
+            return 'fresh'
+
+        leader = threading.Thread(target=flight.run, args=('key', slow))
+        leader.start()
+        started.wait(5)
+        try:
+            self.assertEqual(flight.run('key', lambda: 'computed', stale='stale'), 'stale')
+            # Other keys are not held up
+            self.assertEqual(flight.run('other', lambda: 'computed', stale='stale'), 'computed')
+        finally:
+            release.set()
+            leader.join()
+        self.assertEqual(flight.run('key', lambda: 'computed', stale='stale'), 'computed')
+
+    def test_async_callers_share_one_computation(self):
+        flight = Flight('test')
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return 'value'
+
+        async def main():
+            return await asyncio.gather(*(flight.arun('key', compute) for _ in range(20)))
+
+        self.assertEqual(asyncio.run(main()), ['value'] * 20)
+        self.assertEqual(len(calls), 1)
+
+    def test_async_busy_key_returns_stale(self):
+        flight = Flight('test')
+
+        async def compute():
+            await asyncio.sleep(0.01)
+            return 'fresh'
+
+        async def main():
+            leader = asyncio.ensure_future(flight.arun('key', compute, stale='stale'))
+            await asyncio.sleep(0)
+            follower = await flight.arun('key', compute, stale='stale')
+            return await leader, follower
+
+        self.assertEqual(asyncio.run(main()), ('fresh', 'stale'))
@@ -0,0 +1,53 @@
+"""
+The build_static_site pre-renderer.
+"""
+
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import override_settings
+
+from .utils import ContentTestCase, make_project
+
+
+class StaticSiteTests(ContentTestCase):
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.output = Path(directory.name)
+        self.project = make_project('Static', technologies=['Django'])
+
+    def build(self):
+        out = StringIO()
+        call_command('build_static_site', '--output', str(self.output), '--incremental', stdout=out)
+        return out.getvalue()
+
+    def test_tech_facets_are_rendered(self):
+        self.build()
+        facets = json.loads((self.output / 'api/tech/index.json').read_text())
+        self.assertIn('Django', json.dumps(facets))
+        self.assertTrue((self.output / 'api/tech/index.json.gz').exists())
+
+    def test_incremental_build_rerenders_the_tech_facets_on_change(self):
+        self.build()
+        self.assertIn('0 rendered', self.build())
+        self.project.technologies.create(name='Redis', order=1)
+        self.reset_caches()
+        output = self.build()
+        self.assertIn('/api/tech/', output)
+        self.assertIn('Redis', (self.output / 'api/tech/index.json').read_text())
+
+    def test_new_build_rerenders_every_route(self):
+        self.build()
+        self.assertIn('0 rendered', self.build())
+        with override_settings(BUILD_ID='next-deploy'):
+            output = self.build()
+        self.assertIn('0 unchanged', output)
+        self.assertIn('/api/tech/', output)
+        manifest = json.loads((self.output / '.build_manifest.json').read_text())
+        self.assertEqual(manifest['build'], 'next-deploy')
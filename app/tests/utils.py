@@ -0,0 +1,57 @@
+"""
+Shared fixtures for the behaviour tests.
+"""
+
+from datetime import date
+
+from django.test import Client, TestCase, override_settings
+
+from app import fragments, pagecache, snapshot
+from app.models import Experience, ExperienceSection, ExperienceTask, ExperienceTech, Project, ProjectTech
+
+
+@override_settings(
+    CONTACT_QUEUE={'ENABLED': False},
+    RATE_LIMIT_ENABLED=False,
+    METRICS={'ENABLED': False},
+)
+class ContentTestCase(TestCase):
+    """
+    TestCase starting every test from a fresh snapshot and page cache.
+
+    Rolling back a test's transaction sends no signals, so without this a
+    test could be served the snapshot built from the previous test's rows.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.client = Client(HTTP_HOST='localhost')
+        self.reset_caches()
+        self.addCleanup(self.reset_caches)
+
+    @staticmethod
+    def reset_caches():
+        snapshot.invalidate()
+        pagecache.clear()
+        fragments.clear()
+
+
+def make_project(title, technologies=(), order=0, **fields):
+    project = Project.objects.create(
+        number=f'{order + 1:02d}', title=title, description=f'About {title}.', order=order, **fields
+    )
+    for index, name in enumerate(technologies):
+        ProjectTech.objects.create(project=project, name=name, order=index)
+    return project
+
+
+def make_experience(title, company, start_date=date(2024, 1, 1), technologies=(), tasks=(), **fields):
+    fields.setdefault('end_date', date(2025, 1, 1))
+    experience = Experience.objects.create(title=title, company=company, start_date=start_date, **fields)
+    for index, name in enumerate(technologies):
+        ExperienceTech.objects.create(experience=experience, name=name, order=index)
+    if tasks:
+        section = ExperienceSection.objects.create(experience=experience, title='Work')
+        for index, description in enumerate(tasks):
+            ExperienceTask.objects.create(section=section, description=description, order=index)
+    return experience
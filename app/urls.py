@@ -1,5 +1,9 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import async_views, views
+
+# Public pages and APIs are served by the async views under ASGI
+public = async_views if settings.PORTFOLIO_ASYNC_VIEWS else views
 
 # REMOVED app_name to avoid namespace conflicts
 # app_name = 'portfolio'  # <-- This was causing the issue
@@ -10,17 +14,23 @@ urlpatterns = [
     path('logout/', views.logout_view, name='logout'),
     
     # Page routes
-    path('', views.home, name='home'),
-    path('about/', views.about, name='about'),
-    path('experience/', views.experience, name='experience'),
-    path('portfolio/', views.portfolio, name='portfolio'),
-    path('certifications/', views.certifications, name='certifications'),
-    path('contact/', views.contact, name='contact'),
+    path('', public.home, name='home'),
+    path('about/', public.about, name='about'),
+    path('experience/', public.experience, name='experience'),
+    path('portfolio/', public.portfolio, name='portfolio'),
+    path('certifications/', public.certifications, name='certifications'),
+    path('contact/', public.contact, name='contact'),
     
     # API endpoints
     path('api/contact/', views.contact_form, name='contact_form'),
-    path('api/projects/', views.get_projects, name='get_projects'),
-    path('api/skills/', views.get_skills, name='get_skills'),
-    path('api/certifications/', views.get_certifications_api, name='get_certifications'),
-    path('api/experience/', views.get_experience_api, name='get_experience'),
+    path('api/projects/', public.get_projects, name='get_projects'),
+    path('api/skills/', public.get_skills, name='get_skills'),
+    path('api/certifications/', public.get_certifications_api, name='get_certifications'),
+    path('api/experience/', public.get_experience_api, name='get_experience'),
+    path('api/portfolio/', public.get_portfolio_api, name='get_portfolio'),
+    path('api/tech/', public.get_tech, name='get_tech'),
+    path('api/search/', public.search_api, name='search'),
+
+    # Monitoring (staff only)
+    path('metrics/', views.metrics_view, name='metrics'),
 ]
\ No newline at end of file
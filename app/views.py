@@ -1,23 +1,46 @@
 from django.shortcuts import render, redirect
-from django.http import JsonResponse
+from django.urls import reverse
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth import authenticate, login as auth_login, logout as auth_logout
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.contrib.auth.forms import AuthenticationForm
 import json
-
-from .models import (
-    Profile, TechStack, SkillCategory, Skill,
-    Experience, ExperienceSection, ExperienceTask,
-    Project, ProjectMetric, ProjectHighlight,
-    Certification, Education, Highlight, ContactMessage
+from functools import partial
+
+from .contact_queue import QueueFull, get_queue
+from .metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, render_prometheus, timed
+from .models import ContactMessage
+from . import facets, fragments, payloads
+from .conditional import aggregate_validators, conditional, content_validators, page_validators
+from .pagecache import page_response
+from .pagination import QueryError, paginate, parse_cursor, parse_fields, parse_include, parse_limit
+from .ratelimit import rate_limit
+from .search import DEFAULT_LIMIT as SEARCH_DEFAULT_LIMIT, parse_query, search
+from .serializers import (
+    AGGREGATE_SECTIONS, CERTIFICATION_FIELDS, EXPERIENCE_CHILDREN, EXPERIENCE_FIELDS,
+    PROJECT_CHILDREN, PROJECT_FIELDS, iter_json, serialize, serialize_skills
 )
+from .snapshot import get_snapshot, iter_experiences, iter_projects
 
 # ===================================
 # AUTHENTICATION VIEWS
 # ===================================
 
+def login_rate_limited(request, retry_after):
+    """Shown instead of checking the password when a client retries too fast"""
+    context = {
+        'error': 'Too many login attempts. Please wait a few minutes and try again.',
+        'next': request.POST.get('next', '/admin/'),
+        'username': request.POST.get('username'),
+    }
+    response = render(request, 'login.html', context, status=429)
+    response['Retry-After'] = str(int(retry_after) + 1)
+    return response
+
+
+@rate_limit('login', response=login_rate_limited)
 def login_view(request):
     """Custom login page"""
     # If user is already authenticated, redirect to admin
@@ -68,77 +91,96 @@ def logout_view(request):
 # HELPER FUNCTION
 # ===================================
 
-def get_profile_context():
+def get_profile_context(snapshot=None):
     """Helper function to get profile for all views"""
-    try:
-        profile = Profile.objects.first()
-    except Profile.DoesNotExist:
-        profile = None
-    return {'profile': profile}
+    snapshot = snapshot or get_snapshot()
+    return {'profile': snapshot.profile}
 
 
 # ===================================
 # PAGE VIEWS (with profile context)
 # ===================================
+# Page bodies are rendered once per content version by the page cache; the
+# *_context builders below only run when the snapshot changes.
 
-def home(request):
-    """Home page view with dynamic content"""
-    context = get_profile_context()
+def home_context(snapshot):
+    context = get_profile_context(snapshot)
     context.update({
-        'tech_stack': TechStack.objects.filter(is_active=True),
-        'highlights': Highlight.objects.filter(is_active=True)[:3],
+        'tech_stack': snapshot.tech_stack,
+        'highlights': snapshot.highlights[:3],
     })
-    return render(request, 'home.html', context)
+    return context
 
 
-def about(request):
-    """About page view with skills and education"""
-    context = get_profile_context()
+def about_context(snapshot):
+    context = get_profile_context(snapshot)
     context.update({
-        'skill_categories': SkillCategory.objects.filter(is_active=True).prefetch_related('skills'),
-        'education': Education.objects.filter(is_active=True).first(),
+        'skill_categories': snapshot.skill_categories,
+        'education': snapshot.education[0] if snapshot.education else None,
     })
-    return render(request, 'about.html', context)
+    return context
 
 
-def experience(request):
-    """Experience page view with timeline"""
-    context = get_profile_context()
+def experience_context(snapshot):
+    context = get_profile_context(snapshot)
     context.update({
-        'experiences': Experience.objects.filter(is_active=True).prefetch_related(
-            'sections__tasks',
-            'technologies'
-        ),
+        'experiences': snapshot.experiences,
+        'experience_cards': fragments.experience_cards.render(snapshot.experiences),
     })
-    return render(request, 'experience.html', context)
+    return context
 
 
-def portfolio(request):
-    """Portfolio page view with projects"""
-    context = get_profile_context()
+def portfolio_context(snapshot):
+    context = get_profile_context(snapshot)
     context.update({
-        'projects': Project.objects.filter(is_active=True).prefetch_related(
-            'metrics',
-            'highlights',
-            'technologies'
-        ),
+        'projects': snapshot.projects,
+        'project_cards': fragments.project_cards.render(snapshot.projects),
     })
-    return render(request, 'portfolio.html', context)
+    return context
 
 
-def certifications(request):
-    """Certifications page view"""
-    context = get_profile_context()
+def certifications_context(snapshot):
+    context = get_profile_context(snapshot)
     context.update({
-        'certifications': Certification.objects.filter(is_active=True),
+        'certifications': snapshot.certifications,
     })
-    return render(request, 'certifications.html', context)
+    return context
+
+
+@conditional(page_validators)
+def home(request, snapshot):
+    """Home page view with dynamic content"""
+    return page_response(snapshot, request.user, 'home.html', home_context)
+
+
+@conditional(page_validators)
+def about(request, snapshot):
+    """About page view with skills and education"""
+    return page_response(snapshot, request.user, 'about.html', about_context)
+
+
+@conditional(page_validators)
+def experience(request, snapshot):
+    """Experience page view with timeline"""
+    return page_response(snapshot, request.user, 'experience.html', experience_context)
+
+
+@conditional(page_validators)
+def portfolio(request, snapshot):
+    """Portfolio page view with projects"""
+    return page_response(snapshot, request.user, 'portfolio.html', portfolio_context)
+
+
+@conditional(page_validators)
+def certifications(request, snapshot):
+    """Certifications page view"""
+    return page_response(snapshot, request.user, 'certifications.html', certifications_context)
 
 
-def contact(request):
+@conditional(page_validators)
+def contact(request, snapshot):
     """Contact page view"""
-    context = get_profile_context()
-    return render(request, 'contact.html', context)
+    return page_response(snapshot, request.user, 'contact.html', get_profile_context)
 
 
 # ===================================
@@ -146,6 +188,7 @@ def contact(request):
 # ===================================
 
 @csrf_exempt
+@rate_limit('contact')
 def contact_form(request):
     """
     Handle contact form submissions
@@ -178,13 +221,24 @@ def contact_form(request):
                     'message': 'Please provide a valid email address.'
                 }, status=400)
             
-            # Save to database
-            ContactMessage.objects.create(
-                name=name,
-                email=email,
-                subject=subject,
-                message=message_text
-            )
+            # Journal the message and acknowledge; the queue's writer thread
+            # bulk-inserts it shortly after
+            queue = get_queue()
+            if queue is None:
+                ContactMessage.objects.create(
+                    name=name,
+                    email=email,
+                    subject=subject,
+                    message=message_text
+                )
+            else:
+                try:
+                    queue.submit(name, email, subject, message_text)
+                except QueueFull:
+                    return JsonResponse({
+                        'status': 'error',
+                        'message': 'We are receiving a lot of messages right now. Please try again in a minute.'
+                    }, status=503)
             
             return JsonResponse({
                 'status': 'success',
@@ -212,98 +266,252 @@ def contact_form(request):
 # API ENDPOINTS (Public)
 # ===================================
 
-def get_projects(request):
-    """API endpoint to fetch all projects data"""
-    projects = Project.objects.filter(is_active=True).prefetch_related(
-        'metrics',
-        'highlights',
-        'technologies'
+def parse_collection(request, name, field_map):
+    """
+    ``(fields, tech)`` of a request for the collection ``name``, checking
+    ?limit= and ?cursor= (or ?stream=) as well; raises QueryError
+    """
+    fields = parse_fields(request, field_map)
+    if name not in facets.FILTERABLE:
+        tech = None
+    elif request.GET.get('stream'):
+        if 'tech' in request.GET:
+            raise QueryError('tech cannot be combined with stream.')
+        return fields, None
+    else:
+        tech = facets.parse_tech(request)
+    parse_limit(request)
+    parse_cursor(request)
+    return fields, tech
+
+
+def collection_params(name, field_map):
+    """Query parameter check of a collection endpoint, for ``conditional()``"""
+    return partial(parse_collection, name=name, field_map=field_map)
+
+
+PROJECT_PARAMS = collection_params('projects', PROJECT_FIELDS)
+CERTIFICATION_PARAMS = collection_params('certifications', CERTIFICATION_FIELDS)
+EXPERIENCE_PARAMS = collection_params('experiences', EXPERIENCE_FIELDS)
+
+
+def collection_response(request, snapshot, name, key_func, field_map):
+    """
+    JSON response for the snapshot collection ``name`` supporting ?fields=,
+    ?limit=, ?cursor= and, for projects and experiences, ?tech=
+
+    Without any of those parameters the full collection is returned in the
+    original shape.
+    """
+    rows = getattr(snapshot, name)
+    try:
+        fields, tech = parse_collection(request, name, field_map)
+        if tech:
+            rows = facets.get_index(snapshot).filter(snapshot, name, *tech)
+        page, extra = paginate(request, None if tech else name, snapshot.version, rows, key_func)
+    except QueryError as e:
+        return JsonResponse({
+            'status': 'error',
+            'message': str(e)
+        }, status=400)
+
+    with timed('serialize'):
+        if fields is None and name in payloads.ENCODED:
+            return payloads.collection_json(snapshot, name, page, extra)
+        data = {name: [serialize(row, field_map, fields) for row in page]}
+        data.update(extra)
+        return JsonResponse(data)
+
+
+def stream_response(request, name, iter_rows, field_map, child_fields, encode=iter_json,
+                    documents=payloads.iter_documents):
+    """
+    ?stream=1: encode the collection row by row straight from chunked
+    database reads, keeping peak memory flat for very large collections.
+    With every field requested, the rows' materialized payload columns are
+    streamed instead.
+
+    Async views pass async ``iter_rows``/``encode``/``documents`` counterparts.
+    """
+    try:
+        fields, _ = parse_collection(request, name, field_map)
+    except QueryError as e:
+        return JsonResponse({
+            'status': 'error',
+            'message': str(e)
+        }, status=400)
+
+    if fields is None:
+        return StreamingHttpResponse(documents(name), content_type='application/json')
+
+    requested = fields
+    children = [child_fields[f] for f in requested if f in child_fields]
+    return StreamingHttpResponse(
+        encode(name, iter_rows(children=children), field_map, fields),
+        content_type='application/json',
     )
-    
-    projects_data = []
-    for project in projects:
-        project_dict = {
-            'id': project.id,
-            'number': project.number,
-            'title': project.title,
-            'description': project.description,
-            'featured': project.is_featured,
-            'github_url': project.github_url,
-            'live_url': project.live_url,
-            'demo_url': project.demo_url,
-            'metrics': [
-                {'value': m.value, 'label': m.label} 
-                for m in project.metrics.all()
-            ],
-            'highlights': [h.description for h in project.highlights.all()],
-            'tech_stack': [t.name for t in project.technologies.all()]
-        }
-        projects_data.append(project_dict)
-    
-    return JsonResponse({'projects': projects_data})
 
 
-def get_skills(request):
+def project_key(project):
+    return (project.order, project.id)
+
+
+def certification_key(cert):
+    return (cert.order, cert.id)
+
+
+def experience_key(exp):
+    return (-exp.start_date.toordinal(), exp.id)
+
+
+@conditional(content_validators, params=PROJECT_PARAMS)
+def get_projects(request, snapshot):
+    """
+    API endpoint to fetch all projects data
+
+    ?tech=django,rag keeps the projects using all of those technologies
+    (?match=any: any of them).
+    """
+    if request.GET.get('stream'):
+        return stream_response(request, 'projects', iter_projects, PROJECT_FIELDS, PROJECT_CHILDREN)
+    return collection_response(request, snapshot, 'projects', project_key, PROJECT_FIELDS)
+
+
+@conditional(content_validators)
+def get_skills(request, snapshot):
     """API endpoint to fetch all skills data organized by category"""
-    categories = SkillCategory.objects.filter(is_active=True).prefetch_related('skills')
-    
-    skills_data = {}
-    for category in categories:
-        skills_data[category.name] = [
-            skill.name for skill in category.skills.filter(is_active=True)
-        ]
-    
-    return JsonResponse({'skills': skills_data})
+    with timed('serialize'):
+        return JsonResponse({'skills': serialize_skills(snapshot.skill_categories)})
 
 
-def get_certifications_api(request):
+@conditional(content_validators, params=CERTIFICATION_PARAMS)
+def get_certifications_api(request, snapshot):
     """API endpoint to fetch all certifications data"""
-    certs = Certification.objects.filter(is_active=True)
-    
-    certs_data = []
-    for cert in certs:
-        cert_dict = {
-            'id': cert.id,
-            'title': cert.title,
-            'issuer': cert.issuer,
-            'category': cert.category,
-            'description': cert.description,
-            'issue_date': cert.issue_date.isoformat() if cert.issue_date else None,
-            'credential_id': cert.credential_id,
-            'credential_url': cert.credential_url,
-        }
-        certs_data.append(cert_dict)
-    
-    return JsonResponse({'certifications': certs_data})
+    return collection_response(request, snapshot, 'certifications', certification_key, CERTIFICATION_FIELDS)
 
 
-def get_experience_api(request):
-    """API endpoint to fetch all experience data"""
-    experiences = Experience.objects.filter(is_active=True).prefetch_related(
-        'sections__tasks',
-        'technologies'
-    )
-    
-    exp_data = []
-    for exp in experiences:
-        sections_data = []
-        for section in exp.sections.all():
-            sections_data.append({
-                'title': section.title,
-                'tasks': [task.description for task in section.tasks.all()]
-            })
-        
-        exp_dict = {
-            'id': exp.id,
-            'title': exp.title,
-            'company': exp.company,
-            'location': exp.location,
-            'period': exp.period,
-            'is_current': exp.is_current,
-            'description': exp.description,
-            'sections': sections_data,
-            'technologies': [tech.name for tech in exp.technologies.all()]
-        }
-        exp_data.append(exp_dict)
-    
-    return JsonResponse({'experiences': exp_data})
\ No newline at end of file
+@conditional(content_validators, params=EXPERIENCE_PARAMS)
+def get_experience_api(request, snapshot):
+    """API endpoint to fetch all experience data; filters by ?tech= like get_projects"""
+    if request.GET.get('stream'):
+        return stream_response(request, 'experiences', iter_experiences, EXPERIENCE_FIELDS, EXPERIENCE_CHILDREN)
+    return collection_response(request, snapshot, 'experiences', experience_key, EXPERIENCE_FIELDS)
+
+
+def portfolio_response(request, snapshot):
+    """Body of /api/portfolio/ for the sync and async views"""
+    try:
+        include = parse_include(request, AGGREGATE_SECTIONS)
+    except QueryError as e:
+        return JsonResponse({
+            'status': 'error',
+            'message': str(e)
+        }, status=400)
+
+    with timed('serialize'):
+        data = {}
+        for name in include:
+            section, serializer = AGGREGATE_SECTIONS[name]
+            data[name] = serializer(getattr(snapshot, section))
+        return JsonResponse(data)
+
+
+@conditional(aggregate_validators)
+def get_portfolio_api(request, snapshot):
+    """
+    API endpoint returning every public section from one snapshot
+
+    GET Parameters:
+    - include: comma-separated sections (default: all of profile, tech_stack,
+      skills, experiences, projects, certifications, education, highlights)
+    """
+    return portfolio_response(request, snapshot)
+
+
+def tech_response(request, snapshot):
+    """Body of /api/tech/ for the sync and async views"""
+    try:
+        tech = facets.parse_tech(request)
+    except QueryError as e:
+        return JsonResponse({
+            'status': 'error',
+            'message': str(e)
+        }, status=400)
+
+    index = facets.get_index(snapshot)
+    within = None
+    if tech:
+        within = {name: set(index.matching(name, *tech)) for name in facets.FILTERABLE}
+    with timed('serialize'):
+        return JsonResponse({'technologies': index.facets(within)})
+
+
+@conditional(content_validators, params=facets.parse_tech)
+def get_tech(request, snapshot):
+    """
+    API endpoint with per-technology counts across projects and experience
+
+    GET Parameters:
+    - tech: comma-separated technologies; counts only the projects and
+      experiences matching them (facet drill-down)
+    - match: all (default) or any of the ?tech= technologies
+    """
+    return tech_response(request, snapshot)
+
+
+def parse_search(request):
+    """``(query, limit)`` of a search request; raises QueryError"""
+    return parse_query(request), parse_limit(request) or SEARCH_DEFAULT_LIMIT
+
+
+def search_response(request, snapshot):
+    """Body of /api/search/ for the sync and async views"""
+    try:
+        query, limit = parse_search(request)
+    except QueryError as e:
+        return JsonResponse({
+            'status': 'error',
+            'message': str(e)
+        }, status=400)
+
+    total, matches = search(snapshot, query, limit)
+    with timed('serialize'):
+        return JsonResponse({
+            'query': query,
+            'count': total,
+            'results': [
+                {
+                    'type': document.type,
+                    'id': document.id,
+                    'title': document.title,
+                    'subtitle': document.subtitle,
+                    'url': reverse(document.page),
+                    'score': round(score, 3),
+                }
+                for score, document in matches
+            ],
+        })
+
+
+@conditional(content_validators, params=parse_search)
+def search_api(request, snapshot):
+    """
+    API endpoint searching projects, experience, certifications and skills
+
+    GET Parameters:
+    - q: search words; each must match (prefixes and single typos count);
+      at most 100 characters and 8 words
+    - limit: maximum number of results (default 20, at most 100)
+    """
+    return search_response(request, snapshot)
+
+
+# ===================================
+# METRICS (Staff only)
+# ===================================
+
+def metrics_view(request):
+    """Request timings of every worker in the Prometheus text format"""
+    if not (request.user.is_active and request.user.is_staff):
+        return HttpResponseForbidden()
+    return HttpResponse(render_prometheus(), content_type=METRICS_CONTENT_TYPE)
@@ -12,5 +12,12 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'portfolio.settings')
+os.environ.setdefault('PORTFOLIO_ASYNC_VIEWS', '1')
 
 application = get_asgi_application()
+
+# Static files are answered before Django: WhiteNoiseMiddleware is sync-only
+# and would put every async request through a thread (app/staticfiles.py)
+from app.staticfiles import ASGIStaticFiles  # noqa: E402  (needs the apps loaded)
+
+application = ASGIStaticFiles(application)
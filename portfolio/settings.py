@@ -45,6 +45,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'app.routers.WriterPinningMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -52,6 +53,8 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    # Last, so the time it measures is the view's (app/metrics.py)
+    'app.metrics.ServerTimingMiddleware',
     # 'axes.middleware.AxesMiddleware',
 ]
 
@@ -75,15 +78,103 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'portfolio.wsgi.application'
 
+# Serve the public pages and APIs with the async views in app/async_views.py.
+# portfolio/asgi.py turns this on; run it with an ASGI server, e.g.
+# gunicorn portfolio.asgi:application -k uvicorn.workers.UvicornWorker
+PORTFOLIO_ASYNC_VIEWS = os.environ.get('PORTFOLIO_ASYNC_VIEWS') == '1'
+
+if PORTFOLIO_ASYNC_VIEWS:
+    # WhiteNoiseMiddleware is sync-only, and Django would run every async
+    # request through a thread to call it. portfolio/asgi.py serves static
+    # files ahead of Django instead (app/staticfiles.py).
+    MIDDLEWARE.remove('whitenoise.middleware.WhiteNoiseMiddleware')
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# SQLITE_PROFILE=basic (the default) keeps Django's stock single-connection
+# setup and leaves the committed db.sqlite3 in rollback-journal mode.
+# SQLITE_PROFILE=production, set by the deployment, runs SQLite in WAL mode
+# with the pragmas below, and routes public reads to a read-only 'replica'
+# connection of the same file while admin, login and contact-form requests
+# use the single 'default' writer (app/routers.py). WAL converts the file in
+# place and keeps recent writes in db.sqlite3-wal until a checkpoint, so
+# only opt in where the database file is not deployed from git.
+SQLITE_PROFILE = os.environ.get('SQLITE_PROFILE', 'basic')
+SQLITE_PATH = BASE_DIR / 'db.sqlite3'
+
+if SQLITE_PROFILE == 'production':
+    # Executed on every new connection. busy_timeout lets a connection wait
+    # for a lock instead of failing with "database is locked"; NORMAL is
+    # durable across application crashes in WAL mode; mmap_size (256 MiB)
+    # and cache_size (-20000 = ~20 MiB) keep the working set in memory.
+    _SQLITE_PRAGMAS = (
+        'PRAGMA busy_timeout=5000;'
+        'PRAGMA synchronous=NORMAL;'
+        'PRAGMA mmap_size=268435456;'
+        'PRAGMA cache_size=-20000;'
+        'PRAGMA temp_store=MEMORY;'
+    )
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': SQLITE_PATH,
+            'OPTIONS': {
+                # journal_mode is persistent, but setting it on connect
+                # converts an existing rollback-journal database in place
+                'init_command': 'PRAGMA journal_mode=WAL;' + _SQLITE_PRAGMAS,
+                # Take the write lock when the transaction starts, so two
+                # writers queue on busy_timeout instead of deadlocking on
+                # a read-to-write lock upgrade
+                'transaction_mode': 'IMMEDIATE',
+            },
+        },
+        'replica': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            # Not immutable=1: the writer keeps changing the file, and an
+            # immutable connection would skip locking and read torn pages
+            'NAME': f'file:{SQLITE_PATH}?mode=ro',
+            'OPTIONS': {
+                'init_command': _SQLITE_PRAGMAS + 'PRAGMA query_only=ON;',
+            },
+            'TEST': {
+                'MIRROR': 'default',
+            },
+        },
     }
+    DATABASE_ROUTERS = ['app.routers.ReadWriteRouter']
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': SQLITE_PATH,
+        }
+    }
+
+
+# Identifies the deployed code in every ETag (app/build.py), so a deploy
+# that changes templates or API output revalidates cached copies. Defaults
+# to the commit Render is deploying, else a digest of the sources.
+BUILD_ID = os.environ.get('BUILD_ID') or os.environ.get('RENDER_GIT_COMMIT') or None
+
+
+# Content change counters shared by all worker processes (app/coherence.py):
+# a memory-mapped file next to the database, db.sqlite3.generations unless
+# PATH is set. Disabled, each worker only notices its own admin saves.
+CACHE_COHERENCE = {
+    'ENABLED': True,
+    'PATH': None,
+}
+
+
+# Cache-miss coalescing (app/singleflight.py): one snapshot rebuild at a time
+# per process and, through db.sqlite3.locks, across workers (ENABLED). With
+# STALE_WHILE_REVALIDATE, requests that arrive mid-rebuild get the previous
+# snapshot instead of waiting.
+SINGLE_FLIGHT = {
+    'ENABLED': True,
+    'STALE_WHILE_REVALIDATE': True,
 }
 
 
@@ -135,4 +226,43 @@ EMAIL_HOST_USER = 'your-email@gmail.com'
 EMAIL_HOST_PASSWORD = 'your-app-password'
 DEFAULT_FROM_EMAIL = 'your-email@gmail.com'
 
+# Contact form write-behind queue (app/contact_queue.py): submissions are
+# journaled to JOURNAL_DIR and bulk-inserted by one writer thread per process
+CONTACT_QUEUE = {
+    'ENABLED': True,
+    'BATCH_SIZE': 50,
+    'FLUSH_INTERVAL': 1.0,  # seconds
+    'MAX_DEPTH': 10000,
+    'JOURNAL_DIR': BASE_DIR / 'contact_journal',
+}
+
+# Token-bucket limits for the contact form and login (app/ratelimit.py):
+# scope -> (burst capacity, tokens refilled per second), keyed by client IP
+RATE_LIMITS = {
+    'contact': (5, 5 / 60),
+    'login': (10, 10 / 300),
+}
+# Share buckets between worker processes through this SQLite file
+# (None keeps them in each process's memory)
+RATE_LIMIT_STORE = os.environ.get('RATE_LIMIT_STORE') or None
+# Client addresses come from this header, as appended by the reverse proxies
+# in front of the app. With 0 trusted proxies (the default outside Render,
+# which runs one) the header is ignored and REMOTE_ADDR is used: trusting it
+# without a proxy that appends to it would let clients pick their bucket.
+RATE_LIMIT_CLIENT_IP_HEADER = os.environ.get('RATE_LIMIT_CLIENT_IP_HEADER', 'HTTP_X_FORWARDED_FOR') or None
+RATE_LIMIT_TRUSTED_PROXIES = int(
+    os.environ.get('RATE_LIMIT_TRUSTED_PROXIES') or (1 if os.environ.get('RENDER') else 0)
+)
+
+# Server-Timing header and Prometheus histograms (app/metrics.py), served to
+# staff at /metrics/. Each worker writes its histograms to DIR every
+# FLUSH_INTERVAL seconds so any worker can report for all of them. The
+# header is only sent to staff unless PUBLIC_SERVER_TIMING is set.
+METRICS = {
+    'ENABLED': True,
+    'DIR': BASE_DIR / 'metrics',
+    'FLUSH_INTERVAL': 5.0,  # seconds
+    'PUBLIC_SERVER_TIMING': False,
+}
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'